@@ -0,0 +1,9 @@
+"""제품 이미지 분석 / 광고 생성 파이프라인 패키지.
+
+import만으로는 아무 일도 하지 않는다. openai, PIL, langgraph 같은 무거운 의존성은
+실제로 쓰는 함수 안에서만 불러오므로 `python -m adgen --help`가 빠르게 뜬다.
+
+    python -m adgen analyze "제품 이름" ./image.jpg
+    python -m adgen pipeline "제품 이름" ./image.jpg --out previews
+    python -m adgen batch jobs.jsonl --mode analyze --output results.jsonl
+"""
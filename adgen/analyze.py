@@ -0,0 +1,89 @@
+"""제품 이미지 한 장을 GPT 비전으로 분석한다 (agent.py / test_v*.py의 공통 로직).
+
+응답 원문과 이미지 크기는 (프롬프트, 제품 이름, 이미지 바이트) 해시로 .cache/analyze 아래에 저장한다.
+같은 입력을 다시 분석하면 openai/PIL을 불러오지 않고 캐시에서 바로 돌려준다.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from adgen.images import data_url, image_size, inject_fallback, normalize_layout
+from adgen.prompts import DEFAULT_PROMPT, JSON_PROMPTS, PROMPTS
+
+# 실행 위치와 상관없이 저장소 루트의 .cache/analyze를 쓴다
+CACHE_DIR = os.path.abspath(os.getenv("ADGEN_CACHE_DIR")
+                            or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "analyze"))
+MODEL = "gpt-4o"
+
+
+def cache_key(prompt: str, product_name: str, image_bytes: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (MODEL.encode(), PROMPTS[prompt].encode(), product_name.encode(), image_bytes):
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+def parse_json(raw_json: str) -> Dict:
+    """앞뒤에 설명이나 ``` 가 붙어 와도 첫 '{'부터 마지막 '}'까지를 파싱한다."""
+    json_start = raw_json.find("{")
+    json_end = raw_json.rfind("}") + 1
+    return json.loads(raw_json[json_start:json_end])
+
+
+def request_analysis(prompt: str, product_name: str, image_bytes: bytes, image_path: str = "") -> str:
+    from adgen.client import get_client
+
+    response = get_client().chat.completions.create(
+        model=MODEL,
+        temperature=0.7,
+        max_tokens=1000,
+        messages=[
+            {"role": "system", "content": PROMPTS[prompt]},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": f"제품 이름: {product_name}"},
+                    {"type": "image_url", "image_url": {"url": data_url(image_bytes, image_path)}}
+                ]
+            }
+        ],
+    )
+    return response.choices[0].message.content
+
+
+def analyze_product(product_name: str, image_path: str, prompt: str = DEFAULT_PROMPT,
+                    raw: bool = False, cache_dir: Optional[str] = CACHE_DIR) -> Dict:
+    """분석 결과를 돌려준다.
+
+    raw=True이거나 자유 형식 프롬프트(v1/v2)면 {"content": 응답 원문}을,
+    JSON 프롬프트(v3/v6)면 좌표를 0~1로 정규화하고 빈 layout을 채운 dict를 돌려준다.
+    어느 쪽이든 "cached" 키로 캐시 적중 여부를 알려준다.
+    """
+    if prompt not in PROMPTS:
+        raise ValueError(f"알 수 없는 프롬프트 '{prompt}' (사용 가능: {', '.join(PROMPTS)})")
+    with open(image_path, "rb") as f:
+        image_bytes = f.read()
+
+    entry = None
+    path = None
+    if cache_dir:
+        path = os.path.join(cache_dir, f"{cache_key(prompt, product_name, image_bytes)}.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+    cached = entry is not None
+    if entry is None:
+        entry = {"content": request_analysis(prompt, product_name, image_bytes, image_path)}
+        if prompt in JSON_PROMPTS:
+            entry["size"] = list(image_size(image_path))
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+
+    if raw or prompt not in JSON_PROMPTS:
+        return {"content": entry["content"], "cached": cached}
+    parsed = inject_fallback(normalize_layout(parse_json(entry["content"]), tuple(entry["size"])))
+    parsed["cached"] = cached
+    return parsed
@@ -0,0 +1,229 @@
+"""`python -m adgen` 명령행 진입점. 서브커맨드가 실제로 실행될 때만 해당 모듈을 불러온다."""
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+
+from adgen.prompts import DEFAULT_PROMPT, PROMPTS
+
+
+def ask(value: Optional[str], message: str) -> str:
+    # 인자를 빼먹으면 예전 스크립트처럼 대화형으로 묻는다
+    return value if value else input(message)
+
+
+def run_job(mode: str, job: Dict, args) -> Dict:
+    if mode == "analyze":
+        from adgen.analyze import CACHE_DIR, analyze_product
+
+        return analyze_product(job["product_name"], job["image_path"], job.get("prompt", args.prompt),
+                               raw=args.raw, cache_dir=None if args.no_cache else args.cache_dir or CACHE_DIR)
+
+    from adgen.pipeline import run_pipeline
+
+    # 파이프라인 작업은 "image_paths"로 같은 제품의 사진 여러 장을 줄 수 있다
+    final_state = run_pipeline(job["product_name"], job.get("image_paths") or job["image_path"],
+                               out_dir=None if args.no_previews else job.get("out", args.out), verbose=False,
+                               deadline=job.get("deadline", args.deadline), store=not args.no_store,
+                               refresh=args.refresh)
+    return {"final_json": final_state.get("final_json", []), "degraded": final_state.get("degraded", []),
+            "trace": final_state.get("trace", []), "stored_run": final_state.get("stored_run"),
+            "timing": final_state.get("timing")}
+
+
+def job_tokens(mode: str, job: Dict, args) -> int:
+    """스케줄러 입장 제어에 쓰는 작업 하나의 토큰 상한 추정."""
+    if mode == "analyze":
+        from token_budget import IMAGE_TOKENS, estimate_tokens
+
+        return IMAGE_TOKENS + estimate_tokens(PROMPTS[job.get("prompt", args.prompt)]) + 1000  # max_tokens=1000
+    from adgen.pipeline import estimated_tokens
+
+    return estimated_tokens(len(job.get("image_paths") or [job["image_path"]]))
+
+
+def job_usage(mode: str, record: Dict) -> Optional[int]:
+    if not record["ok"]:
+        return None
+    if mode == "analyze":
+        return 0 if record["result"].get("cached") else None
+    from adgen.pipeline import used_tokens
+
+    return used_tokens(record["result"])
+
+
+def cmd_analyze(args) -> int:
+    job = {
+        "product_name": ask(args.product_name, "제품 이름을 입력하세요: "),
+        "image_path": ask(args.image_path, "제품 이미지 파일 경로를 입력하세요 (예: './image.jpg'): "),
+    }
+    result = run_job("analyze", job, args)
+    if args.raw:
+        print(result["content"])
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+def cmd_pipeline(args) -> int:
+    from adgen.pipeline import run_pipeline
+
+    product_name = ask(args.product_name, "제품 이름을 입력하세요: ")
+    image_paths = args.image_paths or [ask(None, "제품 이미지 파일 경로를 입력하세요 (예: './image.jpg'): ")]
+    final_state = run_pipeline(product_name, image_paths, out_dir=None if args.no_previews else args.out,
+                               deadline=args.deadline, store=not args.no_store, refresh=args.refresh)
+    return 0 if final_state.get("final_json") else 1
+
+
+def cmd_batch(args) -> int:
+    import contextlib
+    import queue
+    import threading
+    import time
+    from concurrent.futures import Future
+
+    from adgen.scheduler import Scheduler
+
+    with open(args.jobs, encoding="utf-8") as f:
+        jobs = [json.loads(line) for line in f if line.strip()]
+
+    def safe_run(job: Dict, submitted: float) -> Dict:
+        wait_ms = round((time.monotonic() - submitted) * 1000, 1)
+        try:
+            return dict(job, ok=True, result=run_job(args.mode, job, args), wait_ms=wait_ms)
+        except Exception as e:
+            return dict(job, ok=False, error=f"{type(e).__name__}: {e}", wait_ms=wait_ms)
+
+    # 작업마다 "priority"(interactive/batch)와 "tenant"를 줄 수 있다. 토큰 한도 안에서 우선순위와
+    # 테넌트 간 공정 분배로 순서를 정하고, 한도가 차면 제출을 잠시 멈춘다 (배치라 busy로 버리지 않는다).
+    scheduler = Scheduler(workers=args.workers, **({"tokens_per_minute": args.tokens_per_minute}
+                                                   if args.tokens_per_minute else {}))
+    futures: "queue.Queue[Optional[Future]]" = queue.Queue()
+
+    def submit_all() -> None:
+        for job in jobs:
+            submitted = time.monotonic()
+            try:
+                future = scheduler.submit(lambda job=job, submitted=submitted: safe_run(job, submitted),
+                                          job_tokens(args.mode, job, args), priority=job.get("priority", "batch"),
+                                          tenant=str(job.get("tenant", "default")),
+                                          usage=lambda record: job_usage(args.mode, record), block=True)
+            except Exception as e:
+                future = Future()
+                future.set_result(dict(job, ok=False, error=f"{type(e).__name__}: {e}"))
+            futures.put(future)
+        futures.put(None)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    try:
+        # 분석/파이프라인 모두 대부분 네트워크 대기라 스레드로 겹친다.
+        # 에이전트 진행 로그는 stderr로 보내 결과 JSONL과 섞이지 않게 한다.
+        with contextlib.redirect_stdout(sys.stderr):
+            threading.Thread(target=submit_all, daemon=True).start()
+            while (future := futures.get()) is not None:
+                record = future.result()
+                failed += not record["ok"]
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        scheduler.close(wait=False)
+        if out is not sys.stdout:
+            out.close()
+    print(f"{len(jobs) - failed}/{len(jobs)}개 작업 완료", file=sys.stderr)
+    print(f"스케줄러: {json.dumps(scheduler.stats(), ensure_ascii=False)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_results(args) -> int:
+    from adgen.store import ResultStore
+
+    results = ResultStore(args.results_dir) if args.results_dir else ResultStore()
+    if args.diff:
+        print(results.diff(*args.diff))
+        return 0
+    filters = {"product_name": args.product, "since": args.since, "until": args.until, "aspect_ratio": args.ratio}
+    if args.export:
+        if args.export.endswith(".jsonl"):
+            count = results.export_jsonl(args.export, **filters)
+        else:
+            count = results.export_columns(args.export, **filters)
+        print(f"{count}행 내보냄: {args.export}", file=sys.stderr)
+        return 0
+    for run in results.find(**filters):
+        degraded = f"  대체값: {', '.join(entry['node'] for entry in run['degraded'])}" if run["degraded"] else ""
+        print(f"{run['id']:>5}  {run['created_at']}  {run['product_name']}  v{run['prompt_version']}  "
+              f"image={run['image_hash'][:12]}  output={run['output_hash'][:12]}{degraded}")
+    return 0
+
+
+def cmd_worker(args) -> int:
+    from adgen.worker import serve
+
+    return serve(args)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="adgen", description="제품 이미지 분석 / 광고 생성 파이프라인")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def analysis_options(p):
+        p.add_argument("--prompt", choices=sorted(PROMPTS), default=DEFAULT_PROMPT, help="분석 프롬프트 버전")
+        p.add_argument("--raw", action="store_true", help="JSON 파싱/좌표 정규화 없이 응답 원문을 출력")
+        p.add_argument("--no-cache", action="store_true", help="분석 캐시를 쓰지 않는다")
+        p.add_argument("--cache-dir", default=None, help="분석 캐시 디렉터리 (기본: ADGEN_CACHE_DIR 또는 저장소 루트의 .cache/analyze)")
+
+    def pipeline_options(p):
+        p.add_argument("--out", default="previews", help="미리보기 PNG 저장 디렉터리")
+        p.add_argument("--no-previews", action="store_true", help="미리보기를 렌더링하지 않는다")
+        p.add_argument("--deadline", type=float, default=None,
+                       help="실행 전체 마감 시간(초). 지나면 남은 노드는 대체값으로 채운다 (기본 ADGEN_RUN_DEADLINE_S=60)")
+        p.add_argument("--no-store", action="store_true", help="결과 저장소를 조회/저장하지 않는다")
+        p.add_argument("--refresh", action="store_true", help="저장된 결과가 있어도 다시 생성한다 (결과는 저장)")
+
+    p = sub.add_parser("analyze", help="제품 이미지 한 장을 GPT 비전으로 분석")
+    p.add_argument("product_name", nargs="?")
+    p.add_argument("image_path", nargs="?")
+    analysis_options(p)
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser("pipeline", help="전체 광고 생성 그래프 실행 (test10.py)")
+    p.add_argument("product_name", nargs="?")
+    p.add_argument("image_paths", nargs="*", help="같은 제품의 사진들 (여러 장이면 한 번에 분석하고 대표 사진을 고른다)")
+    pipeline_options(p)
+    p.set_defaults(func=cmd_pipeline)
+
+    p = sub.add_parser("batch", help='JSONL 작업 파일 일괄 실행 (한 줄에 {"product_name", "image_path"})')
+    p.add_argument("jobs")
+    p.add_argument("--mode", choices=["analyze", "pipeline"], default="analyze")
+    p.add_argument("--output", help="결과 JSONL 경로 (기본: 표준 출력)")
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--tokens-per-minute", type=float, default=None,
+                   help="API 토큰 한도 (기본 ADGEN_TOKENS_PER_MINUTE=30000). 작업의 예상 토큰으로 입장을 제어한다")
+    analysis_options(p)
+    pipeline_options(p)
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("worker", help="그래프를 한 번만 준비해 두고 JSON 줄 요청을 계속 처리 (stdin 또는 --socket)")
+    p.add_argument("--socket", help="유닉스 소켓 경로 (없으면 표준 입력/출력)")
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--tokens-per-minute", type=float, default=None, help="API 토큰 한도 (기본 ADGEN_TOKENS_PER_MINUTE)")
+    analysis_options(p)
+    pipeline_options(p)
+    p.set_defaults(func=cmd_worker)
+
+    p = sub.add_parser("results", help="저장된 생성 결과 조회/비교/내보내기")
+    p.add_argument("--product", help="제품 이름")
+    p.add_argument("--since", help="이 시각 이후 (ISO 날짜, 예: 2026-10-01)")
+    p.add_argument("--until", help="이 시각 이전 (ISO 날짜)")
+    p.add_argument("--ratio", type=float, help="종횡비 (예: 0.75)")
+    p.add_argument("--diff", nargs=2, type=int, metavar=("OLD", "NEW"), help="두 실행의 final_json 비교")
+    p.add_argument("--export", metavar="PATH", help=".jsonl(실행 단위) 또는 .npz/.parquet(장면 단위 열 지향)")
+    p.add_argument("--results-dir", default=None, help="저장소 디렉터리 (기본: ADGEN_RESULTS_DIR 또는 저장소 루트의 .cache/results)")
+    p.set_defaults(func=cmd_results)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
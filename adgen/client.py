@@ -0,0 +1,84 @@
+"""OpenAI 클라이언트를 처음 쓰는 순간에 한 번만 만든다 (import 시점에는 openai/dotenv/httpx를 불러오지 않는다).
+
+동기/비동기 클라이언트는 프로세스에 하나씩인 httpx 연결 풀을 공유한다. 연결은 keep-alive로 재사용되므로
+batch 모드의 여러 스레드가 요청마다 TCP/TLS 연결을 새로 맺지 않는다. 풀 크기와 timeout은 환경 변수로 조정한다.
+
+- ADGEN_HTTP_MAX_CONNECTIONS (100): 동시에 열 수 있는 최대 연결 수. 넘으면 풀에서 연결을 기다린다
+- ADGEN_HTTP_MAX_KEEPALIVE (20): 요청이 끝난 뒤에도 열어 두는 연결 수
+- ADGEN_HTTP_KEEPALIVE_EXPIRY (30): 쉬고 있는 연결을 닫기까지의 초
+- ADGEN_HTTP_CONNECT_TIMEOUT (5) / ADGEN_HTTP_READ_TIMEOUT (60) / ADGEN_HTTP_POOL_TIMEOUT (10): 초 단위
+- ADGEN_HTTP2 (0): 1이면 HTTP/2 (h2 패키지가 있을 때만, 없으면 HTTP/1.1 keep-alive)
+"""
+import functools
+import importlib.util
+import os
+import weakref
+from typing import Any, Dict, Optional
+
+_async_http_clients: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+
+def http_options() -> Dict[str, Any]:
+    import httpx
+
+    env = lambda name, default: float(os.getenv(name, default))  # noqa: E731
+    return {
+        "limits": httpx.Limits(max_connections=int(env("ADGEN_HTTP_MAX_CONNECTIONS", 100)),
+                               max_keepalive_connections=int(env("ADGEN_HTTP_MAX_KEEPALIVE", 20)),
+                               keepalive_expiry=env("ADGEN_HTTP_KEEPALIVE_EXPIRY", 30)),
+        "timeout": httpx.Timeout(env("ADGEN_HTTP_READ_TIMEOUT", 60), connect=env("ADGEN_HTTP_CONNECT_TIMEOUT", 5),
+                                 pool=env("ADGEN_HTTP_POOL_TIMEOUT", 10)),
+        "http2": os.getenv("ADGEN_HTTP2") == "1" and importlib.util.find_spec("h2") is not None,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_http_client():
+    import httpx
+
+    return httpx.Client(**http_options())
+
+
+def get_async_http_client():
+    """비동기 연결은 만든 이벤트 루프에 묶이므로 루프마다 풀을 하나씩 둔다 (루프가 사라지면 같이 정리)."""
+    import asyncio
+
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None:
+        client = _async_http_clients[loop] = httpx.AsyncClient(**http_options())
+    return client
+
+
+def _api_key(api_key: Optional[str]) -> Optional[str]:
+    if api_key is not None:
+        return api_key
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return os.getenv("OPEN_API_KEY")
+
+
+def make_client(api_key: Optional[str] = None, base_url: Optional[str] = None, http_client=None):
+    """공유 풀(또는 주어진 http_client)을 쓰는 동기 OpenAI 클라이언트."""
+    from openai import OpenAI
+
+    http_client = http_client or get_http_client()
+    return OpenAI(api_key=_api_key(api_key), base_url=base_url, http_client=http_client,
+                  timeout=http_client.timeout)
+
+
+def make_async_client(api_key: Optional[str] = None, base_url: Optional[str] = None, http_client=None):
+    """현재 이벤트 루프의 공유 풀을 쓰는 비동기 OpenAI 클라이언트. 루프 안에서 불러야 한다."""
+    from openai import AsyncOpenAI
+
+    http_client = http_client or get_async_http_client()
+    return AsyncOpenAI(api_key=_api_key(api_key), base_url=base_url, http_client=http_client,
+                       timeout=http_client.timeout)
+
+
+@functools.lru_cache(maxsize=None)
+def get_client():
+    return make_client()
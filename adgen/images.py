@@ -0,0 +1,86 @@
+"""이미지 인코딩과 layout 좌표 정규화 헬퍼 (test_v4.py에서 옮겨 옴)."""
+import base64
+import mimetypes
+from typing import Dict, List, Sequence, Tuple
+
+
+def encode_image_to_base64(image_path: str) -> str:
+    with open(image_path, "rb") as image_file:
+        return base64.b64encode(image_file.read()).decode("utf-8")
+
+
+def data_url(image_bytes: bytes, image_path: str = "") -> str:
+    mime = mimetypes.guess_type(image_path)[0] or "image/jpeg"
+    return f"data:{mime};base64,{base64.b64encode(image_bytes).decode('ascii')}"
+
+
+def image_size(image_path: str) -> Tuple[int, int]:
+    from PIL import Image
+
+    try:
+        with Image.open(image_path) as image:
+            return image.size
+    except OSError:
+        return 1, 1
+
+
+# 0~1 정규화 함수
+def clip01(v) -> float:
+    return max(0.0, min(1.0, float(v)))
+
+
+def clip_bbox(b: Sequence[float]) -> List[float]:
+    x, y, w, h = map(float, b)
+    x, y, w, h = clip01(x), clip01(y), clip01(w), clip01(h)
+    if x + w > 1: w = 1 - x
+    if y + h > 1: h = 1 - y
+    return [round(x, 4), round(y, 4), round(w, 4), round(h, 4)]
+
+
+def normalize_layout(parsed: Dict, size: Tuple[int, int]) -> Dict:
+    """픽셀 좌표로 온 subject_layout / bbox를 0~1 비율로 바꾼다."""
+    W, H = size
+    layout = parsed.get("layout")
+    if not isinstance(layout, dict):
+        return parsed
+
+    if "subject_layout" in layout:
+        c = layout["subject_layout"].get("center", [0.5, 0.5])
+        r = layout["subject_layout"].get("ratio", [0.3, 0.3])
+        if max(c) > 1.0 or max(r) > 1.0:
+            c = [clip01(float(c[0]) / W), clip01(float(c[1]) / H)]
+            r = [clip01(float(r[0]) / W), clip01(float(r[1]) / H)]
+        layout["subject_layout"] = {"center": c, "ratio": r}
+
+    for section in ["nongraphic_layout", "graphic_layout"]:
+        for item in layout.get(section, []):
+            if "bbox" in item:
+                b = item["bbox"]
+                if max(b) > 1.0:
+                    item["bbox"] = clip_bbox([b[0] / W, b[1] / H, b[2] / W, b[3] / H])
+                else:
+                    item["bbox"] = clip_bbox(b)
+    return parsed
+
+
+# fallback layout 추가 (if missing)
+def inject_fallback(parsed: Dict) -> Dict:
+    layout = parsed.get("layout", {})
+    margin = 0.04
+
+    # 텍스트 없으면 상/하 배너 삽입
+    if not layout.get("nongraphic_layout"):
+        layout["nongraphic_layout"] = [
+            {"type": "headline", "bbox": clip_bbox([margin, margin, 1 - 2 * margin, 0.12])},
+            {"type": "headline", "bbox": clip_bbox([margin, 1 - margin - 0.12, 1 - 2 * margin, 0.12])}
+        ]
+
+    # 로고 없으면 우상단 삽입
+    if not layout.get("graphic_layout"):
+        logo_w, logo_h = 0.25, 0.10
+        layout["graphic_layout"] = [
+            {"type": "logo", "content": "", "bbox": clip_bbox([1 - margin - logo_w, margin, logo_w, logo_h])}
+        ]
+
+    parsed["layout"] = layout
+    return parsed
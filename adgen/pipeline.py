@@ -0,0 +1,142 @@
+"""전체 광고 생성 그래프(test10.py)를 한 번 실행한다.
+
+test10은 langgraph/numpy/PIL을 불러오므로 이 함수가 처음 호출될 때만 import한다.
+"""
+import functools
+import hashlib
+import json
+import time
+from typing import Dict, List, Optional, Sequence, Union
+
+
+@functools.lru_cache(maxsize=None)
+def get_store():
+    from adgen.store import ResultStore
+
+    return ResultStore()
+
+
+@functools.lru_cache(maxsize=None)
+def get_graph():
+    import test10
+
+    return test10.create_graph()
+
+
+def images_hash(handles: List[str]) -> str:
+    """결과 저장소 키용 이미지 해시. 한 장이면 그 사진의 sha256, 여러 장이면 순서대로 묶은 해시."""
+    digests = [handle.split(":", 1)[-1] for handle in handles]
+    return digests[0] if len(digests) == 1 else hashlib.sha256(",".join(digests).encode()).hexdigest()
+
+
+def estimated_tokens(shots: int = 1) -> int:
+    """그래프 한 번 실행의 토큰 상한 추정 (스케줄러 입장 제어용)."""
+    import test10
+    from token_budget import IMAGE_TOKENS, SHOT_TOKENS, run_tokens
+
+    items = {"trend_insight": 4, "marketing_copy": test10.COPY_VARIANTS, "aspect_ratio_planner": len(test10.ASPECT_RATIOS)}
+    return run_tokens(items, SHOT_TOKENS * min(shots, test10.MAX_SHOTS) if shots > 1 else IMAGE_TOKENS)
+
+
+def used_tokens(final_state: Dict) -> Optional[int]:
+    """trace에 남은 실제 사용량 합. 저장된 결과를 쓴 실행은 0, 사용량을 모르면 None."""
+    if final_state.get("stored_run") is not None and not final_state.get("trace"):
+        return 0
+    counts = [entry.get("prompt_tokens", 0) + entry.get("completion_tokens", 0)
+              for entry in final_state.get("trace", []) if entry.get("prompt_tokens") is not None]
+    return sum(counts) if counts else None
+
+
+def hero_path(final_state: Dict, image_paths: List[str]) -> str:
+    hero = final_state["final_json"][0].get("hero_shot", 0) if final_state.get("final_json") else 0
+    return image_paths[min(hero, len(image_paths) - 1)]
+
+
+def run_pipeline(product_name: str, image_path: Union[str, Sequence[str]], out_dir: Optional[str] = "previews",
+                 verbose: bool = True, deadline: Optional[float] = None,
+                 store: bool = True, refresh: bool = False) -> Dict:
+    """최종 상태를 돌려준다. out_dir이 있으면 종횡비별 미리보기 PNG도 렌더링한다.
+
+    deadline(초, 기본 ADGEN_RUN_DEADLINE_S)이 지나면 남은 노드는 대체값으로 채워지고,
+    어떤 노드가 대체되었는지 final_state["degraded"]와 각 장면의 "degraded"에 남는다.
+
+    store=True면 (제품 이름, 이미지 해시, PROMPT_VERSION)으로 결과 저장소를 먼저 찾아 대체값 없는
+    이전 결과가 있으면 그래프를 돌리지 않고 돌려주고("stored_run"), 새 결과는 저장한다.
+    refresh=True면 조회만 건너뛴다.
+
+    image_path에 같은 제품의 사진 여러 장을 주면 한 번의 비전 요청으로 함께 분석하고,
+    분석기가 고른 대표 사진(장면의 "hero_shot")으로 마스크/미리보기를 만든다.
+
+    final_state["timing"]에는 그래프 실행 전 준비(import, 그래프 컴파일, 이미지 로드, 저장소 조회),
+    그래프 실행, 전체 시간을 ms로 남긴다. 같은 프로세스에서 두 번째 실행부터는 준비 시간이 거의 0이다.
+    """
+    called = time.perf_counter()
+    import test10
+    from deadlines import RUN_DEADLINE, run_deadline
+
+    image_paths = [image_path] if isinstance(image_path, str) else list(image_path)
+    image_blobs = test10.load_image_blobs(image_paths)
+    if not image_blobs:
+        return {"final_json": []}
+
+    image_hash = images_hash(image_blobs)
+    results = get_store() if store else None
+    stored = None
+    if results is not None and not refresh:
+        stored = results.latest(product_name, image_hash, test10.PROMPT_VERSION)
+
+    if stored is not None:
+        for handle in image_blobs:
+            test10.blobs.release(handle)
+        print(f"\n📦 저장된 결과를 사용합니다 (run {stored['id']}, {stored['created_at']})")
+        final_state = {"final_json": stored["final_json"], "degraded": [], "trace": [], "stored_run": stored["id"]}
+        gradient = stored.get("background_colors")
+        setup_ms, elapsed_time = (time.perf_counter() - called) * 1000, 0.0
+        if verbose:
+            print(json.dumps(final_state["final_json"], indent=4, ensure_ascii=False))
+    else:
+        graph = get_graph()
+        print("\n🚀 광고 생성 워크플로우를 시작합니다...")
+        setup_ms = (time.perf_counter() - called) * 1000
+        start_time = time.time()
+        try:
+            final_state = graph.invoke({"product_name": product_name, "image_blobs": image_blobs,
+                                        "deadline": run_deadline(RUN_DEADLINE if deadline is None else deadline)})
+        except Exception as e:
+            print(f"워크플로우 실행 중 치명적인 오류 발생: {e}")
+            final_state = {"final_json": []}  # 오류 발생 시 빈 JSON 반환
+        finally:
+            for handle in image_blobs:
+                test10.blobs.release(handle)
+        elapsed_time = time.time() - start_time
+        gradient = final_state.get("image_stats", {}).get("background_gradient")
+        if results is not None and final_state["final_json"]:
+            final_state["stored_run"] = results.save(product_name, image_hash, test10.PROMPT_VERSION,
+                                                     final_state["final_json"], final_state.get("degraded"),
+                                                     round(elapsed_time, 3), background_colors=gradient)
+
+        if verbose:
+            print("\n✅ 모든 에이전트 작업 완료. 최종 광고 구성 JSON 출력:")
+            print(json.dumps(final_state["final_json"], indent=4, ensure_ascii=False))
+        print(f"\n총 소요 시간: {elapsed_time:.2f}초")
+        if final_state.get("degraded"):
+            degraded = ", ".join(f"{entry['node']}({entry['reason']})" for entry in final_state["degraded"])
+            print(f"⚠️ 일부 결과는 대체값입니다: {degraded}")
+        overruns = [entry for entry in final_state.get("trace", [])
+                    if entry.get("prompt_overrun") or entry.get("output_overrun")]
+        for entry in overruns:
+            print(f"⚠️ {entry['node']}: 토큰 예산 초과 (입력 {entry.get('prompt_overrun', 0)} 초과, "
+                  f"출력 잘림 {bool(entry.get('output_overrun'))})")
+
+    if out_dir and final_state["final_json"]:
+        from poster_renderer import render_previews
+
+        # 마스크 경로는 장면에 들어 있으므로 저장된 결과와 새 결과를 같은 방식으로 렌더링한다
+        mask_path = (final_state["final_json"][0].get("product_mask") or {}).get("path")
+        preview_paths = render_previews(final_state["final_json"], hero_path(final_state, image_paths), out_dir,
+                                        product_name, background_colors=gradient, mask_path=mask_path)
+        final_state["previews"] = preview_paths
+        print(f"🖼️ 미리보기 {len(preview_paths)}장 저장: {', '.join(preview_paths)}")
+    final_state["timing"] = {"setup_ms": round(setup_ms, 1), "graph_ms": round(elapsed_time * 1000, 1),
+                             "total_ms": round((time.perf_counter() - called) * 1000, 1)}
+    return final_state
@@ -0,0 +1,81 @@
+"""test.py, test_v2~v6.py에 흩어져 있던 제품 분석 프롬프트 모음.
+
+v1/v2는 자유 형식 설명을, v3/v6은 product/background/layout JSON을 돌려받는다.
+"""
+
+DESIGNER = (
+    "You are a professional designer. What you see is a product. "
+    "You need to follow the instructions below:\n\n"
+    "# <front description>\n"
+    "Please give a description of the product.\n\n"
+)
+
+V1 = (
+    DESIGNER
+    + "# <back description>\n"
+    "Please use professional designer aesthetics to describe the background "
+    "in which the product looks best. Please give a detailed and objective description.\n\n"
+    "# Finally\n"
+    "Please output your predicted value in JSON format."
+    # 배경과 분리해서 분석해달라고 추가함
+    "Please analyze the product and the background *separately*, and do not assume the current background is optimal. "
+    "Recommend the best possible background based on product aesthetics, not what you see in the image."
+)
+
+V2 = (
+    DESIGNER
+    + "# <back description>\n"
+    "Please use professional designer aesthetics to describe the background in which the product looks best. "
+    "Please give a detailed and objective description. The background should:"
+    "- Highlight the product's features and use-case."
+    "- Include details such as location, lighting, mood, color scheme, and materials."
+    "- Avoid subjective or vague terms."
+    "- Be visually neutral enough to not overpower the product.\n\n"
+    "# Additionally:\n"
+    "Generate a concise background prompt suitable for use with AI image generation models like Stable Diffusion. "
+    "The prompt should include key visual elements such as:"
+    "- Location/setting"
+    "- Lighting"
+    "- Mood"
+    "- Color palette"
+    "- Background elements or materials\n\n"
+    "# Finally\n"
+    "Please output your predicted value in JSON format. Analyze the product and the background *separately*, "
+    "and do not assume the current background is optimal. Recommend the best possible background based on "
+    "product aesthetics, not what you see in the image."
+)
+
+V3 = (
+    '오직 다음 JSON만 출력해. 다른 설명/코멘트/마크다운 금지.\n'
+    '형식: {\n'
+    '  "product": {\n'
+    '    "type": "<제품 종류>",\n'
+    '    "material": "<재질>",\n'
+    '    "design": "<디자인 요약>",\n'
+    '    "features": "<브랜드/각인/색상 등 특징>"\n'
+    '  },\n'
+    '  "background": {\n'
+    '    "ideal_color": "<배경 색상>",\n'
+    '    "texture": "<배경 질감>",\n'
+    '    "lighting": "<조명 스타일>",\n'
+    '    "style": "<연출 스타일>"\n'
+    '  },\n'
+    '  "layout": {\n'
+    '    "subject_layout": {"center":[cx,cy],"ratio":[rw,rh]},\n'
+    '    "nongraphic_layout":[{"type":"headline","bbox":[x,y,w,h]},...],\n'
+    '    "graphic_layout":[{"type":"logo","content":"...","bbox":[x,y,w,h]},...]\n'
+    '  }\n'
+    '}'
+)
+
+V6 = (
+    V3 + '\n\n'
+    '이미지 안에 텍스트나 로고가 없어도,\n'
+    '나중에 headline이나 logo 같은 요소를 추가할 수 있는\n'
+    '적절한 배치 위치를 layout에 유추해서 채워라.\n'
+    '빈 배열은 절대 출력하지 말고, 예측해서 제안된 위치를 포함해라.'
+)
+
+PROMPTS = {"v1": V1, "v2": V2, "v3": V3, "v6": V6}
+JSON_PROMPTS = {"v3", "v6"}  # 응답을 JSON으로 파싱하고 layout을 정규화할 수 있는 프롬프트
+DEFAULT_PROMPT = "v6"
@@ -0,0 +1,218 @@
+"""대화형 요청과 대량 배치가 같은 API 토큰 한도를 나눠 쓰도록 앞에서 실행 순서를 정하는 스케줄러.
+
+- 우선순위: interactive 큐에 작업이 있으면 batch 작업은 꺼내지 않는다.
+- 공정 분배: 같은 우선순위 안에서는 테넌트(또는 배치)별 큐를 가중치 기반 가상 시간(SFQ)으로 돌아가며 꺼낸다.
+  토큰을 많이 쓰는 테넌트일수록 가상 시간이 빨리 늘어 다음 차례가 늦어진다.
+- 입장 제어: 분당 토큰 한도(tokens_per_minute)로 채워지는 토큰 버킷을 둔다. 작업은 예상 토큰만큼 버킷에서
+  빼고 시작하며, 끝나면 실제 사용량으로 정산한다. batch는 버킷에 interactive 몫(reserve)을 남겨 둘 때만 시작한다.
+- 부하 차단: 지금 대기 중인 작업과 버킷 잔량으로 본 예상 대기 시간이 우선순위별 한도를 넘거나 큐가 가득 차면
+  한도를 넘기 전에 Busy(retry_after)를 낸다. block=True로 넣으면 대신 자리가 날 때까지 기다린다 (배치 생산자용).
+- 관측: stats()가 우선순위/테넌트별 큐 길이, 실행 중인 수, 버킷 잔량, 대기 시간 p50/p95, 차단 수를 돌려준다.
+"""
+import collections
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+PRIORITIES = ("interactive", "batch")
+TOKENS_PER_MINUTE = float(os.getenv("ADGEN_TOKENS_PER_MINUTE", 30000))
+MAX_WAIT = {"interactive": float(os.getenv("ADGEN_MAX_WAIT_INTERACTIVE_S", 15)),
+            "batch": float(os.getenv("ADGEN_MAX_WAIT_BATCH_S", 600))}
+INTERACTIVE_RESERVE = 0.2  # batch가 손대지 않는 버킷 비율
+MAX_QUEUE = 1000
+
+
+class Busy(RuntimeError):
+    """지금 받으면 토큰 한도나 대기 한도를 넘기므로 받지 않는다. retry_after초 뒤에 다시 시도하면 된다."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(f"{message} ({retry_after:.1f}초 뒤 다시 시도)")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    fn: Callable[[], Any]
+    tokens: int
+    priority: str = "batch"
+    tenant: str = "default"
+    usage: Optional[Callable[[Any], Optional[int]]] = None  # 결과에서 실제 사용 토큰을 꺼내는 함수
+    future: Future = field(default_factory=Future)
+    submitted: float = field(default_factory=time.monotonic)
+    wait_ms: float = 0.0
+
+
+class Scheduler:
+    def __init__(self, workers: int = 4, tokens_per_minute: float = TOKENS_PER_MINUTE,
+                 weights: Optional[Dict[str, float]] = None, max_wait: Optional[Dict[str, float]] = None,
+                 max_queue: int = MAX_QUEUE):
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = tokens_per_minute
+        self.weights = dict(weights or {})
+        self.max_wait = dict(MAX_WAIT, **(max_wait or {}))
+        self.max_queue = max_queue
+
+        self._cond = threading.Condition()
+        self._level = self.capacity
+        self._refilled = time.monotonic()
+        self._queues: Dict[str, Dict[str, Deque[Job]]] = {p: collections.OrderedDict() for p in PRIORITIES}
+        self._vtime: Dict[str, Dict[str, float]] = {p: {} for p in PRIORITIES}
+        self._clock: Dict[str, float] = {p: 0.0 for p in PRIORITIES}
+        self._queued_tokens: Dict[str, int] = {p: 0 for p in PRIORITIES}
+        self._running = 0
+        self._waits: Dict[str, Deque[float]] = {p: collections.deque(maxlen=1000) for p in PRIORITIES}
+        self._counts = collections.Counter()
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, name=f"adgen-scheduler-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    # --- 토큰 버킷 ---
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _floor(self, priority: str) -> float:
+        return self.capacity * INTERACTIVE_RESERVE if priority == "batch" else 0.0
+
+    def _expected_wait(self, priority: str, tokens: int) -> float:
+        """이 작업이 시작될 때까지 버킷이 채워져야 하는 시간 (앞선 대기 작업 포함)."""
+        ahead = self._queued_tokens["interactive"]
+        if priority == "batch":
+            ahead += self._queued_tokens["batch"]
+        need = ahead + min(tokens, self.capacity) + self._floor(priority) - self._level
+        return max(0.0, need / self.rate)
+
+    # --- 제출 ---
+    def submit(self, fn: Callable[[], Any], tokens: int, priority: str = "batch", tenant: str = "default",
+               usage: Optional[Callable[[Any], Optional[int]]] = None, block: bool = False) -> Future:
+        if priority not in PRIORITIES:
+            raise ValueError(f"알 수 없는 우선순위 '{priority}' (사용 가능: {', '.join(PRIORITIES)})")
+        job = Job(fn, int(tokens), priority, tenant, usage)
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("스케줄러가 종료되었습니다.")
+                self._refill()
+                depth = sum(len(queue) for queue in self._queues[priority].values())
+                wait = self._expected_wait(priority, job.tokens)
+                if depth < self.max_queue and wait <= self.max_wait[priority]:
+                    break
+                retry_after = max(1.0, wait - self.max_wait[priority])
+                if not block:
+                    self._counts[f"{priority}_rejected"] += 1
+                    reason = "대기열이 가득 찼습니다" if depth >= self.max_queue else \
+                        f"토큰 한도로 예상 대기 {wait:.1f}초가 한도 {self.max_wait[priority]:.0f}초를 넘습니다"
+                    raise Busy(f"busy: {reason}", retry_after)
+                self._cond.wait(timeout=min(retry_after, 1.0))
+            job.submitted = time.monotonic()
+            self._queues[priority].setdefault(tenant, collections.deque()).append(job)
+            # 쉬다가 돌아온 테넌트가 밀린 몫을 한꺼번에 가져가지 않도록 현재 가상 시각부터 시작한다
+            vtime = self._vtime[priority]
+            vtime[tenant] = max(vtime.get(tenant, 0.0), self._clock[priority])
+            self._queued_tokens[priority] += job.tokens
+            self._counts[f"{priority}_admitted"] += 1
+            self._cond.notify_all()
+        return job.future
+
+    def run(self, fn: Callable[[], Any], tokens: int, **kwargs) -> Any:
+        return self.submit(fn, tokens, **kwargs).result()
+
+    # --- 실행 ---
+    def _next_job(self) -> Optional[Job]:
+        """시작할 수 있는 다음 작업을 큐에서 꺼낸다. 없으면 None (호출자가 기다린다)."""
+        self._refill()
+        for priority in PRIORITIES:
+            queues = self._queues[priority]
+            if not queues:
+                continue
+            vtime = self._vtime[priority]
+            tenant = min(queues, key=lambda name: vtime[name])
+            job = queues[tenant][0]
+            # 버킷보다 큰 작업은 버킷이 가득 찼을 때 시작한다 (영원히 못 들어가는 일이 없도록)
+            if self._level - self._floor(priority) < min(job.tokens, self.capacity - self._floor(priority)):
+                return None  # 우선순위가 높은 작업이 기다리는 동안 낮은 작업이 토큰을 가져가지 않게 한다
+            queues[tenant].popleft()
+            if not queues[tenant]:
+                del queues[tenant]
+            self._clock[priority] = vtime[tenant]
+            vtime[tenant] += job.tokens / self.weights.get(tenant, 1.0)
+            self._queued_tokens[priority] -= job.tokens
+            self._level -= job.tokens
+            return job
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._closed and not any(self._queues[p] for p in PRIORITIES):
+                        return
+                    # 토큰이 모자라면 다음 작업에 필요한 만큼 채워질 때까지만 잔다
+                    self._cond.wait(timeout=0.5)
+                    job = self._next_job()
+                self._running += 1
+                job.wait_ms = round((time.monotonic() - job.submitted) * 1000, 1)
+                self._waits[job.priority].append(job.wait_ms)
+                self._cond.notify_all()
+
+            if not job.future.set_running_or_notify_cancel():
+                self._finish(job, 0)
+                continue
+            try:
+                result = job.fn()
+            except BaseException as e:
+                self._finish(job, None)
+                job.future.set_exception(e)
+                continue
+            used = None
+            if job.usage is not None:
+                try:
+                    used = job.usage(result)
+                except Exception:
+                    used = None
+            self._finish(job, used)
+            job.future.set_result(result)
+
+    def _finish(self, job: Job, used: Optional[int]) -> None:
+        with self._cond:
+            self._running -= 1
+            self._counts[f"{job.priority}_completed"] += 1
+            if used is not None:
+                # 예상보다 적게 썼으면 돌려주고, 더 썼으면 그만큼 다음 작업이 늦게 시작한다
+                self._refill()
+                self._level = min(self.capacity, self._level + job.tokens - used)
+            self._cond.notify_all()
+
+    def close(self, wait: bool = True) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    # --- 관측 ---
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._refill()
+            result: Dict[str, Any] = {"running": self._running, "tokens_available": int(self._level),
+                                      "tokens_per_minute": int(self.capacity)}
+            for priority in PRIORITIES:
+                waits: List[float] = sorted(self._waits[priority])
+                result[priority] = {
+                    "queued": sum(len(queue) for queue in self._queues[priority].values()),
+                    "queued_tokens": self._queued_tokens[priority],
+                    "by_tenant": {tenant: len(queue) for tenant, queue in self._queues[priority].items()},
+                    "wait_p50_ms": waits[int(0.5 * (len(waits) - 1))] if waits else 0.0,
+                    "wait_p95_ms": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    **{name: self._counts[f"{priority}_{name}"] for name in ("admitted", "rejected", "completed")},
+                }
+            return result
+
@@ -0,0 +1,243 @@
+"""생성된 광고 장면(final_json)을 보관하는 로컬 결과 저장소 (SQLite + 내용 주소 JSON blob).
+
+- 실행 한 번은 runs 테이블의 한 행이다. 키는 (제품 이름, 이미지 sha256, 프롬프트 버전)이고,
+  같은 키로 다시 실행해 결과가 달라지면 새 버전 행이 추가된다 (이전 버전과 diff 가능).
+- final_json 본문은 정규화한 JSON의 sha256으로 blobs/ab/abcd....json 에 한 번만 저장된다.
+  같은 키로 같은 결과가 다시 나오면 행도 blob도 새로 만들지 않고, 그 행의 실행 시각/소요 시간/대체 여부만
+  이번 실행으로 갱신한다 (latest()가 가장 최근 실행을 보도록).
+- 미리보기 배경 그라데이션(background_colors)도 실행과 함께 저장해 저장된 결과도 같은 모습으로 렌더링한다.
+- scenes 테이블에는 종횡비별 문구만 풀어 두어 제품/날짜/종횡비로 인덱스 조회와 내보내기를 한다.
+"""
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+# 실행 위치와 상관없이 저장소 루트의 .cache/results를 쓴다
+RESULTS_DIR = os.path.abspath(os.getenv("ADGEN_RESULTS_DIR")
+                              or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "results"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    product_name TEXT NOT NULL,
+    image_hash TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    output_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL,          -- UTC ISO 8601, 문자열 비교로 기간 조회
+    elapsed_s REAL,
+    degraded TEXT NOT NULL DEFAULT '[]',
+    background_colors TEXT,            -- JSON, 없으면 NULL
+    UNIQUE (product_name, image_hash, prompt_version, output_hash)
+);
+CREATE INDEX IF NOT EXISTS runs_by_key ON runs (product_name, image_hash, prompt_version, created_at);
+CREATE INDEX IF NOT EXISTS runs_by_date ON runs (created_at);
+CREATE TABLE IF NOT EXISTS scenes (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    aspect_ratio REAL NOT NULL,
+    logo TEXT,
+    tagline TEXT,
+    underlay TEXT,
+    PRIMARY KEY (run_id, aspect_ratio)
+);
+CREATE INDEX IF NOT EXISTS scenes_by_ratio ON scenes (aspect_ratio);
+"""
+
+# 내보내기 한 행 = 장면 하나
+COLUMNS = ("run_id", "created_at", "product_name", "image_hash", "prompt_version", "output_hash",
+           "degraded", "aspect_ratio", "logo", "tagline", "underlay")
+
+
+def output_hash(final_json: List[Dict[str, Any]]) -> str:
+    canonical = json.dumps(final_json, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _scene_copy(scene: Dict[str, Any]) -> Dict[str, str]:
+    copy = {}
+    for element in scene.get("layout", {}).get("graphic", []):
+        if element.get("type") in ("logo", "tagline", "underlay"):
+            copy.setdefault(element["type"], element.get("content", ""))
+    return copy
+
+
+def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+    run = dict(row)
+    run["degraded"] = json.loads(run["degraded"])
+    run["background_colors"] = json.loads(run["background_colors"]) if run["background_colors"] else None
+    return run
+
+
+class ResultStore:
+    def __init__(self, root: str = RESULTS_DIR):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        # batch 모드는 스레드에서 저장하므로 연결 하나를 락으로 보호한다
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "results.sqlite3"), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(runs)")}
+        if "background_colors" not in columns:  # 이전 버전에서 만든 저장소
+            self._db.execute("ALTER TABLE runs ADD COLUMN background_colors TEXT")
+
+    def close(self) -> None:
+        self._db.close()
+
+    # --- blob ---
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.json")
+
+    def load_output(self, digest: str) -> List[Dict[str, Any]]:
+        with open(self._blob_path(digest), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_blob(self, digest: str, final_json: List[Dict[str, Any]]) -> None:
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(final_json, f, ensure_ascii=False)
+        os.replace(tmp, path)  # 같은 blob을 동시에 써도 반쯤 쓴 파일이 보이지 않는다
+
+    # --- 저장/조회 ---
+    def save(self, product_name: str, image_hash: str, prompt_version: str, final_json: List[Dict[str, Any]],
+             degraded: Optional[List[Dict[str, Any]]] = None, elapsed_s: Optional[float] = None,
+             background_colors: Optional[List[Any]] = None) -> int:
+        """실행 결과를 저장하고 run id를 돌려준다.
+
+        같은 키로 같은 결과가 이미 있으면 그 행의 created_at/elapsed_s/degraded(와 주어진 background_colors)를
+        이번 실행으로 갱신하고 그 id를 돌려준다.
+        """
+        digest = output_hash(final_json)
+        self._write_blob(digest, final_json)
+        created_at = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        key = (product_name, image_hash, prompt_version, digest)
+        with self._lock, self._db:
+            run_id = self._db.execute(
+                "INSERT INTO runs (product_name, image_hash, prompt_version, output_hash, created_at, elapsed_s,"
+                " degraded, background_colors) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (product_name, image_hash, prompt_version, output_hash) DO UPDATE SET"
+                " created_at = excluded.created_at, elapsed_s = excluded.elapsed_s, degraded = excluded.degraded,"
+                " background_colors = COALESCE(excluded.background_colors, runs.background_colors) RETURNING id",
+                (*key, created_at, elapsed_s, json.dumps(degraded or [], ensure_ascii=False),
+                 None if background_colors is None else json.dumps(background_colors))).fetchone()["id"]
+            self._db.executemany(
+                "INSERT OR REPLACE INTO scenes (run_id, aspect_ratio, logo, tagline, underlay) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, float(scene.get("aspect_ratio", 0)), *(_scene_copy(scene).get(k) for k in ("logo", "tagline", "underlay")))
+                 for scene in final_json])
+        return run_id
+
+    def latest(self, product_name: str, image_hash: str, prompt_version: str,
+               include_degraded: bool = False) -> Optional[Dict[str, Any]]:
+        """같은 키의 가장 최근 실행 (final_json 포함). 기본적으로 대체값이 섞인 실행은 건너뛴다."""
+        query = "SELECT * FROM runs WHERE product_name = ? AND image_hash = ? AND prompt_version = ?"
+        if not include_degraded:
+            query += " AND degraded = '[]'"
+        with self._lock:
+            row = self._db.execute(query + " ORDER BY created_at DESC, id DESC LIMIT 1",
+                                   (product_name, image_hash, prompt_version)).fetchone()
+        return self._with_output(row) if row else None
+
+    def get(self, run_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return self._with_output(row) if row else None
+
+    def _with_output(self, row: sqlite3.Row) -> Dict[str, Any]:
+        run = _decode(row)
+        run["final_json"] = self.load_output(run["output_hash"])
+        return run
+
+    def find(self, product_name: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+             aspect_ratio: Optional[float] = None) -> List[Dict[str, Any]]:
+        """조건에 맞는 실행 목록(최신순, final_json 제외). since/until은 ISO 날짜 문자열."""
+        query, params = self._filter("SELECT DISTINCT runs.* FROM runs", product_name, since, until, aspect_ratio)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY runs.created_at DESC, runs.id DESC", params).fetchall()
+        return [_decode(row) for row in rows]
+
+    @staticmethod
+    def _filter(select: str, product_name, since, until, aspect_ratio, join_scenes: bool = False):
+        clauses, params = [], []
+        if aspect_ratio is not None or join_scenes:
+            select += " JOIN scenes ON scenes.run_id = runs.id"
+        if product_name is not None:
+            clauses.append("runs.product_name = ?")
+            params.append(product_name)
+        if since is not None:
+            clauses.append("runs.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("runs.created_at < ?")
+            params.append(until)
+        if aspect_ratio is not None:
+            clauses.append("scenes.aspect_ratio = ?")
+            params.append(float(aspect_ratio))
+        return select + (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def diff(self, old_id: int, new_id: int) -> str:
+        """두 실행의 final_json을 unified diff로 비교한다."""
+        import difflib
+
+        old, new = self.get(old_id), self.get(new_id)
+        if old is None or new is None:
+            raise KeyError(f"실행 {old_id if old is None else new_id}을(를) 찾을 수 없습니다.")
+        lines = lambda run: json.dumps(run["final_json"], ensure_ascii=False, indent=2, sort_keys=True).splitlines()  # noqa: E731
+        return "\n".join(difflib.unified_diff(lines(old), lines(new), f"run {old_id}", f"run {new_id}", lineterm=""))
+
+    # --- 내보내기 ---
+    def scene_rows(self, **filters) -> Iterator[sqlite3.Row]:
+        select = ("SELECT runs.id AS run_id, runs.created_at, runs.product_name, runs.image_hash, runs.prompt_version,"
+                  " runs.output_hash, runs.degraded != '[]' AS degraded, scenes.aspect_ratio, scenes.logo,"
+                  " scenes.tagline, scenes.underlay FROM runs")
+        query, params = self._filter(select, join_scenes=True, **{k: filters.get(k) for k in
+                                                                  ("product_name", "since", "until", "aspect_ratio")})
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY runs.id, scenes.aspect_ratio", params).fetchall()
+        return iter(rows)
+
+    def export_jsonl(self, path: str, **filters) -> int:
+        """실행 하나를 한 줄로(final_json 본문 포함) 내보낸다. 같은 blob은 한 번만 읽는다."""
+        query, params = self._filter("SELECT DISTINCT runs.* FROM runs", **{k: filters.get(k) for k in
+                                                                           ("product_name", "since", "until", "aspect_ratio")})
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY runs.id", params).fetchall()
+        outputs: Dict[str, Any] = {}
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                digest = row["output_hash"]
+                if digest not in outputs:
+                    outputs[digest] = self.load_output(digest)
+                record = dict(_decode(row), final_json=outputs[digest])
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(rows)
+
+    def export_columns(self, path: str, **filters) -> int:
+        """장면 단위 열 지향 파일로 내보낸다. .parquet은 pyarrow가 있어야 하고, 그 외에는 numpy .npz로 쓴다."""
+        rows = list(self.scene_rows(**filters))
+        columns = {name: [row[name] for row in rows] for name in COLUMNS}
+        if path.endswith(".parquet"):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise RuntimeError("parquet로 내보내려면 pyarrow가 필요합니다 (.npz 경로를 쓰면 필요 없음).") from e
+            pq.write_table(pa.table(columns), path)
+        else:
+            import numpy as np
+
+            # 문자열 열도 유니코드 dtype으로 저장하므로 allow_pickle 없이 읽을 수 있다
+            arrays = {name: np.asarray(["" if v is None else v for v in values]) if name not in
+                      ("run_id", "aspect_ratio", "degraded") else np.asarray(values)
+                      for name, values in columns.items()}
+            with open(path, "wb") as f:
+                np.savez_compressed(f, **arrays)
+        return len(rows)
@@ -0,0 +1,57 @@
+import base64
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adgen.pipeline import hero_path, images_hash  # noqa: E402
+from blob_store import BlobStore  # noqa: E402
+
+
+def jpeg(width: int, height: int) -> bytes:
+    from PIL import Image
+
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(out, "JPEG")
+    return out.getvalue()
+
+
+def test_single_shot_key_is_the_image_digest():
+    store = BlobStore()
+    handle = store.put(b"front")
+    assert images_hash([handle]) == store.digest(handle)
+
+
+def test_multi_shot_key_depends_on_every_shot_and_order():
+    store = BlobStore()
+    front, side, back = store.put(b"front"), store.put(b"side"), store.put(b"back")
+    key = images_hash([front, side])
+    assert key not in {store.digest(front), store.digest(side)}
+    assert images_hash([side, front]) != key
+    assert images_hash([front, side, back]) != key
+    assert images_hash([front, side]) == key
+
+
+def test_hero_path_follows_the_chosen_shot():
+    paths = ["front.jpg", "side.jpg", "back.jpg"]
+    assert hero_path({"final_json": [{"hero_shot": 2}]}, paths) == "back.jpg"
+    assert hero_path({"final_json": [{"hero_shot": 5}]}, paths) == "back.jpg"
+    assert hero_path({"final_json": [{}]}, paths) == "front.jpg"
+    assert hero_path({"final_json": []}, paths) == "front.jpg"
+
+
+def test_shots_are_downscaled_only_for_the_request():
+    from PIL import Image
+
+    store = BlobStore()
+    original = jpeg(1600, 900)
+    handle = store.put(original)
+    url = store.data_url(handle, max_side=512)
+    sent = base64.b64decode(url.split(",", 1)[1])
+    with Image.open(io.BytesIO(sent)) as image:
+        assert image.size == (512, 288)
+    assert store.view(handle).tobytes() == original  # 로컬 처리용 원본은 그대로
+
+    small = store.put(jpeg(300, 200))
+    assert store.data_url(small, max_side=512) == store.data_url(small)
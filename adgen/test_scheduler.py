@@ -0,0 +1,114 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adgen.scheduler import Busy, Scheduler  # noqa: E402
+
+
+def hold(scheduler: Scheduler, tokens: int = 1, priority: str = "batch") -> threading.Event:
+    """작업자 하나를 붙잡아 두고, 풀어 줄 이벤트를 돌려준다 (그동안 넣은 작업은 큐에 쌓인다)."""
+    started, release = threading.Event(), threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    scheduler.submit(blocker, tokens, priority=priority, tenant="holder")
+    assert started.wait(5)
+    return release
+
+
+def run_order(scheduler: Scheduler, jobs):
+    order = []
+    release = hold(scheduler)
+    futures = [scheduler.submit(lambda label=label: order.append(label), tokens, priority=priority, tenant=tenant)
+               for label, tokens, priority, tenant in jobs]
+    release.set()
+    for future in futures:
+        future.result(5)
+    return order
+
+
+def test_tenants_take_turns_within_a_priority():
+    scheduler = Scheduler(workers=1, tokens_per_minute=600000)
+    try:
+        jobs = [(f"a{i}", 100, "batch", "a") for i in range(6)] + [(f"b{i}", 100, "batch", "b") for i in range(2)]
+        order = run_order(scheduler, jobs)
+    finally:
+        scheduler.close()
+    # 큰 배치(a)가 먼저 잔뜩 들어와도 b는 뒤로 밀리지 않고 번갈아 실행된다
+    assert order[:4] == ["a0", "b0", "a1", "b1"]
+    assert order[4:] == ["a2", "a3", "a4", "a5"]
+
+
+def test_weights_and_token_cost_set_the_share():
+    scheduler = Scheduler(workers=1, tokens_per_minute=600000, weights={"heavy": 3})
+    try:
+        jobs = [(f"h{i}", 100, "batch", "heavy") for i in range(6)] + [(f"l{i}", 100, "batch", "light") for i in range(2)]
+        order = run_order(scheduler, jobs)
+        big = [(f"x{i}", 300, "batch", "big") for i in range(2)] + [(f"s{i}", 100, "batch", "small") for i in range(6)]
+        costly = run_order(scheduler, big)
+    finally:
+        scheduler.close()
+    # 가중치 3인 테넌트는 상대가 한 번 돌 때 세 번, 토큰을 세 배 쓰는 테넌트는 상대가 세 번 돌 때 한 번 실행된다
+    assert order[:5] == ["h0", "l0", "h1", "h2", "h3"]
+    assert costly[:5] == ["x0", "s0", "s1", "s2", "x1"]
+
+
+def test_interactive_jumps_ahead_of_queued_batch():
+    scheduler = Scheduler(workers=1, tokens_per_minute=600000)
+    try:
+        jobs = [(f"batch{i}", 100, "batch", "bulk") for i in range(3)] + [("now", 100, "interactive", "user")]
+        order = run_order(scheduler, jobs)
+    finally:
+        scheduler.close()
+    assert order[0] == "now"
+
+
+def test_busy_when_expected_wait_exceeds_the_limit():
+    scheduler = Scheduler(workers=1, tokens_per_minute=600, max_wait={"interactive": 1, "batch": 1})
+    release = hold(scheduler, tokens=600, priority="interactive")  # 버킷을 비운다
+    try:
+        with pytest.raises(Busy) as excinfo:
+            scheduler.submit(lambda: None, 300, priority="interactive")
+        # 300토큰이 채워지는 데 약 30초, 한도 1초를 뺀 만큼 뒤에 다시 오라고 한다
+        assert 25 <= excinfo.value.retry_after <= 30
+        with pytest.raises(Busy) as excinfo:
+            scheduler.submit(lambda: None, 300, priority="batch")
+        # batch는 interactive 몫(20%)까지 채워질 때를 기다려야 하므로 더 늦다
+        assert 37 <= excinfo.value.retry_after <= 42
+        stats = scheduler.stats()
+        assert stats["interactive"]["rejected"] == 1 and stats["batch"]["rejected"] == 1
+        assert stats["interactive"]["queued"] == 0
+    finally:
+        release.set()
+        scheduler.close()
+
+
+def test_busy_when_queue_is_full():
+    scheduler = Scheduler(workers=1, tokens_per_minute=600000, max_queue=1)
+    release = hold(scheduler)
+    try:
+        scheduler.submit(lambda: None, 1)
+        with pytest.raises(Busy) as excinfo:
+            scheduler.submit(lambda: None, 1)
+        assert excinfo.value.retry_after >= 1.0
+        # 우선순위마다 큐가 따로 있으므로 interactive는 받는다
+        scheduler.submit(lambda: None, 1, priority="interactive")
+    finally:
+        release.set()
+        scheduler.close()
+
+
+def test_actual_usage_refunds_the_estimate():
+    scheduler = Scheduler(workers=1, tokens_per_minute=600)
+    try:
+        assert scheduler.run(lambda: {"used": 100}, 600, priority="interactive", usage=lambda result: result["used"])
+        # 600을 빼고 시작했지만 100만 썼으므로 500이 돌아온다
+        assert scheduler.stats()["tokens_available"] >= 500
+    finally:
+        scheduler.close()
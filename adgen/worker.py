@@ -0,0 +1,186 @@
+"""그래프와 클라이언트를 한 번만 준비해 두고 실행 요청을 계속 받는 상주 워커.
+
+요청/응답은 한 줄에 JSON 하나다. 표준 입력(기본) 또는 로컬 유닉스 소켓(--socket)으로 받는다.
+
+    {"id": 1, "product_name": "...", "image_path": "./a.jpg"}            -> 파이프라인 실행
+    {"id": 2, "product_name": "...", "image_paths": [...], "tenant": "shop-1", "priority": "batch"}
+    {"id": 3, "cmd": "stats"}                                            -> 스케줄러 상태
+
+응답은 {"id", "ok", "result" | "error"}이고, 실행 응답의 result["timing"]에 그 실행의 준비 시간(setup_ms)과
+그래프 시간(graph_ms)이 있다. 시작할 때는 {"event": "ready", "warmup_ms": {...}}로 콜드 스타트 비용
+(import, 그래프 컴파일, 클라이언트/캐시 준비)을 한 번 알린다. 실행은 스케줄러를 거치므로 토큰 한도를 넘길
+요청은 {"ok": false, "error": "busy", "retry_after": 초}로 바로 돌려준다.
+에이전트 진행 로그는 stderr로 보낸다.
+"""
+import contextlib
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TextIO
+
+
+def warm_up() -> Dict[str, float]:
+    """import, 그래프 컴파일, OpenAI 클라이언트/연결 풀, 유사도 캐시 로드를 미리 해 두고 단계별 ms를 돌려준다."""
+    timings = {}
+    started = time.perf_counter()
+    import test10
+
+    timings["imports_ms"] = (time.perf_counter() - started) * 1000
+
+    from adgen.pipeline import get_graph, get_store
+
+    started = time.perf_counter()
+    get_graph()
+    timings["graph_ms"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    from adgen.client import get_client
+
+    try:
+        get_client()
+    except Exception as e:  # API 키가 없어도 워커는 뜬다 (에이전트는 대체값을 쓴다)
+        print(f"⚠️ OpenAI 클라이언트를 만들지 못했습니다: {e}", file=sys.stderr)
+    timings["client_ms"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    len(test10.trend_cache), len(test10.copy_cache)
+    get_store()
+    timings["caches_ms"] = (time.perf_counter() - started) * 1000
+    return {name: round(value, 1) for name, value in timings.items()}
+
+
+class Worker:
+    def __init__(self, args):
+        from adgen.scheduler import Scheduler
+
+        self.args = args
+        self.scheduler = Scheduler(workers=args.workers, **({"tokens_per_minute": args.tokens_per_minute}
+                                                            if args.tokens_per_minute else {}))
+
+    def handle(self, request: Dict[str, Any], reply: Callable[[Dict[str, Any]], None]) -> None:
+        """요청 하나를 처리한다. 실행 요청은 스케줄러에 넣고 끝나면 reply를 부른다 (응답 순서는 완료 순)."""
+        from adgen.cli import job_tokens, job_usage, run_job
+        from adgen.scheduler import Busy
+
+        request_id = request.get("id")
+        if request.get("cmd") == "stats":
+            reply({"id": request_id, "ok": True, "result": self.scheduler.stats()})
+            return
+
+        def run() -> Dict[str, Any]:
+            try:
+                return {"id": request_id, "ok": True, "result": run_job("pipeline", request, self.args)}
+            except Exception as e:
+                return {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+        try:
+            future = self.scheduler.submit(run, job_tokens("pipeline", request, self.args),
+                                           priority=request.get("priority", "interactive"),
+                                           tenant=str(request.get("tenant", "default")),
+                                           usage=lambda record: job_usage("pipeline", record))
+        except Busy as e:
+            reply({"id": request_id, "ok": False, "error": "busy", "message": str(e),
+                   "retry_after": round(e.retry_after, 1)})
+            return
+        except Exception as e:
+            reply({"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"})
+            return
+        future.add_done_callback(lambda done: reply(done.result()))
+
+    def serve_lines(self, lines, write: Callable[[Dict[str, Any]], None]) -> None:
+        """JSON 줄을 읽어 처리한다. 입력이 끝나면 이미 받은 요청이 모두 끝날 때까지 기다린다."""
+        pending = threading.Semaphore(0)
+        count = 0
+
+        def reply(response: Dict[str, Any]) -> None:
+            # 쓰기가 실패해도(연결 끊김 등) 입력 끝에서 기다리는 루프가 멈추지 않게 한다
+            try:
+                write(response)
+            finally:
+                pending.release()
+
+        for line in lines:
+            if not line.strip():
+                continue
+            count += 1
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                reply({"id": None, "ok": False, "error": f"잘못된 JSON: {e}"})
+                continue
+            self.handle(request, reply)
+        for _ in range(count):
+            pending.acquire()
+
+
+def _writer(stream: TextIO) -> Callable[[Dict[str, Any]], None]:
+    lock = threading.Lock()
+
+    def write(response: Dict[str, Any]) -> None:
+        with lock:
+            stream.write(json.dumps(response, ensure_ascii=False) + "\n")
+            stream.flush()
+
+    return write
+
+
+def serve(args) -> int:
+    out = sys.stdout
+    # 에이전트 print가 프로토콜 출력(stdout)과 섞이지 않게 한다
+    with contextlib.redirect_stdout(sys.stderr):
+        started = time.perf_counter()
+        warmup = warm_up()
+        warmup["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        worker = Worker(args)
+        ready = {"event": "ready", "warmup_ms": warmup, "pid": os.getpid()}
+
+        if not args.socket:
+            write = _writer(out)
+            write(ready)
+            worker.serve_lines(sys.stdin, write)
+            return 0
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                stream = self.wfile
+                lock = threading.Lock()
+
+                def write(response: Dict[str, Any]) -> None:
+                    with lock:
+                        stream.write((json.dumps(response, ensure_ascii=False) + "\n").encode())
+                        stream.flush()
+
+                worker.serve_lines((line.decode() for line in self.rfile), write)
+
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        server = socketserver.ThreadingUnixStreamServer(args.socket, Handler)
+        server.daemon_threads = True
+        # SIGTERM으로 멈춰도 finally에서 소켓 파일을 지우도록 SystemExit로 바꾼다
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        print(json.dumps(dict(ready, socket=args.socket), ensure_ascii=False), file=out, flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            os.unlink(args.socket)
+    return 0
+
+
+def request(socket_path: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """소켓 워커에 요청 하나를 보내고 응답을 기다리는 클라이언트 헬퍼."""
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode())
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile("r", encoding="utf-8") as f:
+            return json.loads(f.readline())
@@ -0,0 +1,107 @@
+"""에이전트별 strict JSON 스키마(짧은 키)와, 응답을 기존 상태/final_json 모양으로 되돌리는 확장 함수.
+
+GPT 응답 시간은 생성 토큰 수에 거의 비례하므로 키는 한두 글자로 줄이고, 이미 상태에 있는 값
+(그래픽 요소 문구 등)은 다시 쓰게 하지 않고 번호로만 참조하게 한다. 스키마를 strict로 주면
+키 이름이나 bbox 형식이 응답마다 달라지는 일이 없다.
+
+bbox는 항상 캔버스 대비 비율 [x1, y1, x2, y2]이다.
+"""
+from typing import Any, Dict, List, Sequence
+
+ASPECT_RATIOS = ["0.684", "1.0", "0.667", "0.75"]
+
+_STRING = {"type": "string"}
+_BBOX = {"type": "array", "items": {"type": "number"},
+         "description": "[x1, y1, x2, y2], 캔버스 대비 0~1 비율, x1 < x2, y1 < y2"}
+
+
+def _object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+def _array(items: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "array", "items": items}
+
+
+SCHEMAS = {
+    # f: 제품 외형 특징 (모든 사진 종합), u: 용도, h: 대표 사진(히어로 샷) 번호
+    "product_analysis": _object({"f": _STRING, "u": _STRING, "h": {"type": "integer"}}),
+    # c: 카테고리, b: 인기 브랜드, s: 예시 슬로건, t: 톤
+    "trend_insight": _object({"c": _STRING, "b": _array(_STRING), "s": _array(_STRING), "t": _STRING}),
+    # v: 문구 후보 목록 (l: 로고, t: 태그라인, u: 언더레이)
+    "marketing_copy": _object({"v": _array(_object({"l": _STRING, "t": _STRING, "u": _STRING}))}),
+    # c: 배경 설명, p: 이미지 생성 프롬프트
+    "background": _object({"c": _STRING, "p": _STRING}),
+    # fg/bg: 전경/배경 프롬프트 (종횡비 공통), r: 종횡비별 배치
+    #   a: 종횡비, n: 비그래픽 요소 (k: 종류), g: 그래픽 요소 (e: 입력 그래픽 요소 번호)
+    "layout": _object({
+        "fg": _STRING,
+        "bg": _STRING,
+        "r": _array(_object({
+            "a": {"type": "string", "enum": ASPECT_RATIOS},
+            "n": _array(_object({"k": _STRING, "b": _BBOX})),
+            "g": _array(_object({"e": {"type": "integer"}, "b": _BBOX})),
+        })),
+    }),
+}
+
+
+def response_format(name: str) -> Dict[str, Any]:
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": SCHEMAS[name]}}
+
+
+def normalize_bbox(bbox: Sequence[float]) -> List[float]:
+    """[x1, y1, x2, y2]로 맞추고 0~1로 자른다. 뒤집힌 상자는 예전 응답처럼 [x, y, w, h]로 보고 변환한다."""
+    x1, y1, a, b = (float(v) for v in (list(bbox) + [0.0] * 4)[:4])
+    if a <= x1 or b <= y1:
+        a, b = x1 + a, y1 + b
+    clip = lambda v: round(max(0.0, min(1.0, v)), 4)  # noqa: E731
+    x1, y1 = clip(x1), clip(y1)
+    return [x1, y1, max(x1, clip(a)), max(y1, clip(b))]
+
+
+# --- 확장: 짧은 키 -> 기존 상태 모양 ---
+def expand_product_analysis(data: Dict, shots: int = 1) -> Dict:
+    hero = data.get("h")
+    return {"product_features": data.get("f", ""), "use_case": data.get("u", ""),
+            "hero_shot": hero if isinstance(hero, int) and 0 <= hero < shots else 0}
+
+
+def expand_trend_insight(data: Dict) -> Dict:
+    return {"category": data.get("c", ""), "popular_brands": data.get("b", []),
+            "slogans": data.get("s", []), "tone": data.get("t", "")}
+
+
+def expand_marketing_copy(data: Dict) -> List[Dict]:
+    return [{"logo": v.get("l", ""), "tagline": v.get("t", ""), "underlay": v.get("u", "")} for v in data.get("v", [])]
+
+
+def expand_background(data: Dict) -> Dict:
+    return {"background_caption": data.get("c", ""), "background_prompt": data.get("p", "")}
+
+
+def expand_layout(data: Dict, graphic_elements: Sequence[Dict]) -> Dict[str, Dict]:
+    """AspectRatioPlanner 응답을 SceneAssembler가 읽는 {ratio: {...}} 모양으로 되돌린다."""
+    layouts = {}
+    for entry in data.get("r", []):
+        ratio = entry.get("a")
+        if ratio not in ASPECT_RATIOS:
+            continue
+        graphic = []
+        for element in entry.get("g", []):
+            index = element.get("e")
+            if not isinstance(index, int) or not 0 <= index < len(graphic_elements):
+                continue
+            source = graphic_elements[index]
+            graphic.append({"type": source["type"], "content": source["content"], "bbox": normalize_bbox(element["b"])})
+        layout = {"target canvas aspect ratio": float(ratio)}
+        # 비어 있으면 키를 빼서 SceneAssembler가 제품 특징/배경 설명으로 대신 채우게 한다
+        if data.get("fg"):
+            layout["foreground prompt"] = data["fg"]
+        if data.get("bg"):
+            layout["background prompt"] = data["bg"]
+        layout["nongraphic layout"] = [{"type": element.get("k", ""), "bbox": normalize_bbox(element["b"])}
+                                       for element in entry.get("n", [])]
+        layout["graphic layout"] = graphic
+        layouts[ratio] = layout
+    return layouts
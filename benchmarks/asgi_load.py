@@ -0,0 +1,239 @@
+"""planner / todo FastAPI 앱을 네트워크 없이 ASGI 전송으로 직접 호출하는 부하 테스트.
+
+사용 예:
+    python benchmarks/asgi_load.py --app planner --sizes 100,10000,1000000 --concurrency 64
+    python benchmarks/asgi_load.py --app todo --output bench.json --compare bench_prev.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLANNER_DIR = os.path.join(ROOT, "planner")
+TODO_DIR = os.path.join(ROOT, "fastapi")
+
+
+@dataclass
+class Route:
+    """가중치가 붙은 요청 한 종류. make()는 (method, url, kwargs)를 만든다."""
+    name: str
+    weight: int
+    make: Callable[[random.Random, int], Tuple[str, str, dict]]
+
+
+@dataclass
+class Scenario:
+    app: object
+    seed: Callable[[int], None]
+    mixes: Dict[str, List[Route]] = field(default_factory=dict)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# --- 앱 로더 ---
+def load_planner() -> Scenario:
+    sys.path.insert(0, PLANNER_DIR)
+    from main import app
+    from auth.authenticate import sessions
+    from models.events import Event
+    from routes import events as event_routes
+    from routes import users as user_routes
+
+    password_hash = user_routes.hash_password.hash_sync("strong!!!")
+    tokens: Dict[str, str] = {}
+
+    def auth(email: str) -> dict:
+        return {"headers": {"Authorization": f"Bearer {tokens[email]}"}}
+
+    def seed(size: int) -> None:
+        event_routes.events.clear()
+        for i in range(1, size + 1):
+            event_routes.events.add(Event(
+                id=i, title=f"Event {i}", image="https://linktomyimage.com/image.png",
+                description=f"Benchmark event number {i}", tags=["bench"], location="Google Meet",
+            ))
+        user_routes.users.clear()
+        for i in range(10):
+            user = user_routes.User(email=f"user{i}@packt.com", password=password_hash,
+                                    username=f"user{i}", events=[str(j) for j in range(1, 11)])
+            user_routes.users[user.email] = user
+            tokens[user.email] = sessions.issue(user.email)
+
+    def event_body(rng: random.Random, size: int) -> dict:
+        new_id = size + 1 + rng.randrange(10 ** 9)
+        return {"id": new_id, "title": "New event", "image": "x", "description": "created by benchmark",
+                "tags": ["bench"], "location": "Seoul"}
+
+    read_routes = [
+        Route("GET /event/{id}", 6, lambda rng, n: ("GET", f"/event/{rng.randint(1, n)}", {})),
+        Route("GET /event/?limit=50&after", 3,
+              lambda rng, n: ("GET", f"/event/?limit=50&after={rng.randint(0, n)}", {})),
+        Route("GET /user/{email}/events", 2, lambda rng, n: (
+            lambda email: ("GET", f"/user/{email}/events", auth(email)))(f"user{rng.randrange(10)}@packt.com")),
+        Route("POST /user/signin", 1, lambda rng, n: (
+            "POST", "/user/signin", {"json": {"email": f"user{rng.randrange(10)}@packt.com", "password": "strong!!!"}})),
+    ]
+    write_routes = [
+        Route("POST /event/new", 5, lambda rng, n: ("POST", "/event/new", {"json": event_body(rng, n), **auth("user0@packt.com")})),
+        Route("DELETE /event/{id}", 2, lambda rng, n: ("DELETE", f"/event/{rng.randint(1, n)}", auth("user0@packt.com"))),
+        Route("GET /event/{id}", 3, lambda rng, n: ("GET", f"/event/{rng.randint(1, n)}", {})),
+    ]
+    return Scenario(app, seed, {"read": read_routes, "write": write_routes, "mixed": read_routes + write_routes})
+
+
+def load_todo() -> Scenario:
+    sys.path.insert(0, TODO_DIR)
+    os.chdir(TODO_DIR)  # Jinja2Templates(directory="templates/")가 상대 경로
+    os.environ.setdefault("TODO_DATA_DIR", tempfile.mkdtemp(prefix="todo-bench-"))
+    from api import app
+    import todo as todo_routes
+
+    def seed(size: int) -> None:
+        store = todo_routes.todo_store
+        store.clear()
+        for i in range(1, size + 1):
+            store.add(f"Benchmark todo {i}")
+        # 시드 데이터를 스냅샷으로 접어 두고 측정을 시작한다
+        store.snapshot()
+
+    read_routes = [
+        Route("GET /todo/{id}", 8, lambda rng, n: ("GET", f"/todo/{rng.randint(1, n)}", {})),
+        Route("GET /", 2, lambda rng, n: ("GET", "/", {})),
+    ]
+    write_routes = [
+        Route("POST /todo", 4, lambda rng, n: ("POST", "/todo", {"data": {"item": "new todo"}})),
+        Route("PUT /todo/{id}", 4, lambda rng, n: ("PUT", f"/todo/{rng.randint(1, n)}", {"json": {"item": "updated"}})),
+        Route("GET /todo/{id}", 2, lambda rng, n: ("GET", f"/todo/{rng.randint(1, n)}", {})),
+    ]
+    return Scenario(app, seed, {"read": read_routes, "write": write_routes, "mixed": read_routes + write_routes})
+
+
+LOADERS = {"planner": load_planner, "todo": load_todo}
+
+
+# --- 실행 ---
+async def run_load(app, routes: List[Route], size: int, total: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    weights = [route.weight for route in routes]
+    plan = rng.choices(routes, weights=weights, k=total)
+    latencies: Dict[str, List[float]] = {route.name: [] for route in routes}
+    statuses: Dict[str, Dict[str, int]] = {route.name: {} for route in routes}
+    cursor = iter(plan)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker() -> None:
+            for route in cursor:
+                method, url, kwargs = route.make(rng, size)
+                started = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                latencies[route.name].append(time.perf_counter() - started)
+                code = str(response.status_code)
+                statuses[route.name][code] = statuses[route.name].get(code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    report = {"elapsed_s": elapsed, "requests": total, "throughput_rps": total / elapsed, "routes": {}}
+    for name, values in latencies.items():
+        values.sort()
+        report["routes"][name] = {
+            "count": len(values),
+            "throughput_rps": len(values) / elapsed,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "status": statuses[name],
+        }
+    return report
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(app_name: str, mix: str, size: int, report: dict) -> None:
+    print(f"\n[{app_name}] mix={mix} size={size:,} -> {report['throughput_rps']:.0f} req/s")
+    print(f"  {'route':<32}{'count':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["routes"].items():
+        print(f"  {name:<32}{stats['count']:>8}{stats['throughput_rps']:>10.0f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+
+def compare(current: dict, baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n=== {baseline.get('revision')} -> {current.get('revision')} (p95 ms / req/s) ===")
+    for key, result in current["results"].items():
+        before = baseline["results"].get(key)
+        if not before:
+            continue
+        for name, stats in result["routes"].items():
+            old = before["routes"].get(name)
+            if not old:
+                continue
+            delta = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+            print(f"  {key:<28}{name:<32}{old['p95_ms']:>9.2f} -> {stats['p95_ms']:>9.2f} ({delta:+.1f}%)"
+                  f"  {old['throughput_rps']:>8.0f} -> {stats['throughput_rps']:>8.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", choices=["planner", "todo", "all"], default="all")
+    parser.add_argument("--mix", choices=["read", "write", "mixed"], default="mixed")
+    parser.add_argument("--sizes", default="100,10000,100000", help="쉼표로 구분한 데이터셋 크기 (최대 1000000)")
+    parser.add_argument("--requests", type=int, default=2000, help="데이터셋 크기별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    apps = list(LOADERS) if args.app == "all" else [args.app]
+    results = {
+        "revision": git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {"mix": args.mix, "requests": args.requests, "concurrency": args.concurrency, "seed": args.seed},
+        "results": {},
+    }
+    cwd = os.getcwd()
+    for app_name in apps:
+        scenario = LOADERS[app_name]()
+        for size in sizes:
+            scenario.seed(size)
+            report = asyncio.run(run_load(scenario.app, scenario.mixes[args.mix], size,
+                                          args.requests, args.concurrency, args.seed))
+            results["results"][f"{app_name}/{args.mix}/{size}"] = report
+            print_report(app_name, args.mix, size, report)
+        os.chdir(cwd)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n결과 저장: {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
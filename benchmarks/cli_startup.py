@@ -0,0 +1,82 @@
+"""`python -m adgen` 시작 시간 측정: --help와 캐시 적중 analyze 실행의 wall-clock 시간.
+
+캐시 적중 실행은 임시 캐시 디렉터리에 미리 응답을 넣어 두고 측정하므로 네트워크/API 키가 필요 없다.
+
+사용 예:
+    python benchmarks/cli_startup.py --runs 20 --target-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from adgen.analyze import cache_key  # noqa: E402
+
+SAMPLE_RESPONSE = {
+    "product": {"type": "bottle", "material": "steel", "design": "minimal", "features": "matte"},
+    "background": {"ideal_color": "white", "texture": "paper", "lighting": "soft", "style": "studio"},
+    "layout": {"subject_layout": {"center": [0.5, 0.5], "ratio": [0.4, 0.6]},
+               "nongraphic_layout": [], "graphic_layout": []},
+}
+
+
+def measure(argv, runs: int, env) -> dict:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "adgen", *argv], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {"median_ms": round(statistics.median(timings), 1), "max_ms": round(timings[-1], 1)}
+
+
+def measure_interpreter(runs: int) -> dict:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(timings), 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--target-ms", type=float, default=150.0)
+    parser.add_argument("--image", default=os.path.join(ROOT, "ju.jpeg"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with open(args.image, "rb") as f:
+            key = cache_key("v6", "bench", f.read())
+        with open(os.path.join(cache_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump({"content": json.dumps(SAMPLE_RESPONSE), "size": [800, 1200]}, f)
+
+        env = dict(os.environ, ADGEN_CACHE_DIR=cache_dir)
+        measure(["--help"], 1, env)  # 첫 실행은 .pyc 생성 등으로 느리므로 버린다
+        results = {
+            "--help": measure(["--help"], args.runs, env),
+            "analyze (cached)": measure(["analyze", "bench", args.image], args.runs, env),
+        }
+        interpreter = measure_interpreter(args.runs)
+
+    print(f"{'python -c pass':<20} median {interpreter['median_ms']:>7.1f} ms  (인터프리터 자체 시작 시간)")
+    over = False
+    for name, result in results.items():
+        ok = result["median_ms"] <= args.target_ms
+        over |= not ok
+        status = "OK" if ok else f"목표 {args.target_ms:.0f} ms 초과"
+        print(f"{name:<20} median {result['median_ms']:>7.1f} ms  max {result['max_ms']:>7.1f} ms  {status}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
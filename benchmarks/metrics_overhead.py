@@ -0,0 +1,73 @@
+"""request_metrics.MetricsMiddleware의 요청당 오버헤드 측정.
+
+서버/네트워크 없이 빈 응답만 보내는 ASGI 앱을 같은 이벤트 루프에서 직접 부르고,
+미들웨어를 씌운 것과 안 씌운 것의 요청당 시간 차이를 잰다 (여러 번 반복해 가장 빠른 회차를 쓴다).
+
+사용 예:
+    python benchmarks/metrics_overhead.py --requests 200000 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from request_metrics import Metrics, MetricsMiddleware  # noqa: E402
+
+BODY = b'{"message":"ok"}'
+
+
+class Route:
+    path = "/items/{id}"
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = Route  # 라우팅이 끝난 것처럼 경로 템플릿을 남긴다
+    await receive()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": BODY})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def run(app, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/items/1"}, receive, send)
+    return time.perf_counter() - started
+
+
+async def measure(requests: int, repeat: int):
+    wrapped = MetricsMiddleware(bare_app, Metrics())
+    await run(wrapped, 1000)  # 루프 지연 모니터 시작과 워밍업
+    bare, instrumented = [], []
+    for _ in range(repeat):
+        bare.append(await run(bare_app, requests))
+        instrumented.append(await run(wrapped, requests))
+    return min(bare) / requests * 1e6, min(instrumented) / requests * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bare_us, instrumented_us = asyncio.run(measure(args.requests, args.repeat))
+    print(f"미들웨어 없음  {bare_us:7.2f} us/요청")
+    print(f"미들웨어 있음  {instrumented_us:7.2f} us/요청")
+    print(f"오버헤드       {instrumented_us - bare_us:7.2f} us/요청")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
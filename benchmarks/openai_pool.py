@@ -0,0 +1,152 @@
+"""OpenAI 클라이언트 연결 재사용 벤치마크: 로컬 mock chat.completions 서버에 동시 요청을 보내고
+요청마다 클라이언트를 새로 만드는 방식과 adgen.client의 공유 풀(동기 스레드 / 비동기)을 비교한다.
+
+서버는 accept한 TCP 연결 수를 세므로, 공유 풀에서는 연결 수가 동시성 정도에 머물고
+클라이언트를 매번 만들면 요청 수만큼 늘어나는 것을 볼 수 있다 (실제 API에서는 연결마다 TLS 핸드셰이크가 더해진다).
+네트워크/API 키가 필요 없다.
+
+사용 예:
+    python benchmarks/openai_pool.py --requests 400 --concurrency 16 --latency-ms 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+COMPLETION = {
+    "id": "chatcmpl-mock", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+    "choices": [{"index": 0, "finish_reason": "stop",
+                 "message": {"role": "assistant", "content": json.dumps({"f": "matte steel tumbler", "u": "keep warm"})}}],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+}
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+        self._lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), MockHandler)
+
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: 한 연결에서 여러 요청을 처리한다
+
+    def setup(self):
+        super().setup()
+        self.server.count_connection()  # 핸들러 하나 = 연결 하나
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency)
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def request(client) -> None:
+    client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "ping"}])
+
+
+def run_threads(call: Callable[[], None], requests: int, concurrency: int) -> List[float]:
+    def timed(_):
+        started = time.perf_counter()
+        call()
+        return (time.perf_counter() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(timed, range(requests)))
+
+
+async def run_async(base_url: str, requests: int, concurrency: int) -> List[float]:
+    from adgen.client import make_async_client
+
+    client = make_async_client(api_key="mock", base_url=base_url)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed():
+        async with semaphore:
+            started = time.perf_counter()
+            await client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "ping"}])
+            return (time.perf_counter() - started) * 1000
+
+    return await asyncio.gather(*(timed() for _ in range(requests)))
+
+
+def measure(server: MockServer, label: str, run: Callable[[], List[float]]) -> Dict:
+    before = server.connections
+    started = time.perf_counter()
+    timings = sorted(run())
+    elapsed = time.perf_counter() - started
+    return {"name": label, "rps": round(len(timings) / elapsed, 1),
+            "p50_ms": round(statistics.median(timings), 1),
+            "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 1),
+            "connections": server.connections - before}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="mock 서버 응답 지연")
+    args = parser.parse_args()
+
+    # 풀은 동시성만큼 연결을 열어 두어야 재사용된다 (환경 변수로 이미 정했으면 그 값을 쓴다)
+    os.environ.setdefault("ADGEN_HTTP_MAX_KEEPALIVE", str(args.concurrency))
+    from openai import OpenAI
+
+    from adgen.client import make_client
+
+    server = MockServer(args.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    def fresh_client():
+        # 예전 스크립트처럼 호출하는 쪽마다 기본 설정 클라이언트를 만든다
+        with OpenAI(api_key="mock", base_url=base_url) as client:
+            request(client)
+
+    shared = make_client(api_key="mock", base_url=base_url)
+    request(shared)  # 첫 연결은 측정에서 뺀다
+    results = [
+        measure(server, "client per request", lambda: run_threads(fresh_client, args.requests, args.concurrency)),
+        measure(server, "shared pool (threads)",
+                lambda: run_threads(lambda: request(shared), args.requests, args.concurrency)),
+        measure(server, "shared pool (async)",
+                lambda: asyncio.run(run_async(base_url, args.requests, args.concurrency))),
+    ]
+    server.shutdown()
+
+    print(f"요청 {args.requests}개, 동시성 {args.concurrency}, 서버 지연 {args.latency_ms:.0f} ms")
+    for result in results:
+        print(f"{result['name']:<24} {result['rps']:>8.1f} req/s  p50 {result['p50_ms']:>7.1f} ms  "
+              f"p95 {result['p95_ms']:>7.1f} ms  새 연결 {result['connections']:>5}")
+    # 공유 풀이 연결을 재사용하지 못하면(요청마다 새 연결) 실패로 본다
+    reused = all(result["connections"] <= args.concurrency for result in results[1:])
+    return 0 if reused else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
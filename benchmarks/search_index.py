@@ -0,0 +1,84 @@
+"""planner 이벤트 검색 색인(database/search.py)의 색인/검색 시간 측정.
+
+흔한 단어(event, 서울)와 드문 단어가 섞이도록 지프 분포로 뽑은 어휘로 제목/설명을 만들고,
+대량 추가 시간, 검색어별 첫 검색(임팩트 목록 생성 포함)과 반복 검색의 지연, 추가와 섞인 검색의 지연을 잰다.
+
+사용 예:
+    python benchmarks/search_index.py --events 300000
+    python benchmarks/search_index.py --events 1000000 --queries "event,meetup seoul,서울,ev"
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "planner"))
+
+from database.search import SearchIndex  # noqa: E402
+
+COMMON = ["event", "meetup", "seoul", "python", "fastapi", "book", "launch", "party", "workshop", "evening",
+          "서울", "행사", "모임", "개발자", "컨퍼런스", "주말"]
+QUERIES = "event,meetup seoul,서울,ev,python workshop,개발자 모임"
+
+
+def corpus(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    rare = [f"w{i}" for i in range(50000)]
+    vocabulary = COMMON + rare
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    for doc_id in range(1, size + 1):
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(6, 18))
+        yield doc_id, " ".join(words[:3]), " ".join(words[3:])
+
+
+def timed(fn, repeat: int = 1) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=300000)
+    parser.add_argument("--queries", default=QUERIES, help="쉼표로 구분한 검색어")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    documents = list(corpus(args.events))
+    index = SearchIndex()
+    started = time.perf_counter()
+    for doc_id, title, description in documents:
+        index.add(doc_id, title, description)
+    print(f"이벤트 {args.events}개 색인: {time.perf_counter() - started:.1f}s")
+    del documents
+
+    queries = args.queries.split(",")
+    print(f"{'검색어':<16} {'첫 검색 ms':>10} {'반복 ms':>9} {'추가와 섞임 ms':>14}")
+    next_id = args.events + 1
+    extra = corpus(len(queries) * args.repeat * 10, seed=1)
+    for query in queries:
+        first = timed(lambda: index.search(query))
+        warm = timed(lambda: index.search(query), args.repeat)
+
+        def add_then_search():
+            nonlocal next_id
+            for _ in range(10):
+                _, title, description = next(extra)
+                index.add(next_id, title, description)
+                next_id += 1
+            index.search(query)
+
+        mixed = timed(add_then_search, args.repeat)
+        print(f"{query:<16} {first:>10.1f} {warm:>9.2f} {mixed:>14.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
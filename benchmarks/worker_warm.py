@@ -0,0 +1,98 @@
+"""콜드 실행(`python -m adgen pipeline`을 매번 새 프로세스로) vs 상주 워커(`python -m adgen worker`)의 실행당 시간 비교.
+
+OpenAI 요청은 닫힌 로컬 포트로 보내 곧바로 실패하게 하므로(모든 GPT 노드가 대체값 사용) 네트워크/API 키 없이
+import, 그래프 컴파일, 클라이언트 생성, 로컬 노드(마스크/이미지 분석) 비용만 잰다.
+
+사용 예:
+    python benchmarks/worker_warm.py --runs 5
+    python benchmarks/worker_warm.py --runs 5 --socket /tmp/adgen.sock
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PIPELINE_ARGS = ["--no-previews", "--no-store"]
+
+
+def offline_env() -> dict:
+    return dict(os.environ, OPENAI_BASE_URL="http://127.0.0.1:9/v1", OPEN_API_KEY="offline",
+                ADGEN_NODE_TIMEOUT_S="5", TREND_CACHE_THRESHOLD="2", COPY_CACHE_THRESHOLD="2")
+
+
+def measure_cold(image: str, runs: int, env: dict) -> list:
+    timings = []
+    for i in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "adgen", "pipeline", f"bench {i}", image, *PIPELINE_ARGS],
+                       cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def measure_warm(image: str, runs: int, env: dict, socket_path: str = None):
+    command = [sys.executable, "-m", "adgen", "worker", *PIPELINE_ARGS, "--workers", "1"]
+    if socket_path:
+        command += ["--socket", socket_path]
+    started = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True, bufsize=1)
+    ready = json.loads(proc.stdout.readline())
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    timings, setups = [], []
+    try:
+        for i in range(runs):
+            payload = {"id": i, "product_name": f"bench {i}", "image_path": image}
+            started = time.perf_counter()
+            if socket_path:
+                from adgen.worker import request
+
+                response = request(socket_path, payload)
+            else:
+                proc.stdin.write(json.dumps(payload) + "\n")
+                proc.stdin.flush()
+                response = json.loads(proc.stdout.readline())
+            timings.append((time.perf_counter() - started) * 1000)
+            if not response["ok"]:
+                raise RuntimeError(response)
+            setups.append(response["result"]["timing"]["setup_ms"])
+    finally:
+        if socket_path:
+            proc.terminate()
+        else:
+            proc.stdin.close()
+        proc.wait()
+    return ready["warmup_ms"], startup_ms, timings, setups
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--image", default=os.path.join(ROOT, "ju.jpeg"))
+    parser.add_argument("--socket", help="유닉스 소켓 모드로 측정 (기본: stdin JSON 줄)")
+    args = parser.parse_args()
+
+    env = offline_env()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env.update(ADGEN_CACHE_DIR=cache_dir, SIMILARITY_CACHE_DIR=cache_dir, ADGEN_RESULTS_DIR=cache_dir)
+        cold = measure_cold(args.image, args.runs, env)
+        warmup, startup_ms, warm, setups = measure_warm(args.image, args.runs, env, args.socket)
+
+    cold_ms, warm_ms = statistics.median(cold), statistics.median(warm)
+    print(f"콜드 (프로세스마다 새로)   실행당 median {cold_ms:8.1f} ms")
+    print(f"워커 시작 (한 번)          {startup_ms:8.1f} ms  준비 단계 {json.dumps(warmup, ensure_ascii=False)}")
+    print(f"워커 (상주, 준비 끝난 뒤)  실행당 median {warm_ms:8.1f} ms  (실행 내 준비 median {statistics.median(setups):.1f} ms)")
+    print(f"실행당 절약                {cold_ms - warm_ms:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""이미지 바이트를 LangGraph 상태 밖에 한 번만 보관하는 프로세스 로컬 blob 저장소.
+
+상태에는 내용 해시 기반의 짧은 핸들("sha256:...")만 들어가므로, 노드 사이에서 상태가 복사/병합되거나
+체크포인터가 직렬화해도 비용이 이미지 크기와 무관하다. base64 data URL은 API를 호출하는 순간에만 만든다.
+"""
+import base64
+import hashlib
+import io
+import mimetypes
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class BlobStore:
+    """내용 주소 기반 blob 저장소. 같은 바이트는 한 번만 저장되고 참조 횟수로 수명을 관리한다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # 병렬 노드가 스레드에서 돌기 때문에 참조 횟수는 락으로 보호
+        self._blobs: Dict[str, Tuple[bytes, str]] = {}
+        self._refs: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self._blobs
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(data) for data, _ in self._blobs.values())
+
+    def put(self, data: bytes, mime: str = "image/jpeg") -> str:
+        handle = "sha256:" + hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if handle not in self._blobs:
+                self._blobs[handle] = (bytes(data), mime)
+            self._refs[handle] = self._refs.get(handle, 0) + 1
+        return handle
+
+    def put_file(self, path: str) -> str:
+        with open(path, "rb") as f:
+            data = f.read()
+        return self.put(data, mimetypes.guess_type(path)[0] or "image/jpeg")
+
+    def retain(self, handle: str) -> str:
+        with self._lock:
+            if handle not in self._blobs:
+                raise KeyError(handle)
+            self._refs[handle] += 1
+        return handle
+
+    def release(self, handle: str) -> None:
+        with self._lock:
+            count = self._refs.get(handle, 0) - 1
+            if count > 0:
+                self._refs[handle] = count
+                return
+            self._refs.pop(handle, None)
+            self._blobs.pop(handle, None)
+
+    def view(self, handle: str) -> memoryview:
+        """복사 없이 읽기 전용 memoryview를 돌려준다."""
+        return memoryview(self._blobs[handle][0])
+
+    def mime(self, handle: str) -> str:
+        return self._blobs[handle][1]
+
+    def digest(self, handle: str) -> str:
+        return handle.split(":", 1)[1]
+
+    def data_url(self, handle: str, max_side: Optional[int] = None) -> str:
+        """max_side를 주면 긴 변이 그보다 클 때만 줄여 JPEG로 보낸다 (원본 blob은 그대로)."""
+        data, mime = self._blobs[handle]
+        if max_side:
+            data, mime = downscale(data, max_side, mime)
+        return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def downscale(data: bytes, max_side: int, mime: str = "image/jpeg") -> Tuple[bytes, str]:
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        if max(image.size) <= max_side:
+            return data, mime
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        image.convert("RGB").save(out, "JPEG", quality=85)
+    return out.getvalue(), "image/jpeg"
+
+
+blobs = BlobStore()
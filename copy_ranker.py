@@ -0,0 +1,94 @@
+"""광고 문구 후보(logo/tagline/underlay)를 로컬 휴리스틱으로 거르고 순위를 매긴다 (GPT 호출 없음).
+
+MarketingCopyAgent가 한 번의 호출로 N개의 후보를 받아오면, 여기서
+금칙어 필터 -> 길이 적합도 점수 -> 중복/유사 문구 제거 순서로 처리해 상위 k개만 남긴다.
+"""
+import os
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Set
+
+FIELDS = ("logo", "tagline", "underlay")
+
+# 표시·광고 심사에서 자주 걸리는 절대적 표현. COPY_BANNED_WORDS(쉼표 구분)로 추가할 수 있다.
+DEFAULT_BANNED_WORDS = ("최고", "최초", "유일", "1위", "100%", "완벽", "무조건", "보장", "best", "guaranteed")
+
+# 필드별 적정 표시 폭 (한글/전각 문자 = 2, 그 외 = 1). 기본 레이아웃의 bbox 폭과 글자 크기에서 잡은 값
+WIDTH_RANGES = {"logo": (2, 14), "tagline": (12, 36), "underlay": (12, 48)}
+FIELD_WEIGHTS = {"logo": 0.2, "tagline": 0.5, "underlay": 0.3}
+NEAR_DUPLICATE = 0.6  # 태그라인 bigram 자카드 유사도가 이 이상이면 같은 문구로 본다
+
+
+def banned_words() -> List[str]:
+    extra = [word.strip() for word in os.getenv("COPY_BANNED_WORDS", "").split(",") if word.strip()]
+    return [word.lower() for word in DEFAULT_BANNED_WORDS + tuple(extra)]
+
+
+def normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", str(text or ""))).strip()
+
+
+def display_width(text: str) -> int:
+    return sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text)
+
+
+def length_fit(text: str, bounds) -> float:
+    """범위 안이면 1.0, 벗어난 만큼 선형으로 깎는다."""
+    low, high = bounds
+    width = display_width(text)
+    if low <= width <= high:
+        return 1.0
+    overflow = (low - width) if width < low else (width - high)
+    return max(0.0, 1.0 - overflow / max(low, high / 2))
+
+
+def bigrams(text: str) -> Set[str]:
+    compact = re.sub(r"[\W_]+", "", text.lower())
+    return {compact[i:i + 2] for i in range(len(compact) - 1)} or {compact}
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def score_variant(variant: Dict[str, str]) -> float:
+    score = sum(FIELD_WEIGHTS[field] * length_fit(variant[field], WIDTH_RANGES[field]) for field in FIELDS)
+    if len(variant["logo"].split()) > 1:  # 로고는 한 단어
+        score -= 0.1
+    return round(score, 4)
+
+
+def rank_variants(candidates: Sequence[Dict], k: int = 3, banned: Optional[Sequence[str]] = None) -> List[Dict]:
+    """후보를 점수순으로 정렬해 상위 k개를 돌려준다. 각 항목에 score가 붙는다."""
+    banned = banned_words() if banned is None else [word.lower() for word in banned]
+    scored = []
+    for candidate in candidates:
+        if not isinstance(candidate, dict):
+            continue
+        variant = {field: normalize(candidate.get(field, "")) for field in FIELDS}
+        if not variant["tagline"]:
+            continue
+        text = " ".join(variant.values()).lower()
+        if any(word in text for word in banned):
+            continue
+        variant["score"] = score_variant(variant)
+        scored.append(variant)
+
+    scored.sort(key=lambda variant: -variant["score"])
+    kept: List[Dict] = []
+    seen: List[Set[str]] = []
+    for variant in scored:
+        grams = bigrams(variant["tagline"])
+        if any(similarity(grams, other) >= NEAR_DUPLICATE for other in seen):
+            continue
+        kept.append(variant)
+        seen.append(grams)
+        if len(kept) == k:
+            break
+    return kept
+
+
+def apply_variant(graphic_layout: Sequence[Dict], variant: Dict[str, str]) -> List[Dict]:
+    """레이아웃의 bbox는 그대로 두고 tagline/underlay/logo 내용만 해당 후보로 바꾼다."""
+    return [dict(element, content=variant[element["type"]]) if element.get("type") in FIELDS else dict(element)
+            for element in graphic_layout if isinstance(element, dict)]
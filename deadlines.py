@@ -0,0 +1,92 @@
+"""그래프 실행 전체와 노드별 마감 시간, 그리고 마감/오류 시 대체값(fallback)으로 부분 결과를 만드는 래퍼.
+
+실행 마감 시각(time.monotonic 기준)은 상태의 "deadline"에 실려 모든 노드로 전달된다.
+각 노드는 min(노드 timeout, 실행 남은 시간)을 GPT 요청의 HTTP timeout으로 쓰므로,
+실행 예산이 바닥나면 진행 중인 요청도 그 시점에 끊긴다. 실패하거나 시간이 없는 노드는
+에이전트의 fallback(state)로 대체되고, 어떤 노드가 대체되었는지는 상태의 "degraded"에 쌓인다.
+노드마다의 실행 기록(소요 시간, 토큰 예산 등)은 tracing을 통해 상태의 "trace"에 쌓인다.
+"""
+import contextvars
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from tracing import node_trace, note
+
+RUN_DEADLINE = float(os.getenv("ADGEN_RUN_DEADLINE_S", 60))
+NODE_TIMEOUT = float(os.getenv("ADGEN_NODE_TIMEOUT_S", 30))
+MIN_REQUEST_TIMEOUT = 0.5  # 이보다 적게 남았으면 요청을 보내지 않고 바로 대체값을 쓴다
+
+_node_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("node_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+def run_deadline(budget: float = RUN_DEADLINE) -> float:
+    """초기 상태의 "deadline"에 넣을 절대 마감 시각."""
+    return time.monotonic() + budget
+
+
+def request_options() -> Dict[str, Any]:
+    """현재 노드에서 보내는 GPT 요청에 줄 client.with_options() 인자.
+
+    재시도는 끄고(마감 안에서 대체값으로 처리), timeout은 남은 시간으로 잡는다.
+    """
+    deadline = _node_deadline.get()
+    if deadline is None:
+        return {}
+    remaining = deadline - time.monotonic()
+    if remaining < MIN_REQUEST_TIMEOUT:
+        raise DeadlineExceeded("마감 시간이 지나 요청을 보내지 않습니다.")
+    return {"timeout": remaining, "max_retries": 0}
+
+
+def _is_empty(result: Dict[str, Any], writes) -> bool:
+    return not result or all(not result.get(key) for key in writes)
+
+
+def with_deadline(agent) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """agent.invoke를 노드 마감 + fallback으로 감싼다.
+
+    fallback(state)가 없는 노드(로컬 계산)는 그대로 실행한다. fallback이 있는 노드는
+    예외가 나거나 쓰기로 선언한 키가 모두 비어 있으면 대체값을 쓰고 degraded에 기록한다.
+    """
+    fallback = getattr(agent, "fallback", None)
+    timeout = float(getattr(agent, "timeout", NODE_TIMEOUT))
+
+    def node(state: Dict[str, Any]) -> Dict[str, Any]:
+        with node_trace(agent.name) as trace:
+            result = run(state)
+        if reason := trace.get("fallback"):
+            result["degraded"] = [{"node": agent.name, "reason": reason}]
+        result["trace"] = [trace]
+        return result
+
+    def run(state: Dict[str, Any]) -> Dict[str, Any]:
+        deadline = min(state.get("deadline") or float("inf"), time.monotonic() + timeout)
+        expired = lambda: deadline - time.monotonic() < MIN_REQUEST_TIMEOUT  # noqa: E731
+        if fallback is not None and expired():
+            reason = "deadline"
+        else:
+            token = _node_deadline.set(deadline)
+            try:
+                result = agent.invoke(state)
+            except Exception as e:
+                if fallback is None:
+                    raise
+                reason = "deadline" if isinstance(e, DeadlineExceeded) or expired() else f"error: {e}"
+            else:
+                if fallback is None or not _is_empty(result, agent.writes):
+                    return dict(result)
+                # 에이전트는 오류를 잡아 빈 값을 돌려주므로, 시간이 다 됐는지로 원인을 구분한다
+                reason = "deadline" if expired() else "empty"
+            finally:
+                _node_deadline.reset(token)
+
+        print(f"⚠️ {agent.name}: 대체값 사용 ({reason})")
+        note(fallback=reason)
+        return dict(fallback(state))
+
+    return node
@@ -1,4 +1,10 @@
+import os
+import sys
 from fastapi import FastAPI
+
+# 두 앱이 같이 쓰는 request_metrics는 저장소 루트에 있다
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from request_metrics import instrument
 from todo import todo_router
 
 app = FastAPI()
@@ -9,4 +15,5 @@ async def welcome() -> dict:
         "message": "Hello World"
     }
 
-app.include_router(todo_router)
\ No newline at end of file
+app.include_router(todo_router)
+instrument(app)
\ No newline at end of file
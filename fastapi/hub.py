@@ -0,0 +1,73 @@
+import asyncio
+import contextlib
+import json
+from typing import Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+SUBSCRIBER_QUEUE_SIZE = 256
+RESYNC = json.dumps({"op": "resync"})
+
+
+class Subscriber:
+    __slots__ = ("queue",)
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+
+class TodoHub:
+    """변경 diff를 구독 중인 모든 WebSocket 클라이언트에 뿌리는 프로세스 내 pub/sub.
+
+    메시지는 한 번만 JSON으로 인코딩해 모든 구독자 큐에 넣는다. 느린 클라이언트의 큐가 가득 차면
+    쌓인 diff를 버리고 resync 한 건만 남겨, 다른 클라이언트나 서버 메모리에 영향을 주지 않는다.
+
+    diff마다 버전(발행 순번)을 붙인다. 페이지는 렌더링 시점의 버전을 갖고 있고, 연결 직후 받는
+    hello의 버전과 다르면 그 사이의 diff를 놓친 것이므로 다시 불러온다.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.version = 0
+        self._subscribers: Set[Subscriber] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, diff: dict) -> None:
+        self.version += 1
+        if not self._subscribers:
+            return
+        message = json.dumps({**diff, "version": self.version}, ensure_ascii=False)
+        for subscriber in self._subscribers:
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.queue.put_nowait(RESYNC)
+
+    async def serve(self, websocket: WebSocket) -> None:
+        await websocket.accept()
+        subscriber = Subscriber(self.queue_size)
+        # 구독과 같은 틱에 넣으므로 hello 뒤에는 그 버전 이후의 diff만 온다
+        subscriber.queue.put_nowait(json.dumps({"op": "hello", "version": self.version}))
+        self._subscribers.add(subscriber)
+        sender = asyncio.ensure_future(self._send_loop(websocket, subscriber))
+        try:
+            # 클라이언트가 보내는 메시지는 없다; 연결 종료만 감지한다
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self._subscribers.discard(subscriber)
+            sender.cancel()
+            # 취소가 끝날 때까지 기다려 send가 닫힌 소켓에 남지 않게 한다 (이미 끊겨 실패한 send도 무시)
+            with contextlib.suppress(asyncio.CancelledError, WebSocketDisconnect):
+                await sender
+
+    async def _send_loop(self, websocket: WebSocket, subscriber: Subscriber) -> None:
+        while True:
+            message = await subscriber.queue.get()
+            await websocket.send_text(message)
@@ -0,0 +1,302 @@
+import asyncio
+import atexit
+import glob
+import json
+import mmap
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from model import Todo
+
+COMMIT_INTERVAL = float(os.getenv("TODO_COMMIT_INTERVAL_MS", 2)) / 1000
+SNAPSHOT_EVERY = int(os.getenv("TODO_SNAPSHOT_EVERY", 50000))
+SNAPSHOT_INTERVAL = float(os.getenv("TODO_SNAPSHOT_INTERVAL_S", 60))
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+SEGMENT_PATTERN = "wal-*.log"
+
+
+class StoreBroken(RuntimeError):
+    """로그 write/fsync가 실패해 더 이상 변경을 영속화할 수 없는 상태."""
+
+
+class TodoStore:
+    """추가 전용 변경 로그(WAL) + 주기적 스냅샷으로 영속화하는 todo 저장소.
+
+    - 변경(add/update/delete/clear)은 메모리에 바로 반영하고 로그 버퍼에 쌓는다.
+    - flusher 스레드가 버퍼를 모아 한 번에 write + fsync 하고(group commit),
+      그 사이에 들어온 요청들의 commit()을 한꺼번에 깨운다.
+    - snapshot 스레드가 백그라운드에서 압축된 스냅샷을 쓰고 지난 로그 세그먼트를 지운다.
+    - 시작 시에는 최신 스냅샷을 mmap으로 읽고 그 이후의 로그만 재생한다.
+    """
+
+    def __init__(self, data_dir: str, commit_interval: float = COMMIT_INTERVAL,
+                 snapshot_every: int = SNAPSHOT_EVERY, snapshot_interval: float = SNAPSHOT_INTERVAL):
+        self.data_dir = data_dir
+        self.commit_interval = commit_interval
+        self.snapshot_every = snapshot_every
+        self.snapshot_interval = snapshot_interval
+
+        self._items: Dict[int, str] = {}
+        self._next_id = 1
+        self._seq = 0
+        self._durable_seq = 0
+        self._snapshot_seq = 0
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._buffer: List[bytes] = []
+        self._waiters: List[Tuple[int, asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._rotate = False
+        self._segment = None
+        self._snapshot_due = threading.Event()
+        self._snapshot_lock = threading.Lock()  # 스냅샷 임시 파일/교체/세그먼트 정리를 한 번에 하나만
+        self._broken: Optional[BaseException] = None
+        self._closed = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._opened = False
+
+    # --- 조회 ---
+    def __len__(self) -> int:
+        self._ensure_open()
+        return len(self._items)
+
+    def get(self, todo_id: int) -> Optional[Todo]:
+        self._ensure_open()
+        item = self._items.get(todo_id)
+        return None if item is None else Todo.model_construct(id=todo_id, item=item)
+
+    def values(self) -> List[Todo]:
+        self._ensure_open()
+        return [Todo.model_construct(id=todo_id, item=item) for todo_id, item in list(self._items.items())]
+
+    # --- 변경 (반환값은 commit()에 넘길 로그 순번) ---
+    def add(self, item: str) -> Tuple[Todo, int]:
+        self._ensure_open()
+        with self._lock:
+            self._raise_if_broken()
+            todo_id = self._next_id
+            self._next_id += 1
+            self._items[todo_id] = item
+            seq = self._append({"op": "add", "id": todo_id, "item": item})
+        return Todo.model_construct(id=todo_id, item=item), seq
+
+    def update(self, todo_id: int, item: str) -> Optional[int]:
+        self._ensure_open()
+        with self._lock:
+            self._raise_if_broken()
+            if todo_id not in self._items:
+                return None
+            self._items[todo_id] = item
+            return self._append({"op": "update", "id": todo_id, "item": item})
+
+    def delete(self, todo_id: int) -> Optional[int]:
+        self._ensure_open()
+        with self._lock:
+            self._raise_if_broken()
+            if self._items.pop(todo_id, None) is None:
+                return None
+            return self._append({"op": "delete", "id": todo_id})
+
+    def clear(self) -> int:
+        self._ensure_open()
+        with self._lock:
+            self._raise_if_broken()
+            self._items.clear()
+            return self._append({"op": "clear"})
+
+    async def commit(self, seq: int) -> None:
+        """seq까지의 로그가 디스크에 fsync될 때까지 기다린다.
+
+        로그 기록이 실패해 저장소가 망가졌으면 기다리지 않고 StoreBroken을 낸다.
+        """
+        with self._lock:
+            if seq <= self._durable_seq:
+                return
+            self._raise_if_broken()
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((seq, asyncio.get_running_loop(), future))
+        await future
+
+    def _raise_if_broken(self) -> None:
+        # self._lock을 잡은 상태에서 호출. 망가진 저장소는 메모리 상태도 더 바꾸지 않는다
+        if self._broken is not None:
+            raise StoreBroken("todo 로그 기록에 실패해 변경을 영속화할 수 없습니다.") from self._broken
+
+    def _append(self, record: dict) -> int:
+        # self._lock을 잡은 상태에서 호출
+        self._seq += 1
+        record["seq"] = self._seq
+        self._buffer.append(json.dumps(record, ensure_ascii=False).encode() + b"\n")
+        self._wakeup.notify()
+        return self._seq
+
+    # --- 시작/종료 ---
+    def _ensure_open(self) -> None:
+        if not self._opened:
+            self.open()
+
+    def open(self) -> None:
+        with self._lock:
+            if self._opened:
+                return
+            os.makedirs(self.data_dir, exist_ok=True)
+            self._load_snapshot()
+            self._replay_segments()
+            self._durable_seq = self._seq
+            self._segment = self._open_segment(self._seq + 1)
+            self._closed.clear()
+            self._threads = [
+                threading.Thread(target=self._flush_loop, name="todo-wal-flusher", daemon=True),
+                threading.Thread(target=self._snapshot_loop, name="todo-snapshot", daemon=True),
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._opened = True
+            atexit.register(self.close)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._opened:
+                return
+            self._opened = False
+            self._closed.set()
+            self._wakeup.notify_all()
+            atexit.unregister(self.close)
+        self._snapshot_due.set()
+        for thread in self._threads:
+            thread.join()
+        self._segment.close()
+
+    def _load_snapshot(self) -> None:
+        path = os.path.join(self.data_dir, SNAPSHOT_FILE)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header = json.loads(mm.readline())
+            items = self._items
+            for line in iter(mm.readline, b""):
+                todo_id, item = json.loads(line)
+                items[todo_id] = item
+        self._seq = self._snapshot_seq = header["seq"]
+        self._next_id = header["next_id"]
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        paths = glob.glob(os.path.join(self.data_dir, SEGMENT_PATTERN))
+        return sorted((int(os.path.basename(path)[4:-4]), path) for path in paths)
+
+    def _replay_segments(self) -> None:
+        for _, path in self._segments():
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # 크래시로 잘린 마지막 레코드
+                    if record["seq"] <= self._seq:
+                        continue
+                    self._apply(record)
+                    self._seq = record["seq"]
+
+    def _apply(self, record: dict) -> None:
+        op = record["op"]
+        if op == "add":
+            self._items[record["id"]] = record["item"]
+            self._next_id = max(self._next_id, record["id"] + 1)
+        elif op == "update":
+            self._items[record["id"]] = record["item"]
+        elif op == "delete":
+            self._items.pop(record["id"], None)
+        elif op == "clear":
+            self._items.clear()
+
+    def _open_segment(self, start_seq: int):
+        return open(os.path.join(self.data_dir, f"wal-{start_seq:020d}.log"), "ab")
+
+    # --- 백그라운드 스레드 ---
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                while not self._buffer and not self._closed.is_set():
+                    self._wakeup.wait()
+                if not self._buffer and self._closed.is_set():
+                    return
+            # 잠깐 기다려 동시에 들어온 변경을 한 배치로 묶는다
+            if self.commit_interval and not self._closed.is_set():
+                time.sleep(self.commit_interval)
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                last_seq = self._seq
+                rotate, self._rotate = self._rotate, False
+            try:
+                if rotate:
+                    self._segment.close()
+                    self._segment = self._open_segment(last_seq - len(batch) + 1)
+                self._segment.write(b"".join(batch))
+                self._segment.flush()
+                os.fsync(self._segment.fileno())
+            except Exception as e:
+                # 어디까지 기록됐는지 알 수 없으므로 이후 commit은 모두 실패시키고 flusher는 멈춘다
+                with self._lock:
+                    self._broken = e
+                    failed, self._waiters = self._waiters, []
+                error = StoreBroken(f"todo 로그 기록 실패: {e}")
+                error.__cause__ = e
+                for _, loop, future in failed:
+                    loop.call_soon_threadsafe(_fail, future, error)
+                return
+            with self._lock:
+                self._durable_seq = last_seq
+                ready = [waiter for waiter in self._waiters if waiter[0] <= last_seq]
+                self._waiters = [waiter for waiter in self._waiters if waiter[0] > last_seq]
+                if last_seq - self._snapshot_seq >= self.snapshot_every:
+                    self._snapshot_due.set()
+            for _, loop, future in ready:
+                loop.call_soon_threadsafe(_resolve, future)
+
+    def _snapshot_loop(self) -> None:
+        while not self._closed.is_set():
+            self._snapshot_due.wait(self.snapshot_interval)
+            self._snapshot_due.clear()
+            if self._seq > self._snapshot_seq:
+                self.snapshot()
+
+    def snapshot(self) -> None:
+        # 백그라운드 스레드와 직접 호출이 겹쳐도 임시 파일을 같이 쓰거나 _snapshot_seq가 뒤로 가지 않게 한다
+        with self._snapshot_lock:
+            self._snapshot()
+
+    def _snapshot(self) -> None:
+        with self._lock:
+            items = dict(self._items)
+            seq, next_id = self._seq, self._next_id
+            if seq <= self._snapshot_seq:
+                return
+        tmp_path = os.path.join(self.data_dir, SNAPSHOT_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps({"seq": seq, "next_id": next_id}).encode() + b"\n")
+            encode = json.JSONEncoder(ensure_ascii=False).encode
+            f.writelines(encode([todo_id, item]).encode() + b"\n" for todo_id, item in items.items())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.data_dir, SNAPSHOT_FILE))
+        with self._lock:
+            self._snapshot_seq = seq
+            self._rotate = True
+        # 다음 세그먼트가 seq+1 이하에서 시작하면 그 앞 세그먼트는 모두 스냅샷에 포함된 것
+        segments = self._segments()
+        for (_, path), (next_start, _) in zip(segments, segments[1:]):
+            if next_start <= seq + 1:
+                os.remove(path)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _fail(future: asyncio.Future, error: BaseException) -> None:
+    if not future.done():
+        future.set_exception(error)
@@ -0,0 +1,122 @@
+import asyncio
+import atexit
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from storage import SNAPSHOT_FILE, StoreBroken, TodoStore  # noqa: E402
+
+
+def make_store(data_dir, **kwargs) -> TodoStore:
+    kwargs.setdefault("commit_interval", 0)
+    kwargs.setdefault("snapshot_interval", 3600)
+    return TodoStore(str(data_dir), **kwargs)
+
+
+async def add_all(store: TodoStore, items) -> None:
+    for item in items:
+        _, seq = store.add(item)
+        await store.commit(seq)
+
+
+def test_replay_skips_torn_last_record(tmp_path):
+    store = make_store(tmp_path)
+    asyncio.run(add_all(store, ["a", "b", "c"]))
+    store.close()
+
+    # 크래시로 마지막 레코드가 반쯤만 쓰인 상태를 흉내 낸다
+    segment = sorted(p for p in os.listdir(tmp_path) if p.startswith("wal-"))[-1]
+    with open(tmp_path / segment, "ab") as f:
+        f.write(b'{"op": "add", "id": 4, "it')
+
+    store = make_store(tmp_path)
+    assert [todo.item for todo in store.values()] == ["a", "b", "c"]
+    todo, seq = store.add("d")
+    assert todo.id == 4 and seq == 4
+    asyncio.run(store.commit(seq))
+    store.close()
+
+
+def test_concurrent_snapshots(tmp_path):
+    store = make_store(tmp_path)
+    asyncio.run(add_all(store, [f"item {i}" for i in range(200)]))
+
+    errors = []
+    start = threading.Barrier(8)
+
+    def snapshot():
+        start.wait()
+        try:
+            store.snapshot()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=snapshot) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert store._snapshot_seq == 200
+    assert not os.path.exists(tmp_path / (SNAPSHOT_FILE + ".tmp"))
+    store.close()
+
+    store = make_store(tmp_path)
+    assert len(store) == 200
+    store.close()
+
+
+def test_commit_fails_when_log_write_fails(tmp_path):
+    store = make_store(tmp_path)
+    store.open()
+    store._segment.close()  # 다음 write가 실패하도록
+
+    async def add():
+        _, seq = store.add("lost")
+        await store.commit(seq)
+
+    with pytest.raises(StoreBroken):
+        asyncio.run(add())
+    with pytest.raises(StoreBroken):
+        asyncio.run(add())
+    store.close()
+
+
+def test_broken_store_rejects_changes(tmp_path):
+    store = make_store(tmp_path)
+    asyncio.run(add_all(store, ["kept"]))
+    store._segment.close()
+
+    _, seq = store.add("lost")
+    with pytest.raises(StoreBroken):
+        asyncio.run(store.commit(seq))
+
+    # 망가진 뒤에는 메모리 상태도 바뀌지 않아야 한다
+    before = [(todo.id, todo.item) for todo in store.values()]
+    with pytest.raises(StoreBroken):
+        store.add("after")
+    with pytest.raises(StoreBroken):
+        store.update(1, "changed")
+    with pytest.raises(StoreBroken):
+        store.delete(1)
+    with pytest.raises(StoreBroken):
+        store.clear()
+    assert [(todo.id, todo.item) for todo in store.values()] == before
+    store.close()
+
+
+def test_reopen_does_not_pile_up_exit_hooks(tmp_path, monkeypatch):
+    hooks = []
+    monkeypatch.setattr(atexit, "register", hooks.append)
+    monkeypatch.setattr(atexit, "unregister", hooks.remove)
+    store = make_store(tmp_path)
+    for _ in range(5):
+        store.open()
+        store.open()
+        assert hooks == [store.close]
+        store.close()
+        assert hooks == []
@@ -1,39 +1,62 @@
-from fastapi import APIRouter, Path, HTTPException, status, Request, Depends
+import os
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Path, HTTPException, status, Request, Depends, WebSocket
+from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
+from hub import TodoHub
 from model import Todo, TodoItem, TodoItems
+from storage import TodoStore
 
-todo_router = APIRouter()
+todo_store = TodoStore(os.getenv("TODO_DATA_DIR", "data/"))
+todo_hub = TodoHub()
 
-todo_list=[]
+
+@asynccontextmanager
+async def todo_lifespan(app):
+    # include_router로 앱의 lifespan에 합쳐진다
+    todo_store.open()
+    try:
+        yield
+    finally:
+        todo_store.close()
+
+
+todo_router = APIRouter(lifespan=todo_lifespan)
 
 templates = Jinja2Templates(directory="templates/")
 
 @todo_router.post("/todo") #status_code=201)
 async def add_todo(request: Request, todo: Todo = Depends(Todo.as_form)):
-    todo.id = len(todo_list) + 1
-    todo_list.append(todo)
+    todo, seq = todo_store.add(todo.item)
+    await todo_store.commit(seq)
+    todo_hub.publish({"op": "add", "id": todo.id, "item": todo.item})
+    # 페이지의 스크립트가 보낸 요청이면 목록을 다시 그리지 않고 추가된 항목만 돌려준다
+    if "application/json" in request.headers.get("accept", ""):
+        return JSONResponse({"id": todo.id, "item": todo.item}, status_code=status.HTTP_201_CREATED)
     return templates.TemplateResponse("todo.html",
         {
             "request": request,
-            "todos": todo_list
+            "todos": todo_store.values(),
+            "version": todo_hub.version
         })
 
 @todo_router.get("/todo", response_model=TodoItems)
 async def retrieve_todos(request: Request):
     return templates.TemplateResponse("todo.html", {
         "request": request,
-        "todos": todo_list
+        "todos": todo_store.values(),
+        "version": todo_hub.version
     })
 
 @todo_router.get("/todo/{todo_id}")
 async def get_single_todo(request: Request, todo_id: int = Path(..., title="The ID of the todo to retrieve.")) -> dict:
-    for todo in todo_list:
-        if todo.id == todo_id:
-            return templates.TemplateResponse(
-                "todo.html", {
-                "request": request,
-                "todo": todo
-                })
+    todo = todo_store.get(todo_id)
+    if todo is not None:
+        return templates.TemplateResponse(
+            "todo.html", {
+            "request": request,
+            "todo": todo
+            })
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="Todo with supplied ID doesn't exist",
@@ -41,12 +64,13 @@ async def get_single_todo(request: Request, todo_id: int = Path(..., title="The
 
 @todo_router.put("/todo/{todo_id}")
 async def update_todo(todo_data: TodoItem, todo_id: int = Path(..., title="The ID of the todo to be updated.")) -> dict:
-    for todo in todo_list:
-        if todo.id == todo_id:
-            todo.item = todo_data.item
-            return {
-                "message": "Todo updated successfully"
-            }
+    seq = todo_store.update(todo_id, todo_data.item)
+    if seq is not None:
+        await todo_store.commit(seq)
+        todo_hub.publish({"op": "update", "id": todo_id, "item": todo_data.item})
+        return {
+            "message": "Todo updated successfully"
+        }
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="Todo with supplied ID doesn't exist"
@@ -54,13 +78,13 @@ async def update_todo(todo_data: TodoItem, todo_id: int = Path(..., title="The I
 
 @todo_router.delete("/todo/{todo_id}")
 async def delete_single_todo(todo_id: int) -> dict:
-    for index in range(len(todo_list)):
-        todo = todo.list[index]
-        if todo.idl == todo.id:
-            todo_list.pop(index)
-            return {
-                "message": "Todo deleted successfully."
-            }
+    seq = todo_store.delete(todo_id)
+    if seq is not None:
+        await todo_store.commit(seq)
+        todo_hub.publish({"op": "delete", "id": todo_id})
+        return {
+            "message": "Todo deleted successfully."
+        }
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="Todo with supplied ID doesn't exist",
@@ -68,7 +92,12 @@ async def delete_single_todo(todo_id: int) -> dict:
 
 @todo_router.delete("/todo")
 async def delete_all_todo() -> dict:
-    todo_list.clear()
+    await todo_store.commit(todo_store.clear())
+    todo_hub.publish({"op": "clear"})
     return{
         "message": "Todos deleted succesfully"
-    }
\ No newline at end of file
+    }
+
+@todo_router.websocket("/todo/ws")
+async def todo_updates(websocket: WebSocket):
+    await todo_hub.serve(websocket)
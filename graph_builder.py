@@ -0,0 +1,137 @@
+"""에이전트가 선언한 입력/출력 상태 키로부터 최소 의존 DAG를 자동으로 만든다.
+
+각 에이전트 클래스는 다음 속성을 선언한다:
+    name               그래프 노드 이름
+    reads              invoke 전에 반드시 채워져 있어야 하는 상태 키
+    writes             invoke가 돌려주는 상태 키
+    estimated_latency  예상 소요 시간(초), 크리티컬 패스 계산용
+
+손으로 엣지를 적으면 불필요한 직렬화(예: 이미 끝난 노드를 한 번 더 기다림)나
+여러 번 실행되는 노드가 생기기 쉽다. 여기서는 생산자->소비자 관계만으로 엣지를 만들고,
+이행적으로 중복되는 엣지는 제거한 뒤, 합류 노드는 모든 선행 노드를 한 번에 기다리도록 연결한다.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from langgraph.graph import END, START, StateGraph
+
+
+@dataclass
+class GraphPlan:
+    agents: Dict[str, object]
+    dependencies: Dict[str, Set[str]]           # 노드 -> 직접 선행 노드 (이행적 축소 후)
+    order: List[str]                            # 위상 정렬 순서
+    critical_path: List[str] = field(default_factory=list)
+    critical_latency: float = 0.0
+    finish_times: Dict[str, float] = field(default_factory=dict)
+
+
+def plan_graph(agents: Iterable[object], inputs: Sequence[str]) -> GraphPlan:
+    agents = {agent.name: agent for agent in agents}
+
+    producers: Dict[str, str] = {}
+    for name, agent in agents.items():
+        for key in agent.writes:
+            if key in producers:
+                raise ValueError(f"상태 키 '{key}'를 '{producers[key]}'와 '{name}'가 모두 씁니다.")
+            if key in inputs:
+                raise ValueError(f"상태 키 '{key}'는 입력인데 '{name}'가 덮어씁니다.")
+            producers[key] = name
+
+    missing = [(name, key) for name, agent in agents.items() for key in agent.reads
+               if key not in producers and key not in inputs]
+    if missing:
+        details = ", ".join(f"{name}.{key}" for name, key in missing)
+        raise ValueError(f"생산하는 노드가 없는 상태 키가 있습니다: {details}")
+
+    direct = {name: {producers[key] for key in agent.reads if key in producers} - {name}
+              for name, agent in agents.items()}
+    order = _toposort(direct)
+    dependencies = _transitive_reduction(direct, order)
+    plan = GraphPlan(agents, dependencies, order)
+    _critical_path(plan)
+    return plan
+
+
+def _toposort(dependencies: Dict[str, Set[str]]) -> List[str]:
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+    order = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            raise ValueError(f"순환 의존이 있습니다: {sorted(remaining)}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def _transitive_reduction(dependencies: Dict[str, Set[str]], order: List[str]) -> Dict[str, Set[str]]:
+    # ancestors[n] = n보다 앞서 끝나야 하는 모든 노드
+    ancestors: Dict[str, Set[str]] = {}
+    for name in order:
+        ancestors[name] = set()
+        for dep in dependencies[name]:
+            ancestors[name] |= {dep} | ancestors[dep]
+    reduced = {}
+    for name in order:
+        deps = dependencies[name]
+        reduced[name] = {dep for dep in deps if not any(dep in ancestors[other] for other in deps if other != dep)}
+    return reduced
+
+
+def _critical_path(plan: GraphPlan) -> None:
+    finish: Dict[str, float] = {}
+    previous: Dict[str, str] = {}
+    for name in plan.order:
+        start = 0.0
+        for dep in plan.dependencies[name]:
+            if finish[dep] > start:
+                start, previous[name] = finish[dep], dep
+        finish[name] = start + float(getattr(plan.agents[name], "estimated_latency", 0.0))
+    last = max(reversed(plan.order), key=finish.get)  # 동률이면 더 뒤쪽(싱크에 가까운) 노드
+    path = [last]
+    while path[-1] in previous:
+        path.append(previous[path[-1]])
+    plan.critical_path = path[::-1]
+    plan.critical_latency = finish[last]
+    plan.finish_times = finish
+
+
+def build_state_graph(plan: GraphPlan, state_schema, wrap: Optional[Callable] = None) -> StateGraph:
+    """wrap(agent)가 주어지면 agent.invoke 대신 그 반환값(노드 함수)을 등록한다 (예: deadlines.with_deadline)."""
+    graph_builder = StateGraph(state_schema)
+    for name in plan.order:
+        agent = plan.agents[name]
+        graph_builder.add_node(name, wrap(agent) if wrap else agent.invoke)
+
+    has_dependents = {dep for deps in plan.dependencies.values() for dep in deps}
+    for name in plan.order:
+        deps = sorted(plan.dependencies[name])
+        if not deps:
+            graph_builder.add_edge(START, name)
+        elif len(deps) == 1:
+            graph_builder.add_edge(deps[0], name)
+        else:
+            # 리스트로 연결해야 모든 선행 노드가 끝난 뒤 한 번만 실행된다
+            graph_builder.add_edge(deps, name)
+        if name not in has_dependents:
+            graph_builder.add_edge(name, END)
+    return graph_builder
+
+
+def format_plan(plan: GraphPlan) -> str:
+    lines = ["🧭 실행 계획 (선언된 reads/writes로 자동 구성)"]
+    for name in plan.order:
+        deps = ", ".join(sorted(plan.dependencies[name])) or "START"
+        latency = getattr(plan.agents[name], "estimated_latency", 0.0)
+        marker = "★" if name in plan.critical_path else " "
+        lines.append(f" {marker} {name:<22} <- {deps:<45} ~{latency:.1f}s (완료 예상 {plan.finish_times[name]:.1f}s)")
+    lines.append(f"   크리티컬 패스: {' → '.join(plan.critical_path)} (예상 {plan.critical_latency:.1f}s)")
+    return "\n".join(lines)
+
+
+def edges(plan: GraphPlan) -> List[Tuple[str, str]]:
+    return [(dep, name) for name in plan.order for dep in sorted(plan.dependencies[name])]
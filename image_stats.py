@@ -0,0 +1,123 @@
+"""제품 이미지의 색상 팔레트와 구도를 로컬에서 수치로 분석한다 (GPT 호출 없음).
+
+결과는 상태(state["image_stats"])에 들어가고, 짧은 요약 문자열로 프롬프트에 붙는다.
+제품의 위치/비율이 숫자로 있으므로 종횡비별 subject 배치는 LLM 없이 여기서 바로 계산한다.
+"""
+import io
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+SAMPLE_SIZE = 64     # k-means에 쓰는 축소 이미지 한 변 크기
+PALETTE_SIZE = 5
+KMEANS_ITERATIONS = 12
+SUBJECT_FILL = 0.55  # 캔버스 면적 대비 제품이 차지할 목표 비율
+
+
+def kmeans(pixels: np.ndarray, k: int = PALETTE_SIZE, iterations: int = KMEANS_ITERATIONS,
+           seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """벡터화된 k-means (k-means++ 초기화). (중심 색, 픽셀별 군집 번호)를 돌려준다."""
+    rng = np.random.default_rng(seed)
+    centers = [pixels[rng.integers(len(pixels))]]
+    for _ in range(1, k):
+        distance = ((pixels[:, None, :] - np.array(centers)[None]) ** 2).sum(-1).min(1)
+        total = distance.sum()
+        if total == 0:
+            break
+        centers.append(pixels[rng.choice(len(pixels), p=distance / total)])
+    centers = np.array(centers)
+    for _ in range(iterations):
+        labels = ((pixels[:, None, :] - centers[None]) ** 2).sum(-1).argmin(1)
+        updated = np.array([pixels[labels == i].mean(0) if np.any(labels == i) else centers[i]
+                            for i in range(len(centers))])
+        if np.allclose(updated, centers, atol=0.5):
+            break
+        centers = updated
+    return centers, labels
+
+
+def to_hex(color: Sequence[float]) -> str:
+    return "#" + "".join(f"{int(round(max(0, min(255, c)))):02x}" for c in color)
+
+
+def shade(color: Sequence[float], amount: float) -> Tuple[int, int, int]:
+    """amount > 0이면 흰색 쪽으로, < 0이면 검은색 쪽으로 섞는다."""
+    target = 255.0 if amount > 0 else 0.0
+    return tuple(int(round(c + (target - c) * abs(amount))) for c in color)
+
+
+def analyze_image(image_bytes, mask: Optional[np.ndarray] = None) -> Dict:
+    image = Image.open(io.BytesIO(image_bytes))
+    width, height = image.size
+    image.draft("RGB", (SAMPLE_SIZE * 4, SAMPLE_SIZE * 4))
+    small = image.convert("RGB").resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.Resampling.BILINEAR)
+    pixels = np.asarray(small, dtype=np.float32).reshape(-1, 3)
+
+    centers, labels = kmeans(pixels)
+    shares = np.bincount(labels, minlength=len(centers)) / len(labels)
+    order = np.argsort(-shares)
+    palette = [{"hex": to_hex(centers[i]), "share": round(float(shares[i]), 3)} for i in order]
+
+    luminance = pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32) / 255.0
+    stats = {
+        "size": [width, height],
+        "aspect": round(width / height, 3),
+        "palette": palette,
+        "brightness": round(float(luminance.mean()), 3),
+        "contrast": round(float(luminance.std()), 3),
+    }
+
+    if mask is not None and mask.any():
+        small_mask = np.asarray(Image.fromarray(mask.astype(np.uint8) * 255)
+                                .resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.Resampling.NEAREST)) > 127
+        ys, xs = np.nonzero(mask)
+        h, w = mask.shape
+        stats["subject_centroid"] = [round(float(xs.mean()) / w, 3), round(float(ys.mean()) / h, 3)]
+        bbox = [float(xs.min()) / w, float(ys.min()) / h, float(xs.max() + 1) / w, float(ys.max() + 1) / h]
+        stats["subject_bbox"] = [round(v, 4) for v in bbox]
+        stats["subject_aspect"] = round((bbox[2] - bbox[0]) * width / max(1e-6, (bbox[3] - bbox[1]) * height), 3)
+        stats["subject_area"] = round(float(mask.mean()), 3)
+        background_labels = labels[~small_mask.ravel()]
+        subject_labels = labels[small_mask.ravel()]
+    else:
+        stats["subject_centroid"] = [0.5, 0.5]
+        stats["subject_aspect"] = stats["aspect"]
+        background_labels = subject_labels = labels
+
+    background = centers[np.bincount(background_labels, minlength=len(centers)).argmax()]
+    subject = centers[np.bincount(subject_labels, minlength=len(centers)).argmax()]
+    stats["background_color"] = to_hex(background)
+    stats["subject_color"] = to_hex(subject)
+    # 미리보기 렌더러용 그라디언트: 원본 배경색을 기준으로 위는 밝게, 아래는 조금 어둡게
+    stats["background_gradient"] = [list(shade(background, 0.35)), list(shade(background, -0.15))]
+    return stats
+
+
+def subject_layouts(subject_aspect: float, canvas_ratios: Sequence[float],
+                    fill: float = SUBJECT_FILL) -> Dict[str, List[Dict]]:
+    """종횡비별 제품 배치를 계산한다. bbox는 [x1, y1, x2, y2] (캔버스 대비 비율).
+
+    제품이 캔버스 면적의 fill 비율을 차지하도록 크기를 정하고, 가로 중앙/세로 약간 아래에 둔다
+    (위쪽은 태그라인 자리로 남긴다).
+    """
+    layouts = {}
+    for ratio in canvas_ratios:
+        # 캔버스 좌표에서 제품 상자의 가로/세로 비: (w * ratio) / h = subject_aspect
+        relative = subject_aspect / float(ratio)
+        w = min(0.9, (fill * relative) ** 0.5)
+        h = min(0.7, w / relative)
+        w = h * relative
+        cx, cy = 0.5, 0.55
+        bbox = [round(cx - w / 2, 4), round(cy - h / 2, 4), round(cx + w / 2, 4), round(cy + h / 2, 4)]
+        layouts[str(ratio)] = [{"type": "product", "bbox": bbox, "aspect_ratio": round(subject_aspect, 3)}]
+    return layouts
+
+
+def summarize(stats: Dict) -> str:
+    """프롬프트에 붙일 한 줄 요약."""
+    palette = ",".join(f"{color['hex']}:{color['share']:.2f}" for color in stats.get("palette", []))
+    return (f"palette={palette}; background={stats.get('background_color')}; "
+            f"subject_color={stats.get('subject_color')}; brightness={stats.get('brightness')}; "
+            f"contrast={stats.get('contrast')}; subject_center={stats.get('subject_centroid')}; "
+            f"subject_aspect={stats.get('subject_aspect')}")
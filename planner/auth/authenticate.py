@@ -0,0 +1,19 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from auth.session import SessionCache
+
+# signin이 발급한 토큰을 "Authorization: Bearer <token>" 헤더로 받는다
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/user/signin")
+sessions = SessionCache()
+
+
+async def authenticate(token: str = Depends(oauth2_scheme)) -> str:
+    """세션 토큰을 검증하고 토큰 주인의 이메일을 돌려준다."""
+    email = sessions.verify(token)
+    if email is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return email
@@ -0,0 +1,82 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+# 작업 계수는 환경 변수로 조정 (기본값: scrypt N=2^14, r=8, p=1 -> 약 16MB, 수십 ms)
+SCRYPT_N = int(os.getenv("PLANNER_SCRYPT_N", 2 ** 14))
+SCRYPT_R = int(os.getenv("PLANNER_SCRYPT_R", 8))
+SCRYPT_P = int(os.getenv("PLANNER_SCRYPT_P", 1))
+HASH_WORKERS = int(os.getenv("PLANNER_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+HASH_MAX_PENDING = int(os.getenv("PLANNER_HASH_MAX_PENDING", 64))
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p, dklen=KEY_BYTES,
+    )
+
+
+def _parse(hashed: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    try:
+        scheme, n, r, p, salt, key = hashed.split("$")
+        if scheme != "scrypt":
+            return None
+        return int(n), int(r), int(p), base64.b64decode(salt), base64.b64decode(key)
+    except ValueError:
+        return None
+
+
+class HashPassword:
+    """scrypt 해시를 이벤트 루프 밖의 제한된 스레드 풀에서 계산한다.
+
+    hashlib.scrypt는 계산 중 GIL을 풀기 때문에 스레드 풀만으로도 병렬 처리가 된다.
+    대기 중인 작업 수는 세마포어로 제한해 폭주 시 메모리가 무한정 늘지 않게 한다.
+    """
+
+    def __init__(self, n: int = SCRYPT_N, r: int = SCRYPT_R, p: int = SCRYPT_P,
+                 workers: int = HASH_WORKERS, max_pending: int = HASH_MAX_PENDING):
+        self.n, self.r, self.p = n, r, p
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._max_pending = max_pending
+        self._pending: Optional[asyncio.Semaphore] = None
+
+    def hash_sync(self, password: str) -> str:
+        salt = os.urandom(SALT_BYTES)
+        key = _scrypt(password, salt, self.n, self.r, self.p)
+        return f"scrypt${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        parsed = _parse(hashed_password)
+        if parsed is None:
+            return False
+        n, r, p, salt, key = parsed
+        return hmac.compare_digest(_scrypt(plain_password, salt, n, r, p), key)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        parsed = _parse(hashed_password)
+        return parsed is None or parsed[:3] != (self.n, self.r, self.p)
+
+    async def _run(self, func, *args):
+        if self._pending is None:
+            self._pending = asyncio.Semaphore(self._max_pending)
+        async with self._pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def create_hash(self, password: str) -> str:
+        return await self._run(self.hash_sync, password)
+
+    async def verify_hash(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(self.verify_sync, plain_password, hashed_password)
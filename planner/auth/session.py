@@ -0,0 +1,69 @@
+import base64
+import hashlib
+import hmac
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+SESSION_SECRET = os.getenv("PLANNER_SESSION_SECRET")
+SESSION_TTL = int(os.getenv("PLANNER_SESSION_TTL", 300))
+SESSION_MAX_ENTRIES = int(os.getenv("PLANNER_SESSION_MAX_ENTRIES", 10000))
+
+
+class SessionCache:
+    """HMAC 서명 세션 토큰 발급/검증과, 최근 검증에 성공한 자격 증명의 단기 캐시.
+
+    캐시 키는 비밀 키로 만든 HMAC이므로 평문 비밀번호는 메모리에 남지 않는다.
+    TTL 안에 같은 자격 증명으로 다시 로그인하면 scrypt 검증을 건너뛴다.
+    """
+
+    def __init__(self, secret: Optional[str] = SESSION_SECRET, ttl: int = SESSION_TTL,
+                 max_entries: int = SESSION_MAX_ENTRIES):
+        # 비밀 키가 없으면 프로세스마다 새로 만든다 (재시작하면 기존 토큰은 무효)
+        self._secret = secret.encode() if secret else os.urandom(32)
+        self.ttl = ttl
+        self._max_entries = max_entries
+        self._verified: "OrderedDict[bytes, float]" = OrderedDict()
+
+    def _sign(self, payload: bytes) -> str:
+        digest = hmac.new(self._secret, payload, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+
+    def issue(self, email: str) -> str:
+        payload = f"{email}|{int(time.time()) + self.ttl}".encode()
+        encoded = base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+        return f"{encoded}.{self._sign(payload)}"
+
+    def verify(self, token: str) -> Optional[str]:
+        try:
+            encoded, signature = token.split(".")
+            payload = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            email, expires = payload.decode().rsplit("|", 1)
+        except ValueError:
+            return None
+        if not hmac.compare_digest(self._sign(payload), signature):
+            return None
+        if int(expires) < time.time():
+            return None
+        return email
+
+    def _key(self, email: str, password: str) -> bytes:
+        return hmac.new(self._secret, f"{email}\0{password}".encode(), hashlib.sha256).digest()
+
+    def remember(self, email: str, password: str) -> None:
+        key = self._key(email, password)
+        self._verified[key] = time.monotonic() + self.ttl
+        self._verified.move_to_end(key)
+        while len(self._verified) > self._max_entries:
+            self._verified.popitem(last=False)
+
+    def recall(self, email: str, password: str) -> bool:
+        key = self._key(email, password)
+        expires = self._verified.get(key)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._verified[key]
+            return False
+        return True
@@ -0,0 +1,112 @@
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from database.search import SearchIndex
+from models.events import Event
+
+
+class EventStore:
+    """id로 정렬된 인메모리 이벤트 저장소 (offset/keyset 페이지네이션 지원)
+
+    이벤트마다 직렬화된 JSON 바이트를 저장 시점에 한 번만 만들어 두고,
+    조회 응답은 이 조각들을 이어 붙여 만든다. 생성/삭제/전체 삭제 때만 무효화된다.
+    """
+
+    def __init__(self):
+        self._events: Dict[int, Event] = {}
+        self._json: Dict[int, bytes] = {}
+        self._ids: List[int] = []  # 항상 오름차순 유지
+        self._list_json: Optional[bytes] = None  # 전체 목록 응답 캐시
+        self._index = SearchIndex()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[Event]:
+        return self.page()
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._events
+
+    def get(self, id: int) -> Optional[Event]:
+        return self._events.get(id)
+
+    def add(self, event: Event) -> bool:
+        if event.id in self._events:
+            return False
+        self._events[event.id] = event
+        self._json[event.id] = event.model_dump_json().encode()
+        self._list_json = None
+        self._index.add(event.id, event.title, event.description)
+        if not self._ids or event.id > self._ids[-1]:
+            self._ids.append(event.id)
+        else:
+            self._ids.insert(bisect_left(self._ids, event.id), event.id)
+        return True
+
+    def remove(self, id: int) -> bool:
+        if self._events.pop(id, None) is None:
+            return False
+        del self._json[id]
+        self._list_json = None
+        self._index.remove(id)
+        del self._ids[bisect_left(self._ids, id)]
+        return True
+
+    def clear(self) -> None:
+        self._events.clear()
+        self._json.clear()
+        self._ids.clear()
+        self._list_json = None
+        self._index.clear()
+
+    def get_json(self, id: int) -> Optional[bytes]:
+        return self._json.get(id)
+
+    def get_many_json(self, ids: Iterable[int], offset: int = 0, limit: Optional[int] = None) -> List[bytes]:
+        # 이미 삭제된(댕글링) id는 버리고, 남은 것 중 offset부터 limit개만 해석한다 (뒤쪽 id는 보지 않는다)
+        fragments = self._json
+        present = (id for id in ids if id in fragments)
+        stop = None if limit is None else offset + limit
+        return [fragments[id] for id in islice(present, offset, stop)]
+
+    def _page_ids(self, offset: int, limit: Optional[int], after: Optional[int]) -> List[int]:
+        # after(keyset)가 있으면 이진 탐색으로 시작 위치를 잡으므로 offset처럼 앞부분을 훑지 않는다
+        start = bisect_right(self._ids, after) if after is not None else 0
+        start += offset
+        stop = None if limit is None else start + limit
+        return self._ids[start:stop]
+
+    def page(self, offset: int = 0, limit: Optional[int] = None,
+             after: Optional[int] = None) -> Iterator[Event]:
+        # id 슬라이스만 복사해 두고 이벤트는 지연 조회 (스트리밍 중 삭제된 건 건너뜀)
+        for id in self._page_ids(offset, limit, after):
+            event = self._events.get(id)
+            if event is not None:
+                yield event
+
+    def page_json(self, offset: int = 0, limit: Optional[int] = None,
+                  after: Optional[int] = None) -> Iterator[bytes]:
+        for id in self._page_ids(offset, limit, after):
+            fragment = self._json.get(id)
+            if fragment is not None:
+                yield fragment
+
+    def list_json(self, offset: int = 0, limit: Optional[int] = None,
+                  after: Optional[int] = None) -> bytes:
+        whole = offset == 0 and limit is None and after is None
+        if whole and self._list_json is not None:
+            return self._list_json
+        body = b"[" + b",".join(self.page_json(offset, limit, after)) + b"]"
+        if whole:
+            self._list_json = body
+        return body
+
+    def search_json(self, query: str, limit: int = 20, prefix: bool = True) -> bytes:
+        hits = self._index.search(query, limit=limit, prefix=prefix)
+        return b"[" + b",".join(self._json[id] for id, _ in hits) + b"]"
+
+
+# 이벤트/사용자 라우터가 함께 쓰는 저장소
+events = EventStore()
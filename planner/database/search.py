@@ -0,0 +1,178 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterator, List, Set, Tuple
+
+TOKEN_RE = re.compile(r"[0-9a-z]+|[가-힣]+")
+HANGUL_START = "가"
+
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 2  # 제목에 나온 단어는 설명보다 가중치를 더 준다
+MAX_PREFIX_EXPANSIONS = 64
+MAX_PENDING_TERMS = 1024  # 정렬 어휘 목록에 아직 합치지 않은 새 단어 수 한도
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """영어/숫자는 단어 단위, 한글은 음절 bigram 단위로 자른다.
+
+    형태소 분석기 없이도 조사가 붙은 말("행사를")과 검색어("행사")가 bigram으로 맞물린다.
+    """
+    for match in TOKEN_RE.finditer(unicodedata.normalize("NFKC", text).lower()):
+        word = match.group()
+        if word[0] < HANGUL_START or len(word) == 1:
+            yield word
+        else:
+            for i in range(len(word) - 1):
+                yield word[i:i + 2]
+
+
+class SearchIndex:
+    """제목/설명 역색인. BM25 랭킹과 마지막 검색어의 접두어 매칭을 지원하며 증분 갱신된다.
+
+    BM25에서 한 단어의 점수 성분은 (tf, 문서 길이)로만 정해지므로, 포스팅을 이 쌍별 문서 묶음으로 둔다.
+    검색은 단어마다 묶음을 성분 내림차순으로 정렬해 번갈아 읽으며(Fagin의 threshold algorithm) 읽은 문서를
+    모든 검색어로 바로 채점하고, 아직 안 읽은 문서가 받을 수 있는 점수 상한(각 단어의 현재 묶음 성분 합)이
+    현재 k번째 점수 이하가 되면 멈춘다. 흔한 단어도 포스팅 전체가 아니라 상위 묶음 몇 개만 본다.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Tuple[int, int], Set[int]]] = {}  # term -> {(tf, 문서 길이): {doc_id}}
+        self._df: Dict[str, int] = {}
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_len: Dict[int, int] = {}
+        self._total_len = 0
+        self._terms: List[str] = []  # 접두어 탐색용 정렬된 어휘 목록 (지워진 단어가 남아 있을 수 있다)
+        self._new_terms: List[str] = []  # 아직 _terms에 합치지 않은 새 단어
+        self._dead_terms = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, doc_id: int, title: str, description: str) -> None:
+        if doc_id in self._doc_len:
+            self.remove(doc_id)
+        terms = Counter(tokenize(description))
+        for term in tokenize(title):
+            terms[term] += TITLE_BOOST
+        length = sum(terms.values())
+        for term, tf in terms.items():
+            groups = self._postings.get(term)
+            if groups is None:
+                groups = self._postings[term] = {}
+                self._df[term] = 0
+                self._new_terms.append(term)
+            groups.setdefault((tf, length), set()).add(doc_id)
+            self._df[term] += 1
+        self._doc_terms[doc_id] = terms
+        self._doc_len[doc_id] = length
+        self._total_len += length
+
+    def remove(self, doc_id: int) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        length = self._doc_len.pop(doc_id)
+        for term, tf in terms.items():
+            groups = self._postings[term]
+            docs = groups[(tf, length)]
+            docs.discard(doc_id)
+            if not docs:
+                del groups[(tf, length)]
+            self._df[term] -= 1
+            if not groups:
+                del self._postings[term]
+                del self._df[term]
+                self._dead_terms += 1
+        self._total_len -= length
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._df.clear()
+        self._doc_terms.clear()
+        self._doc_len.clear()
+        self._total_len = 0
+        self._terms.clear()
+        self._new_terms.clear()
+        self._dead_terms = 0
+
+    def _expand(self, prefix: str) -> List[str]:
+        # 새 단어마다 정렬 목록에 끼워 넣으면(insort) 어휘 크기만큼 밀어야 하므로, 모아 두었다가 한 번에 정렬한다
+        if len(self._new_terms) > MAX_PENDING_TERMS or self._dead_terms > len(self._terms) // 4:
+            self._terms = sorted(self._postings)
+            self._new_terms.clear()
+            self._dead_terms = 0
+        expanded = []
+        for i in range(bisect_left(self._terms, prefix), len(self._terms)):
+            term = self._terms[i]
+            if len(expanded) >= MAX_PREFIX_EXPANSIONS or not term.startswith(prefix):
+                break
+            if term in self._postings:
+                expanded.append(term)
+        expanded += [term for term in self._new_terms if term.startswith(prefix) and term in self._postings]
+        return sorted(set(expanded))[:MAX_PREFIX_EXPANSIONS]
+
+    def search(self, query: str, limit: int = 20, prefix: bool = True) -> List[Tuple[int, float]]:
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms or not self._doc_len:
+            return []
+        terms = dict.fromkeys(query_terms)
+        if prefix:
+            terms.update(dict.fromkeys(self._expand(query_terms[-1])))
+
+        n_docs = len(self._doc_len)
+        c1, c2 = K1 * (1 - B), K1 * B * n_docs / self._total_len
+        lists = []  # [idf, term, 성분 내림차순 묶음, 현재 묶음 번호, 현재 묶음 반복자]
+        for term in terms:
+            groups = self._postings.get(term)
+            if not groups:
+                continue
+            df = self._df[term]
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            ordered = sorted(((tf * (K1 + 1) / (tf + c1 + c2 * length), docs) for (tf, length), docs in groups.items()),
+                             key=lambda group: -group[0])
+            lists.append([idf, term, ordered, 0, iter(ordered[0][1])])
+        if not lists:
+            return []
+
+        doc_terms, doc_len = self._doc_terms, self._doc_len
+        top: List[Tuple[float, int]] = []  # k개 최소 힙
+        seen: Set[int] = set()
+
+        def offer(doc_id: int) -> None:
+            # 임의 접근: 문서의 단어 빈도에서 모든 검색어의 tf를 찾아 완전한 점수를 낸다
+            seen.add(doc_id)
+            counts = doc_terms[doc_id]
+            norm = c1 + c2 * doc_len[doc_id]
+            score = 0.0
+            for idf, term, _, _, _ in lists:
+                tf = counts.get(term)
+                if tf:
+                    score += idf * tf * (K1 + 1) / (tf + norm)
+            if len(top) < limit:
+                heapq.heappush(top, (score, doc_id))
+            elif score > top[0][0]:
+                heapq.heapreplace(top, (score, doc_id))
+
+        while True:
+            bound = 0.0
+            for state in lists:
+                idf, _, ordered, index, docs = state
+                while index < len(ordered):
+                    doc_id = next((doc_id for doc_id in docs if doc_id not in seen), None)
+                    if doc_id is not None:
+                        offer(doc_id)
+                        break
+                    index += 1
+                    if index < len(ordered):
+                        docs = iter(ordered[index][1])
+                state[3], state[4] = index, docs
+                if index < len(ordered):
+                    # 이 단어로 아직 안 읽은 문서는 현재 묶음의 성분을 넘을 수 없다
+                    bound += idf * ordered[index][0]
+            if bound == 0.0 or (len(top) >= limit and top[0][0] >= bound):
+                break
+        return [(doc_id, score) for score, doc_id in sorted(top, key=lambda item: -item[0])]
@@ -1,4 +1,10 @@
+import os
+import sys
 from fastapi import FastAPI
+
+# 두 앱이 같이 쓰는 request_metrics는 저장소 루트에 있다
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from request_metrics import instrument
 from routes.users import user_router
 from routes.events import event_router
 
@@ -7,6 +13,7 @@ import uvicorn
 app=FastAPI()
 app.include_router(user_router, prefix="/user")
 app.include_router(event_router, prefix="/event")
+instrument(app)
 
 if __name__== '__main__':
     uvicorn.run("main:app", host="127.0.0.1", port=8001, reload=True)
\ No newline at end of file
@@ -1,51 +1,77 @@
-from fastapi import APIRouter, Body, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from auth.authenticate import authenticate
+from database.connection import events
 from models.events import Event
-from typing import List
+from routes.responses import JSONBytesResponse
+from typing import AsyncIterator, Iterable, List, Optional
 
 event_router = APIRouter(
     tags=["Events"]
 )
 
-events = []
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+async def stream_events(page: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for fragment in page:
+        yield fragment + b"\n"
 
 @event_router.get("/", response_model=List[Event])
-async def retrieve_all_events() -> List[Event]:
-    return events
+async def retrieve_all_events(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of events to return"),
+    offset: int = Query(0, ge=0, description="Number of events to skip"),
+    after: Optional[int] = Query(None, description="Keyset cursor: return events with id greater than this"),
+    stream: bool = Query(False, description="Stream events as newline-delimited JSON"),
+) -> List[Event]:
+    if stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        page = events.page_json(offset=offset, limit=limit, after=after)
+        return StreamingResponse(stream_events(page), media_type=NDJSON_MEDIA_TYPE)
+    return JSONBytesResponse(events.list_json(offset=offset, limit=limit, after=after))
+
+@event_router.get("/search", response_model=List[Event])
+async def search_events(
+    q: str = Query(..., min_length=1, description="Search terms matched against title and description"),
+    limit: int = Query(20, ge=1, le=100),
+    prefix: bool = Query(True, description="Also match words starting with the last search term"),
+) -> List[Event]:
+    return JSONBytesResponse(events.search_json(q, limit=limit, prefix=prefix))
 
 @event_router.get("/{id}", response_model=Event)
 async def retrieve_event(id: int) -> Event:
-    for event in events:
-        if event in events:
-            if event.id == id:
-                return event
+    body = events.get_json(id)
+    if body is not None:
+        return JSONBytesResponse(body)
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="Event with supplied ID does not exist"
     )
 
 @event_router.post("/new")
-async def create_event(body: Event = Body(...)) -> dict:
-    events.append(body)
+async def create_event(body: Event = Body(...), user: str = Depends(authenticate)) -> dict:
+    if not events.add(body):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Event with supplied ID exists"
+        )
     return{
         "message": "Event created succefully"
     }
 
 @event_router.delete("/{id}")
-async def delete_event(id: int) -> dict:
-    for event in events:
-        if event.id == id:
-            events.remove(event)
-            return{
-                "message": "Event deleted successfully"
-            }
+async def delete_event(id: int, user: str = Depends(authenticate)) -> dict:
+    if events.remove(id):
+        return{
+            "message": "Event deleted successfully"
+        }
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail="Event with supplied ID does not exist"
     )
 
 @event_router.delete("/")
-async def delete_all_events() -> dict:
+async def delete_all_events(user: str = Depends(authenticate)) -> dict:
     events.clear()
     return{
         "message": "Events deleted successfully"
-    }
\ No newline at end of file
+    }
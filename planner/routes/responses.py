@@ -0,0 +1,8 @@
+from fastapi.responses import Response
+
+class JSONBytesResponse(Response):
+    """이미 직렬화된 JSON 바이트를 그대로 보낸다 (response_model 재검증/재인코딩 생략)"""
+    media_type = "application/json"
+
+    def render(self, content: bytes) -> bytes:
+        return content
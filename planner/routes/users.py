@@ -1,11 +1,18 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from auth.authenticate import authenticate, sessions
+from auth.hash_password import HashPassword
+from models.events import Event
 from models.users import User, UserSignIn
+from database.connection import events
+from routes.responses import JSONBytesResponse
+from typing import List, Optional
 
 user_router = APIRouter(
     tags=["User"],
 )
 
 users = {}
+hash_password = HashPassword()
 
 @user_router.post("/signup")
 async def sign_new_user(data: User) -> dict:
@@ -14,6 +21,14 @@ async def sign_new_user(data: User) -> dict:
             status_code=status.HTTP_409_CONFLICT,
             detail="User with supplied username exists"
         )
+    hashed = await hash_password.create_hash(data.password)
+    # 해싱을 기다리는 동안 같은 이메일로 가입한 요청이 있을 수 있다
+    if data.email in users:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with supplied username exists"
+        )
+    data.password = hashed
     users[data.email] = data
     return{
         "message": "User successfully registered!"
@@ -26,12 +41,40 @@ async def sign_user_in(user: UserSignIn) -> dict:
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User does not exist"
         )
-    if users[user.email].password != user.password:
+    if not sessions.recall(user.email, user.password):
+        hashed = users[user.email].password
+        if not await hash_password.verify_hash(user.password, hashed):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Wrong credentials passed"
+            )
+        if hash_password.needs_rehash(hashed):
+            users[user.email].password = await hash_password.create_hash(user.password)
+        sessions.remember(user.email, user.password)
+
+    return{
+        "message": "User signed in successfully",
+        "access_token": sessions.issue(user.email),
+        "token_type": "Bearer"
+    }
+
+@user_router.get("/{email}/events", response_model=List[Event])
+async def retrieve_user_events(
+    email: str,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of events to return"),
+    offset: int = Query(0, ge=0, description="Number of events to skip"),
+    user: str = Depends(authenticate),
+) -> List[Event]:
+    if user != email:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Wrong credentials passed"
+            detail="Operation not allowed"
         )
-    
-    return{
-        "message": "User signed in successfully"
-    }
+    if email not in users:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User does not exist"
+        )
+    ids = (int(id) for id in users[email].events or [] if id.isdigit())
+    fragments = events.get_many_json(ids, offset=offset, limit=limit)
+    return JSONBytesResponse(b"[" + b",".join(fragments) + b"]")
@@ -0,0 +1,123 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.connection import EventStore  # noqa: E402
+from models.events import Event  # noqa: E402
+
+
+def make_event(id: int) -> Event:
+    return Event(id=id, title=f"Event {id}", image="x", description=f"description {id}", tags=[], location="Seoul")
+
+
+def make_store(ids) -> EventStore:
+    store = EventStore()
+    for id in ids:
+        store.add(make_event(id))
+    return store
+
+
+def ids_of(body: bytes):
+    return [event["id"] for event in json.loads(body)]
+
+
+def test_ids_stay_sorted_for_out_of_order_inserts():
+    store = make_store([5, 1, 9, 3, 7])
+    assert [event.id for event in store.page()] == [1, 3, 5, 7, 9]
+    assert not store.add(make_event(3))
+
+
+def test_offset_pages_cover_everything_once():
+    store = make_store(range(1, 24))
+    pages = [ids_of(store.list_json(offset=offset, limit=5)) for offset in range(0, 30, 5)]
+    assert pages[-1] == []
+    assert sum(pages, []) == list(range(1, 24))
+
+
+def test_keyset_pages_start_after_the_cursor():
+    store = make_store(range(2, 41, 2))
+    assert ids_of(store.list_json(after=10, limit=3)) == [12, 14, 16]
+    # 커서가 지워졌거나 없는 id여도 그 다음부터 이어진다
+    assert ids_of(store.list_json(after=11, limit=2)) == [12, 14]
+    store.remove(12)
+    assert ids_of(store.list_json(after=10, limit=2)) == [14, 16]
+    assert ids_of(store.list_json(after=10, offset=1, limit=2)) == [16, 18]
+    assert ids_of(store.list_json(after=40)) == []
+
+    cursor, seen = None, []
+    while True:
+        page = ids_of(store.list_json(after=cursor, limit=7))
+        if not page:
+            break
+        seen += page
+        cursor = page[-1]
+    assert seen == [id for id in range(2, 41, 2) if id != 12]
+
+
+def test_whole_list_cache_is_invalidated_by_changes():
+    store = make_store([1, 2])
+    assert ids_of(store.list_json()) == [1, 2]
+    store.add(make_event(3))
+    assert ids_of(store.list_json()) == [1, 2, 3]
+    store.remove(1)
+    assert ids_of(store.list_json()) == [2, 3]
+    store.clear()
+    assert store.list_json() == b"[]"
+
+
+def test_page_skips_events_deleted_while_streaming():
+    store = make_store(range(1, 6))
+    page = store.page_json()
+    assert json.loads(next(page))["id"] == 1
+    store.remove(2)
+    store.remove(4)
+    assert [json.loads(fragment)["id"] for fragment in page] == [3, 5]
+
+
+def test_get_many_json_windows_over_present_ids():
+    store = make_store(range(1, 11))
+    wanted = [3, 99, 4, 5, 42, 6, 7]  # 99, 42는 사용자 목록에만 남은 삭제된 이벤트
+    assert [json.loads(f)["id"] for f in store.get_many_json(wanted)] == [3, 4, 5, 6, 7]
+    assert [json.loads(f)["id"] for f in store.get_many_json(wanted, offset=1, limit=2)] == [4, 5]
+    assert store.get_many_json(wanted, offset=5) == []
+
+
+def test_get_many_json_stops_reading_ids_after_the_window():
+    store = make_store(range(1, 101))
+    consumed = []
+
+    def ids():
+        for id in range(1, 101):
+            consumed.append(id)
+            yield id
+
+    assert len(store.get_many_json(ids(), offset=10, limit=5)) == 5
+    assert consumed == list(range(1, 16))
+
+
+def test_user_events_route_pages_through_the_shared_store():
+    from fastapi.testclient import TestClient
+    from auth.authenticate import sessions
+    from main import app
+    from routes import users as user_routes
+    from routes.events import events
+
+    events.clear()
+    for id in range(1, 11):
+        events.add(make_event(id))
+    email = "pager@packt.com"
+    user_routes.users[email] = user_routes.User(email=email, password="x", username="pager",
+                                                events=["2", "4", "bad", "6", "8", "77"])
+    headers = {"Authorization": f"Bearer {sessions.issue(email)}"}
+    try:
+        client = TestClient(app)
+        response = client.get(f"/user/{email}/events", params={"offset": 1, "limit": 2}, headers=headers)
+        assert response.status_code == 200
+        assert [event["id"] for event in response.json()] == [4, 6]
+        response = client.get(f"/user/{email}/events", headers=headers)
+        assert [event["id"] for event in response.json()] == [2, 4, 6, 8]
+    finally:
+        del user_routes.users[email]
+        events.clear()
@@ -0,0 +1,121 @@
+import math
+import os
+import random
+import sys
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.search import (B, K1, MAX_PENDING_TERMS, MAX_PREFIX_EXPANSIONS, TITLE_BOOST,  # noqa: E402
+                             SearchIndex, tokenize)
+
+
+def exhaustive(index_docs, query, limit):
+    """가지치기 없이 모든 문서를 채점하는 BM25 (비교 기준)."""
+    docs = {}
+    for doc_id, (title, description) in index_docs.items():
+        terms = Counter(tokenize(description))
+        for term in tokenize(title):
+            terms[term] += TITLE_BOOST
+        docs[doc_id] = terms
+    avg_len = sum(sum(terms.values()) for terms in docs.values()) / len(docs)
+    query_terms = list(dict.fromkeys(tokenize(query)))
+    scores = {}
+    for doc_id, terms in docs.items():
+        length = sum(terms.values())
+        score = 0.0
+        for term in query_terms:
+            tf = terms.get(term)
+            if tf:
+                df = sum(term in other for other in docs.values())
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_len))
+        if score:
+            scores[doc_id] = score
+    return sorted(scores.values(), reverse=True)[:limit]
+
+
+def test_title_match_outranks_description_match():
+    index = SearchIndex()
+    index.add(1, "Team dinner", "python talk after the meal")
+    index.add(2, "Python meetup", "monthly gathering")
+    index.add(3, "Book club", "nothing related")
+    assert [doc_id for doc_id, _ in index.search("python", prefix=False)] == [2, 1]
+
+
+def test_rare_term_weighs_more_than_common_term():
+    index = SearchIndex()
+    for doc_id in range(1, 21):
+        index.add(doc_id, f"Event {doc_id}", "weekly event")
+    index.add(100, "Event", "fastapi workshop")
+    index.add(101, "Event event", "weekly event event")
+    results = index.search("event fastapi", prefix=False)
+    assert results[0][0] == 100
+
+
+def test_pruned_search_matches_exhaustive_bm25():
+    rng = random.Random(7)
+    words = ["event", "meetup", "seoul", "python", "workshop", "party"] + [f"w{i}" for i in range(40)]
+    docs = {}
+    index = SearchIndex()
+    for doc_id in range(1, 401):
+        picked = rng.choices(words, weights=[1 / (rank + 1) for rank in range(len(words))], k=rng.randint(3, 12))
+        docs[doc_id] = (" ".join(picked[:2]), " ".join(picked[2:]))
+        index.add(doc_id, *docs[doc_id])
+    for doc_id in rng.sample(sorted(docs), 80):
+        index.remove(doc_id)
+        del docs[doc_id]
+
+    for query in ["event", "meetup seoul", "python workshop party", "w3", "w1 event"]:
+        got = [score for _, score in index.search(query, limit=10, prefix=False)]
+        assert got == pytest.approx(exhaustive(docs, query, 10))
+
+
+def test_hangul_is_indexed_as_syllable_bigrams():
+    assert list(tokenize("개발자 모임을")) == ["개발", "발자", "모임", "임을"]
+    assert list(tokenize("Ｐｙｔｈｏｎ 서")) == ["python", "서"]
+
+    index = SearchIndex()
+    index.add(1, "개발자 모임을 엽니다", "서울에서")
+    index.add(2, "Book club", "주말 독서 행사")
+    assert [doc_id for doc_id, _ in index.search("모임", prefix=False)] == [1]
+    assert [doc_id for doc_id, _ in index.search("서울", prefix=False)] == [1]
+
+
+def test_prefix_expands_only_the_last_term():
+    index = SearchIndex()
+    index.add(1, "Workshop", "hands on")
+    index.add(2, "Party", "work hard")
+    index.add(3, "Meetup", "nothing here")
+    assert {doc_id for doc_id, _ in index.search("work")} == {1, 2}
+    assert [doc_id for doc_id, _ in index.search("work", prefix=False)] == [2]
+    # 마지막 검색어만 접두어로 본다
+    assert index.search("wor hands", prefix=True) == index.search("wor hands", prefix=False)
+
+
+def test_prefix_sees_new_and_forgets_removed_terms():
+    index = SearchIndex()
+    index.add(1, "Launch", "product launch")
+    assert [doc_id for doc_id, _ in index.search("lau")] == [1]
+
+    # 정렬 목록에 합쳐지기 전의 새 단어와, 한 번에 다시 정렬된 뒤의 단어 모두 찾아야 한다
+    index.add(2, "Laundry day", "")
+    assert {doc_id for doc_id, _ in index.search("lau")} == {1, 2}
+    for doc_id in range(3, MAX_PENDING_TERMS + 10):
+        index.add(doc_id, f"lauterm{doc_id}", "")
+    assert len(index.search("lauterm", limit=100)) == MAX_PREFIX_EXPANSIONS
+    assert {doc_id for doc_id, _ in index.search("laun")} == {1, 2}
+
+    index.remove(2)
+    assert [doc_id for doc_id, _ in index.search("laun")] == [1]
+
+
+def test_readd_replaces_the_old_text():
+    index = SearchIndex()
+    index.add(1, "Python meetup", "")
+    index.add(1, "Book club", "")
+    assert len(index) == 1
+    assert index.search("python", prefix=False) == []
+    assert [doc_id for doc_id, _ in index.search("book", prefix=False)] == [1]
@@ -0,0 +1,263 @@
+"""SceneAssemblerAgent가 만든 final_json을 종횡비별 미리보기 PNG로 합성하는 렌더러.
+
+사용 예:
+    python poster_renderer.py final.json ./image.jpg --out previews/
+    python poster_renderer.py --batch jobs.jsonl --out previews/ --workers 8
+      (jobs.jsonl 한 줄: {"product_name": ..., "image_path": ..., "final_json": [...], "mask_path": 선택})
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+CANVAS_HEIGHT = 1200
+DEFAULT_BACKGROUND = ((236, 233, 226), (198, 190, 178))  # 위/아래 그라디언트 색
+FONT_CANDIDATES = (
+    os.getenv("POSTER_FONT", ""),
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgunbd.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+)
+TEXT_STYLES = {
+    # type: (글자색, 밑판 색(RGBA) 또는 None)
+    "tagline": ((255, 255, 255), (0, 0, 0, 110)),
+    "underlay": ((40, 40, 40), (255, 255, 255, 170)),
+    "logo": ((20, 20, 20), None),
+}
+
+Box = Tuple[int, int, int, int]
+
+
+# --- 워커 프로세스마다 재사용하는 캐시 ---
+@lru_cache(maxsize=1)
+def font_path() -> Optional[str]:
+    for candidate in FONT_CANDIDATES:
+        if candidate and os.path.exists(candidate):
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=256)
+def load_font(size: int) -> ImageFont.FreeTypeFont:
+    # FreeTypeFont 객체는 내부에 글리프 캐시를 가지므로 같은 크기는 한 번만 만든다
+    path = font_path()
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=32)
+def load_product(image_path: str, mtime: float, mask_path: Optional[str] = None) -> Image.Image:
+    image = Image.open(image_path)
+    image.draft("RGB", (1024, 1024))  # JPEG는 디코딩 단계에서 바로 축소
+    image = image.convert("RGB")
+    if mask_path is None:
+        return image
+    # 마스크가 있으면 알파 채널로 붙이고 제품 영역만 잘라낸다
+    alpha = Image.open(mask_path).convert("L").resize(image.size, Image.Resampling.BILINEAR)
+    image.putalpha(alpha)
+    bbox = alpha.getbbox()
+    return image.crop(bbox) if bbox else image
+
+
+@lru_cache(maxsize=256)
+def fitted_product(image_path: str, mtime: float, size: Tuple[int, int],
+                   mask_path: Optional[str] = None) -> Image.Image:
+    # 같은 제품을 같은 상자 크기로 줄이는 일은 배치 안에서 반복되므로 결과를 캐시한다
+    fitted = load_product(image_path, mtime, mask_path).copy()
+    fitted.thumbnail(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+    return fitted
+
+
+@lru_cache(maxsize=64)
+def gradient(size: Tuple[int, int], top: Tuple[int, int, int], bottom: Tuple[int, int, int]) -> Image.Image:
+    column = Image.linear_gradient("L").resize((1, size[1]))
+    return Image.composite(Image.new("RGB", (1, size[1]), bottom),
+                           Image.new("RGB", (1, size[1]), top), column).resize(size)
+
+
+# --- 좌표 처리 ---
+def to_pixels(bbox: Sequence[float], width: int, height: int) -> Box:
+    """정규화된 bbox를 픽셀 좌표 (x1, y1, x2, y2)로 바꾼다.
+
+    새 final_json은 agent_schemas.normalize_bbox를 거쳐 항상 [x1, y1, x2, y2]이지만, 예전에 저장된 JSON에는
+    [x, y, w, h]도 섞여 있으므로 x2 <= x1 이거나 y2 <= y1이면 [x, y, w, h]로 해석한다.
+    """
+    x1, y1, a, b = (float(v) for v in bbox[:4])
+    if a <= x1 or b <= y1:
+        a, b = x1 + a, y1 + b
+    x1, y1 = max(0.0, min(1.0, x1)), max(0.0, min(1.0, y1))
+    a, b = max(x1, min(1.0, a)), max(y1, min(1.0, b))
+    return int(x1 * width), int(y1 * height), int(a * width), int(b * height)
+
+
+def canvas_size(aspect_ratio: float, height: int = CANVAS_HEIGHT) -> Tuple[int, int]:
+    return max(1, round(height * aspect_ratio)), height
+
+
+# --- 합성 ---
+def paste_product(canvas: Image.Image, image_path: str, box: Box, mask_path: Optional[str] = None) -> None:
+    x1, y1, x2, y2 = box
+    if x2 - x1 < 2 or y2 - y1 < 2:
+        return
+    fitted = fitted_product(image_path, os.path.getmtime(image_path), (x2 - x1, y2 - y1), mask_path)
+    left = x1 + (x2 - x1 - fitted.width) // 2
+    top = y1 + (y2 - y1 - fitted.height) // 2
+    canvas.paste(fitted, (left, top), fitted if fitted.mode == "RGBA" else None)
+
+
+def wrap_text(draw: ImageDraw.ImageDraw, text: str, font, max_width: int) -> List[str]:
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        # 한글은 띄어쓰기 없이도 줄바꿈되도록 단어가 안 맞으면 글자 단위로 자른다
+        line = ""
+        for word in re.split(r"(\s+)", paragraph):
+            candidate = line + word
+            if draw.textlength(candidate, font=font) <= max_width or not line:
+                line = candidate
+                continue
+            lines.append(line.rstrip())
+            line = word.lstrip()
+        while line and draw.textlength(line, font=font) > max_width and len(line) > 1:
+            cut = len(line)
+            while cut > 1 and draw.textlength(line[:cut], font=font) > max_width:
+                cut -= 1
+            lines.append(line[:cut])
+            line = line[cut:]
+        lines.append(line.rstrip())
+    return [line for line in lines if line]
+
+
+def fit_text(draw: ImageDraw.ImageDraw, text: str, box: Box) -> Tuple[object, List[str], int]:
+    """상자에 들어가는 가장 큰 글자 크기를 이진 탐색으로 찾는다."""
+    width, height = box[2] - box[0], box[3] - box[1]
+    low, high = 8, max(8, min(height, 160))
+    best = (load_font(low), wrap_text(draw, text, load_font(low), width), low)
+    while low <= high:
+        size = (low + high) // 2
+        font = load_font(size)
+        lines = wrap_text(draw, text, font, width)
+        if len(lines) * size * 1.2 <= height:
+            best = (font, lines, size)
+            low = size + 1
+        else:
+            high = size - 1
+    return best
+
+
+def draw_text_box(canvas: Image.Image, element: Dict, box: Box) -> None:
+    text = str(element.get("content") or "").strip()
+    if not text or box[2] - box[0] < 4 or box[3] - box[1] < 4:
+        return
+    color, plate = TEXT_STYLES.get(element.get("type"), TEXT_STYLES["tagline"])
+    if plate is not None:
+        overlay = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]), plate)
+        canvas.paste(overlay, box[:2], overlay)
+    draw = ImageDraw.Draw(canvas)
+    font, lines, size = fit_text(draw, text, box)
+    line_height = int(size * 1.2)
+    y = box[1] + (box[3] - box[1] - line_height * len(lines)) // 2
+    center_x = (box[0] + box[2]) // 2
+    for line in lines:
+        draw.text((center_x, y), line, font=font, fill=color, anchor="ma")
+        y += line_height
+
+
+def render_scene(scene: Dict, image_path: str, height: int = CANVAS_HEIGHT,
+                 background: Tuple[Tuple[int, int, int], Tuple[int, int, int]] = DEFAULT_BACKGROUND,
+                 mask_path: Optional[str] = None) -> Image.Image:
+    width, height = canvas_size(float(scene["aspect_ratio"]), height)
+    canvas = gradient((width, height), tuple(background[0]), tuple(background[1])).copy()
+
+    layout = scene.get("layout", {})
+    subjects = [item for item in layout.get("subject", []) if isinstance(item, dict) and item.get("bbox")]
+    if not subjects:
+        subjects = [{"bbox": [0.15, 0.25, 0.85, 0.75]}]
+    for subject in subjects:
+        paste_product(canvas, image_path, to_pixels(subject["bbox"], width, height), mask_path)
+
+    for element in layout.get("nongraphic", []) + layout.get("graphic", []):
+        if isinstance(element, dict) and element.get("bbox"):
+            draw_text_box(canvas, element, to_pixels(element["bbox"], width, height))
+    return canvas
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^\w가-힣-]+", "_", name).strip("_") or "product"
+
+
+def render_job(job: Dict, out_dir: str, height: int = CANVAS_HEIGHT) -> List[str]:
+    """제품 하나의 모든 종횡비 장면을 PNG로 저장하고 경로 목록을 돌려준다."""
+    paths = []
+    slug = slugify(job.get("product_name", "product"))
+    background = job.get("background_colors") or DEFAULT_BACKGROUND
+    for scene in job.get("final_json", []):
+        image = render_scene(scene, job["image_path"], height, background, job.get("mask_path"))
+        path = os.path.join(out_dir, f"{slug}_{scene['aspect_ratio']}.png")
+        image.save(path, compress_level=1)  # 미리보기이므로 압축보다 속도 우선
+        paths.append(path)
+    return paths
+
+
+def _render_job_star(args) -> List[str]:
+    return render_job(*args)
+
+
+def render_batch(jobs: Iterable[Dict], out_dir: str, workers: Optional[int] = None,
+                 height: int = CANVAS_HEIGHT) -> List[str]:
+    """여러 제품을 프로세스 풀에서 렌더링한다. 폰트/제품 이미지 캐시는 워커마다 유지된다."""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = list(jobs)
+    if workers == 1 or len(jobs) <= 1:
+        return [path for job in jobs for path in render_job(job, out_dir, height)]
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_render_job_star, ((job, out_dir, height) for job in jobs), chunksize=chunksize)
+        return [path for paths in results for path in paths]
+
+
+def render_previews(final_json: List[Dict], image_path: str, out_dir: str, product_name: str = "product",
+                    background_colors=None, mask_path: Optional[str] = None,
+                    height: int = CANVAS_HEIGHT) -> List[str]:
+    os.makedirs(out_dir, exist_ok=True)
+    job = {"product_name": product_name, "image_path": image_path, "final_json": final_json,
+           "background_colors": background_colors, "mask_path": mask_path}
+    return render_job(job, out_dir, height)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("final_json", nargs="?", help="final_json 파일 경로")
+    parser.add_argument("image_path", nargs="?", help="제품 이미지 경로")
+    parser.add_argument("--batch", help="JSONL 작업 목록")
+    parser.add_argument("--out", default="previews")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--height", type=int, default=CANVAS_HEIGHT)
+    parser.add_argument("--mask", help="제품 마스크 PNG 경로 (product_mask.py 결과)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.batch:
+        with open(args.batch, encoding="utf-8") as f:
+            jobs = [json.loads(line) for line in f if line.strip()]
+        paths = render_batch(jobs, args.out, args.workers, args.height)
+    elif args.final_json and args.image_path:
+        with open(args.final_json, encoding="utf-8") as f:
+            final_json = json.load(f)
+        paths = render_previews(final_json, args.image_path, args.out, mask_path=args.mask, height=args.height)
+    else:
+        parser.error("final_json과 image_path, 또는 --batch가 필요합니다.")
+    print(f"✅ {len(paths)}장 렌더링 완료 ({time.perf_counter() - started:.2f}초) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""제품 이미지에서 실제 이진 마스크와 bbox를 로컬로 계산한다 (GPT 호출 없음).
+
+배경색 추정 -> 배경과의 색 거리 임계값(Otsu) -> 모폴로지 열기/닫기 -> 큰 연결 요소만 남기기 -> 구멍 메우기
+순서로 처리하고, 결과는 이미지 해시 기준으로 디스크(PRODUCT_MASK_CACHE, 기본: 이 모듈 옆 .cache/masks)에 캐시하며
+최근에 쓴 MEMORY_CACHE_SIZE개만 메모리에 LRU로 둔다.
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+WORK_SIZE = 512          # 긴 변 기준 작업 해상도
+BORDER_RATIO = 0.04      # 배경색 추정에 쓰는 테두리 두께
+MIN_THRESHOLD = 18.0     # 배경과의 최소 색 거리
+OTSU_SCALE = 0.5         # 금속/유리처럼 배경색을 반사하는 제품도 잡히도록 Otsu 값을 낮춰 쓴다
+MORPH_SIZE = 5           # 열기/닫기 필터 크기 (홀수)
+KEEP_RATIO = 0.25        # 가장 큰 요소 대비 이 비율 이상인 요소는 함께 남긴다 (여러 개가 찍힌 사진)
+# 실행 위치(cwd)와 무관하게 같은 캐시를 쓰도록 절대 경로로 고정한다
+CACHE_DIR = os.path.abspath(os.getenv("PRODUCT_MASK_CACHE") or
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "masks"))
+MEMORY_CACHE_SIZE = int(os.getenv("PRODUCT_MASK_MEMORY_CACHE", 64))
+
+_memory_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def image_hash(image_bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def _remember(digest: str, result: Optional[Dict] = None) -> Optional[Dict]:
+    """메모리 LRU 조회(result=None) 또는 저장. 넘치면 가장 오래 안 쓴 항목을 버린다 (디스크 캐시에는 남아 있다)."""
+    with _memory_lock:
+        if result is None:
+            result = _memory_cache.get(digest)
+            if result is not None:
+                _memory_cache.move_to_end(digest)
+            return result
+        _memory_cache[digest] = result
+        _memory_cache.move_to_end(digest)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+        return result
+
+
+def estimate_background(pixels: np.ndarray) -> np.ndarray:
+    """테두리 픽셀의 중앙값을 배경색으로 본다."""
+    h, w, _ = pixels.shape
+    band = max(1, int(min(h, w) * BORDER_RATIO))
+    border = np.concatenate([
+        pixels[:band].reshape(-1, 3), pixels[-band:].reshape(-1, 3),
+        pixels[:, :band].reshape(-1, 3), pixels[:, -band:].reshape(-1, 3),
+    ])
+    return np.median(border, axis=0)
+
+
+def otsu_threshold(values: np.ndarray) -> float:
+    hist, edges = np.histogram(values, bins=256)
+    hist = hist.astype(np.float64)
+    centers = (edges[:-1] + edges[1:]) / 2
+    weight_bg = np.cumsum(hist)
+    weight_fg = weight_bg[-1] - weight_bg
+    sum_bg = np.cumsum(hist * centers)
+    mean_bg = sum_bg / np.maximum(weight_bg, 1)
+    mean_fg = (sum_bg[-1] - sum_bg) / np.maximum(weight_fg, 1)
+    between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+    return float(centers[int(np.argmax(between))])
+
+
+def morphology(mask: np.ndarray, size: int = MORPH_SIZE) -> np.ndarray:
+    """Pillow의 Min/Max 필터(C 구현)로 열기(잡티 제거) 후 닫기(틈 메우기)."""
+    image = Image.fromarray(mask.astype(np.uint8) * 255)
+    image = image.filter(ImageFilter.MinFilter(size)).filter(ImageFilter.MaxFilter(size))
+    image = image.filter(ImageFilter.MaxFilter(size)).filter(ImageFilter.MinFilter(size))
+    return np.asarray(image) > 127
+
+
+def _row_runs(row: np.ndarray) -> List[Tuple[int, int]]:
+    padded = np.concatenate(([0], row.view(np.int8), [0]))
+    changes = np.flatnonzero(np.diff(padded))
+    return list(zip(changes[::2].tolist(), changes[1::2].tolist()))
+
+
+def label_runs(mask: np.ndarray) -> Tuple[List[Tuple[int, int, int]], List[int]]:
+    """행 단위 런(run)을 union-find로 묶어 8-연결 요소를 구한다 (픽셀이 아닌 런 단위라 빠르다).
+
+    반환값: (런 목록 [(row, start, end)], 런마다의 요소 대표 번호)
+    """
+    runs: List[Tuple[int, int, int]] = []
+    parent: List[int] = []
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    previous: List[int] = []
+    for y in range(mask.shape[0]):
+        current = []
+        j = 0
+        for start, end in _row_runs(mask[y]):
+            index = len(runs)
+            runs.append((y, start, end))
+            parent.append(index)
+            current.append(index)
+            # 윗줄 런과 (대각선 포함) 맞닿으면 합친다
+            while j < len(previous) and runs[previous[j]][2] < start:
+                j += 1
+            k = j
+            while k < len(previous) and runs[previous[k]][1] <= end:
+                root_a, root_b = find(previous[k]), find(index)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+                k += 1
+        previous = current
+    return runs, [find(index) for index in range(len(runs))]
+
+
+def largest_components(mask: np.ndarray, keep_ratio: float = KEEP_RATIO) -> np.ndarray:
+    runs, roots = label_runs(mask)
+    if not runs:
+        return mask
+    areas: Dict[int, int] = {}
+    for (_, start, end), root in zip(runs, roots):
+        areas[root] = areas.get(root, 0) + end - start
+    largest = max(areas.values())
+    keep = {root for root, area in areas.items() if area >= largest * keep_ratio}
+
+    result = np.zeros_like(mask)
+    for (y, start, end), root in zip(runs, roots):
+        if root in keep:
+            result[y, start:end] = True
+    return result
+
+
+def fill_holes(mask: np.ndarray) -> np.ndarray:
+    """테두리에 닿지 않는 배경 요소(= 제품 안의 구멍)를 채운다."""
+    height, width = mask.shape
+    runs, roots = label_runs(~mask)
+    outside = {root for (y, start, end), root in zip(runs, roots)
+               if y == 0 or y == height - 1 or start == 0 or end == width}
+    result = mask.copy()
+    for (y, start, end), root in zip(runs, roots):
+        if root not in outside:
+            result[y, start:end] = True
+    return result
+
+
+def encode_rle(mask: np.ndarray) -> List[int]:
+    """행 우선 RLE. 0(배경) 런부터 시작해 번갈아 센다."""
+    flat = mask.ravel().view(np.int8)
+    changes = np.flatnonzero(np.diff(np.concatenate(([0], flat, [0]))))
+    bounds = np.concatenate(([0], changes, [flat.size]))
+    counts = np.diff(bounds).tolist()
+    return counts if counts[-1] else counts[:-1]
+
+
+def decode_rle(counts: List[int], size: Tuple[int, int]) -> np.ndarray:
+    width, height = size
+    values = np.zeros(len(counts), dtype=bool)
+    values[1::2] = True
+    flat = np.repeat(values, counts)
+    flat = np.pad(flat, (0, width * height - flat.size))
+    return flat.reshape(height, width)
+
+
+def compute_mask(image: Image.Image) -> Tuple[np.ndarray, List[float]]:
+    """작업 해상도의 마스크와 정규화 bbox [x1, y1, x2, y2]를 돌려준다."""
+    work = image.convert("RGB")
+    work.thumbnail((WORK_SIZE, WORK_SIZE), Image.Resampling.BILINEAR)
+    pixels = np.asarray(work, dtype=np.float32)
+
+    background = estimate_background(pixels)
+    distance = np.sqrt(((pixels - background) ** 2).sum(axis=2))
+    threshold = max(MIN_THRESHOLD, otsu_threshold(distance) * OTSU_SCALE)
+    mask = fill_holes(largest_components(morphology(distance > threshold)))
+
+    ys, xs = np.nonzero(mask)
+    if xs.size == 0:
+        return mask, [0.0, 0.0, 1.0, 1.0]
+    h, w = mask.shape
+    bbox = [round(float(xs.min()) / w, 4), round(float(ys.min()) / h, 4),
+            round(float(xs.max() + 1) / w, 4), round(float(ys.max() + 1) / h, 4)]
+    return mask, bbox
+
+
+def extract_product_mask(image_bytes, cache_dir: Optional[str] = CACHE_DIR) -> Dict:
+    """이미지 바이트(bytes 또는 memoryview)로부터 마스크 정보를 만든다. 같은 이미지는 해시로 캐시된다.
+
+    반환값: {"hash", "size": [w, h], "bbox": [x1, y1, x2, y2], "rle": [...], "path": PNG 경로}
+    """
+    digest = image_hash(image_bytes)
+    cached = _remember(digest)
+    if cached is not None:
+        return cached
+
+    meta_path = png_path = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        meta_path = os.path.join(cache_dir, f"{digest}.json")
+        png_path = os.path.join(cache_dir, f"{digest}.png")
+        if os.path.exists(meta_path) and os.path.exists(png_path):
+            with open(meta_path, encoding="utf-8") as f:
+                result = json.load(f)
+            return _remember(digest, result)
+
+    mask, bbox = compute_mask(Image.open(io.BytesIO(image_bytes)))
+    height, width = mask.shape
+    result = {"hash": digest, "size": [width, height], "bbox": bbox, "rle": encode_rle(mask), "path": png_path}
+    if cache_dir:
+        Image.fromarray(mask.astype(np.uint8) * 255).save(png_path, optimize=True)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+    return _remember(digest, result)
+
+
+def mask_to_image(mask_info: Dict) -> Image.Image:
+    return Image.fromarray(decode_rle(mask_info["rle"], tuple(mask_info["size"])).astype(np.uint8) * 255)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    for path in sys.argv[1:]:
+        with open(path, "rb") as f:
+            data = f.read()
+        started = time.perf_counter()
+        info = extract_product_mask(data)
+        print(f"{path}: bbox={info['bbox']} size={info['size']} runs={len(info['rle'])} "
+              f"-> {info['path']} ({(time.perf_counter() - started) * 1000:.1f} ms)")
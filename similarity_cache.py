@@ -0,0 +1,183 @@
+"""거의 같은 입력(제품 이름, 제품 특징 문장)에 대한 에이전트 결과를 재사용하는 로컬 유사도 캐시.
+
+"Nike Air Max 90 Black"과 "Nike Air Max 90 - Black"처럼 표기만 다른 입력은 정규화 후 완전 일치(dict)로,
+조금 다른 입력은 문자 n-gram MinHash + LSH 밴딩으로 후보를 찾은 뒤 서명 일치율(자카드 유사도 추정치)이
+임계값 이상이면 적중으로 본다. 후보 조회는 밴드 수만큼의 dict 조회라 항목 수와 무관하게 1ms 미만이다.
+
+항목은 서명과 함께 JSONL로 추가 기록되고(증분 삽입), 처음 쓸 때 읽어 밴드 버킷만 다시 만든다.
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+CACHE_DIR = os.path.abspath(os.getenv("SIMILARITY_CACHE_DIR")
+                            or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "similar"))
+NUM_PERM = 64
+NGRAM = 3
+_SHIFT = np.uint64(32)
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", str(text or "")).lower()
+    return re.sub(r"[\W_]+", " ", text).strip()
+
+
+def shingles(normalized: str, n: int = NGRAM) -> np.ndarray:
+    compact = f" {normalized} "
+    grams = {compact[i:i + n] for i in range(max(1, len(compact) - n + 1))}
+    # 서명을 파일에 저장하므로 프로세스마다 달라지는 hash() 대신 crc32를 쓴다
+    return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """LSH S-커브의 변곡점 (1/b)^(1/r)이 임계값보다 약간 낮도록(재현율 우선) 밴드 수/행 수를 고른다."""
+    target = threshold * 0.85
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - target))
+
+
+class SimilarityCache:
+    def __init__(self, name: str, threshold: float, cache_dir: Optional[str] = CACHE_DIR,
+                 num_perm: int = NUM_PERM, seed: int = 1):
+        self.name = name
+        self.threshold = threshold
+        self.path = os.path.join(cache_dir, f"{name}.jsonl") if cache_dir else None
+        self.num_perm = num_perm
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)  # 홀수
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+        self._exact: Dict[str, int] = {}
+        self._values: List[Any] = []
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._values)
+
+    def signature(self, normalized: str) -> np.ndarray:
+        hashes = shingles(normalized)
+        # multiply-shift 해시 ((a * h + b) mod 2^64) >> 32 를 순열 수만큼 한 번에 계산해 최솟값을 취한다
+        values = (hashes[None, :] * self._a[:, None] + self._b[:, None]) >> _SHIFT
+        return values.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def get(self, text: str, threshold: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """(저장된 값, 유사도)를 돌려준다. 임계값 미만이면(또는 임계값이 1보다 크면) None.
+
+        threshold로 이번 조회만 기준을 낮출 수 있다 (마감 시 대체값 찾기). 단, LSH 후보는
+        생성 시 임계값에 맞춰 모으므로 크게 낮춰도 그만큼 더 찾지는 못한다.
+        캐시 임계값이 1보다 커서 꺼져 있으면 threshold를 줘도 항상 None이다.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        normalized = normalize(text)
+        if not normalized or self.threshold > 1 or threshold > 1:
+            return None
+        self._ensure_loaded()
+        with self._lock:
+            index = self._exact.get(normalized)
+            if index is not None:
+                return self._values[index], 1.0
+        # 서명 계산은 락 밖에서 하고, put()이 바꾸는 버킷/서명 배열은 락을 잡고 읽는다
+        signature = self.signature(normalized)
+        with self._lock:
+            candidates = set()
+            for band, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(band.get(key, ()))
+            if not candidates:
+                return None
+            candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            scores = (self._signatures[candidates] == signature).mean(axis=1)
+            best = int(scores.argmax())
+            if scores[best] < threshold:
+                return None
+            return self._values[int(candidates[best])], round(float(scores[best]), 3)
+
+    def put(self, text: str, value: Any) -> None:
+        normalized = normalize(text)
+        if not normalized:
+            return
+        self._ensure_loaded()
+        with self._lock:
+            if normalized in self._exact:
+                return
+            signature = self._insert(normalized, value)
+            if self.path:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                record = {"text": normalized, "sig": signature.tobytes().hex(), "value": value}
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _insert(self, normalized: str, value: Any, signature: Optional[np.ndarray] = None) -> np.ndarray:
+        index = len(self._values)
+        self._values.append(value)
+        self._exact[normalized] = index
+        if index == len(self._signatures):
+            # 서명 배열은 두 배씩 늘려 삽입 비용을 상수 시간으로 유지한다
+            grown = np.empty((max(64, 2 * index), self.num_perm), dtype=np.uint32)
+            grown[:index] = self._signatures[:index]
+            self._signatures = grown
+        if signature is None:
+            signature = self.signature(normalized)
+        self._signatures[index] = signature
+        for band, key in zip(self._buckets, self._band_keys(signature)):
+            band.setdefault(key, []).append(index)
+        return signature
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self.path and os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue  # 중간에 끊긴 마지막 줄
+                        if record["text"] in self._exact:
+                            continue
+                        signature = np.frombuffer(bytes.fromhex(record.get("sig", "")), dtype=np.uint32)
+                        # 순열 수가 바뀌었으면 저장된 서명은 버리고 다시 계산한다
+                        self._insert(record["text"], record["value"],
+                                     signature if signature.size == self.num_perm else None)
+            self._loaded = True
+
+
+if __name__ == "__main__":
+    # 조회 지연 측정: python similarity_cache.py [항목 수]
+    import random
+    import sys
+    import time
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(0)
+    colors = ["Black", "White", "Red", "Navy", "Grey"]
+    names = [f"Brand{rng.randint(1, 50)} Model {i} {rng.choice(colors)}" for i in range(size)]
+    cache = SimilarityCache("bench", 0.8, cache_dir=None)
+    started = time.perf_counter()
+    for i, name in enumerate(names):
+        cache.put(name, i)
+    print(f"삽입 {size}개: {time.perf_counter() - started:.2f}s")
+
+    for label, queries in [("정규화 일치", [name.replace(" ", " - ", 1) for name in rng.sample(names, 1000)]),
+                           ("유사 일치", [name[:-1] + "s" for name in rng.sample(names, 1000)]),
+                           ("불일치", [f"Unrelated gadget {i}" for i in range(1000)])]:
+        started = time.perf_counter()
+        hits = sum(cache.get(query) is not None for query in queries)
+        print(f"{label}: 조회당 {(time.perf_counter() - started) * 1000 / len(queries):.3f} ms, 적중 {hits}/{len(queries)}")
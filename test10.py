@@ -1,112 +1,223 @@
-from typing import TypedDict, List, Dict, Any
-from langgraph.graph import StateGraph, END, START
-from openai import OpenAI
-from dotenv import load_dotenv
+from typing import Annotated, TypedDict, List, Dict, Any
+import operator
 import os
 import json
-import base64
-import time
-
-# --- 1. 환경 변수 로드 ---
-load_dotenv()
-api_key = os.getenv('OPEN_API_KEY')
-client = OpenAI(api_key=api_key)
+from adgen.client import get_client
+from agent_schemas import (ASPECT_RATIOS, expand_background, expand_layout, expand_marketing_copy,
+                           expand_product_analysis, expand_trend_insight, response_format)
+from blob_store import blobs
+from copy_ranker import apply_variant, rank_variants
+from deadlines import request_options, with_deadline
+from graph_builder import build_state_graph, format_plan, plan_graph
+from similarity_cache import SimilarityCache
+from token_budget import IMAGE_TOKENS, SHOT_TOKENS, compact_trends, create_with_retry, fit_fields, max_tokens_for
+from product_mask import decode_rle, extract_product_mask
+from image_stats import analyze_image, subject_layouts, summarize
+
+# --- 1. 환경 변수 / 클라이언트 ---
+# OpenAI 클라이언트는 첫 호출 때 만든다 (import만으로는 .env를 읽거나 openai를 불러오지 않는다)
+COPY_VARIANTS = int(os.getenv("COPY_VARIANTS", 6))  # 한 번의 호출로 받을 문구 후보 수
+COPY_TOP_K = int(os.getenv("COPY_TOP_K", 3))        # 그래픽 요소/장면에 실어 보낼 상위 후보 수
+# 결과 저장소(adgen.store)의 키 일부. 프롬프트나 스키마를 바꾸면 올려서 이전 결과를 재사용하지 않게 한다
+PROMPT_VERSION = os.getenv("ADGEN_PROMPT_VERSION", "10.6")
+MAX_SHOTS = int(os.getenv("ADGEN_MAX_SHOTS", 8))     # 한 번의 비전 요청에 넣을 최대 사진 수
+SHOT_MAX_SIDE = 512                                  # 여러 장을 보낼 때 사진 긴 변 (SHOT_TOKENS 기준)
+
+# 표기만 다르거나 거의 같은 제품은 트렌드/문구 호출을 건너뛰고 이전 결과를 쓴다 (임계값 > 1이면 끔)
+trend_cache = SimilarityCache("trends", float(os.getenv("TREND_CACHE_THRESHOLD", 0.8)))
+copy_cache = SimilarityCache("copy", float(os.getenv("COPY_CACHE_THRESHOLD", 0.9)))
+
+
+def chat_create():
+    """남은 노드 시간으로 timeout을 잡은 chat.completions.create (요청마다 새로 부른다)."""
+    return get_client().with_options(**request_options()).chat.completions.create
+
+
+def copy_cache_key(product_name: str, product_features: str, trends: Dict) -> str:
+    """문구는 제품 이름/특징/트렌드에 모두 달려 있으므로 셋을 합쳐 캐시 키로 쓴다."""
+    return f"{product_name} | {product_features} | {compact_trends(trends or {})}"
 
 # --- 2. 상태(State) 정의 ---
 class AdGenerationState(TypedDict):
     """LangGraph의 상태를 정의하는 TypedDict"""
     product_name: str
-    image_base64: str
+    image_blobs: List[str]  # 제품 사진 blob_store 핸들들 (이미지 바이트 자체는 상태에 넣지 않는다)
+    image_blob: str  # ProductAnalyzerAgent가 고른 대표 사진(히어로 샷) 핸들
     features: Dict[str, Any]
+    product_mask: Dict[str, Any]
+    image_stats: Dict[str, Any]
     trends: Dict[str, Any]
     copy: Dict[str, Any]
     background: Dict[str, Any]
     graphic_elements: List[Dict[str, Any]]
     layouts: Dict[str, List[Dict[str, Any]]]
     final_json: List[Dict[str, Any]]
+    deadline: float  # 실행 마감 시각 (time.monotonic 기준, deadlines.run_deadline)
+    degraded: Annotated[List[Dict[str, Any]], operator.add]  # 대체값으로 채운 노드 (병렬 노드가 함께 추가)
+    trace: Annotated[List[Dict[str, Any]], operator.add]  # 노드별 소요 시간, 토큰 예산/사용량
 
 # --- 3. 에이전트 노드 구현 (GPT 호출 로직 통합) ---
 class ProductAnalyzerAgent:
-    """제품 이미지와 설명을 분석하여 특징, 용도, 마스크 정보를 추출하는 에이전트."""
+    """제품 사진들을 한 번의 비전 요청으로 분석해 특징과 용도를 추출하고 대표 사진을 고르는 에이전트."""
+    name = "product_analyzer"
+    reads = ("product_name", "image_blobs")
+    writes = ("features", "image_blob")
+    estimated_latency = 6.0
+    timeout = 20.0
+
+    def fallback(self, state: AdGenerationState) -> Dict[str, Any]:
+        # 분석이 없으면 제품 이름을 특징 설명으로, 첫 사진을 대표 사진으로 쓴다
+        return {"features": {"product_features": state.get("product_name", ""), "use_case": "", "hero_shot": 0},
+                "image_blob": (state.get("image_blobs") or [None])[0]}
+
     def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
         print("➡️ ProductAnalyzerAgent: 제품 이미지 분석 및 특징 추출 중...")
         product_name = state.get("product_name")
-        base64_image = state.get("image_base64")
-        if not product_name or not base64_image:
+        image_blobs = (state.get("image_blobs") or [])[:MAX_SHOTS]
+        if not product_name or not image_blobs:
             raise ValueError("제품 이름 또는 이미지가 상태에 존재하지 않습니다.")
         try:
-            response = client.chat.completions.create(
+            system_prompt = (
+                "You are a professional product designer. Your task is to analyze a product image "
+                "and provide a detailed, objective description. You must analyze the product and its "
+                "ideal background separately.\n\n"
+                "- `f`: A detailed description of the product's visual characteristics, texture, and style.\n"
+                "- `u`: The primary use or purpose of the product.\n"
+                "- `h`: The index of the best hero shot (0 if there is only one image).\n\n"
+                "Please ensure your analysis is based solely on the product's aesthetics, not the background of the input image."
+            )
+            if len(image_blobs) > 1:
+                system_prompt += (
+                    f"\n\nYou are given {len(image_blobs)} shots of the same product, numbered from 0 in order. "
+                    "Merge what every shot shows into a single description in `f`, and pick as `h` the shot that "
+                    "shows the whole product most clearly and attractively (sharp, well lit, unobstructed, front-facing)."
+                )
+            # 한 장이면 예전처럼 원본을, 여러 장이면 긴 변을 줄여 보낸다 (대표 사진 선택/특징 종합에는 충분)
+            max_side = SHOT_MAX_SIDE if len(image_blobs) > 1 else None
+            image_tokens = SHOT_TOKENS * len(image_blobs) if max_side else IMAGE_TOKENS
+            fields = fit_fields(self.name, system_prompt, {"product_name": product_name}, extra_tokens=image_tokens)
+            max_tokens = max_tokens_for(self.name)
+            images = [{"type": "image_url", "image_url": {"url": blobs.data_url(blob, max_side)}} for blob in image_blobs]
+            response = create_with_retry(
+                chat_create, max_tokens,
                 model="gpt-4o",
                 temperature=0.7,
                 messages=[{
                     "role": "system",
-                    "content": (
-                        "You are a professional product designer. Your task is to analyze a product image "
-                        "and provide a detailed, objective description. You must analyze the product and its "
-                        "ideal background separately. The final output should be a JSON object.\n\n"
-                        "The JSON should contain the following keys:\n"
-                        "- `product_features`: A detailed description of the product's visual characteristics, texture, and style.\n"
-                        "- `use_case`: The primary use or purpose of the product.\n"
-                        "- `product_mask`: A technical description of how to create a product mask. Describe it as if providing instructions to an image-editing AI.\n\n"
-                        "Please ensure your analysis is based solely on the product's aesthetics, not the background of the input image. "
-                        "The output must be a valid JSON object only."
-                    )
+                    "content": system_prompt
                 }, {
                     "role": "user",
                     "content": [
-                        {"type": "text", "text": f"제품 이름: {product_name}"},
-                        {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"}}
+                        {"type": "text", "text": f"제품 이름: {fields['product_name']}"},
+                        *images
                     ]
                 }],
-                max_tokens=1000,
-                response_format={"type": "json_object"}
+                response_format=response_format("product_analysis")
             )
-            response_content = response.choices[0].message.content
-            parsed_json = json.loads(response_content)
-            result = {
-                "features": {
-                    "product_features": parsed_json.get("product_features", ""),
-                    "use_case": parsed_json.get("use_case", ""),
-                    "product_mask": parsed_json.get("product_mask", "")
-                }
-            }
+            parsed_json = json.loads(response.choices[0].message.content)
+            features = expand_product_analysis(parsed_json, len(image_blobs))
+            result = {"features": features, "image_blob": image_blobs[features["hero_shot"]]}
             print("✅ ProductAnalyzerAgent: 분석 완료")
             print(f"🔍 ProductAnalyzerAgent 결과: {json.dumps(result, ensure_ascii=False, indent=2)}\n")
             return result
         except Exception as e:
             print(f"❌ ProductAnalyzerAgent 오류 발생: {e}")
-            return {"features": {}}
+            return {"features": {}, "image_blob": None}
+
+
+class ProductMaskAgent:
+    """제품 이미지에서 실제 이진 마스크(RLE + PNG)와 bbox를 로컬로 계산하는 에이전트 (GPT 호출 없음)."""
+    name = "product_mask"
+    reads = ("image_blob",)
+    writes = ("product_mask",)
+    estimated_latency = 0.2
+
+    def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
+        print("➡️ ProductMaskAgent: 제품 마스크 추출 중...")
+        image_blob = state.get("image_blob")
+        if not image_blob:
+            raise ValueError("이미지가 상태에 존재하지 않습니다.")
+        try:
+            mask = extract_product_mask(blobs.view(image_blob))
+            print(f"✅ ProductMaskAgent: 추출 완료 (bbox={mask['bbox']}, {mask['path']})\n")
+            return {"product_mask": mask}
+        except Exception as e:
+            print(f"❌ ProductMaskAgent 오류 발생: {e}")
+            return {"product_mask": {}}
+
+
+class ImageAnalysisAgent:
+    """색상 팔레트, 밝기/대비, 제품 위치와 비율을 로컬에서 계산하는 에이전트 (GPT 호출 없음)."""
+    name = "image_analysis"
+    reads = ("image_blob", "product_mask")
+    writes = ("image_stats",)
+    estimated_latency = 0.1
+
+    def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
+        print("➡️ ImageAnalysisAgent: 색상/구도 분석 중...")
+        image_blob = state.get("image_blob")
+        if not image_blob:
+            raise ValueError("이미지가 상태에 존재하지 않습니다.")
+        try:
+            mask_info = state.get("product_mask") or {}
+            mask = decode_rle(mask_info["rle"], tuple(mask_info["size"])) if mask_info.get("rle") else None
+            stats = analyze_image(blobs.view(image_blob), mask)
+            stats["subject_layouts"] = subject_layouts(stats["subject_aspect"], [float(r) for r in ASPECT_RATIOS])
+            print(f"✅ ImageAnalysisAgent: 분석 완료 ({summarize(stats)})\n")
+            return {"image_stats": stats}
+        except Exception as e:
+            print(f"❌ ImageAnalysisAgent 오류 발생: {e}")
+            return {"image_stats": {}}
 
 
 class TrendInsightAgent:
     """제품 카테고리의 마케팅 트렌드를 분석하는 에이전트."""
+    name = "trend_insight"
+    reads = ("product_name",)
+    writes = ("trends",)
+    estimated_latency = 4.0
+    timeout = 10.0
+
+    def fallback(self, state: AdGenerationState) -> Dict[str, Any]:
+        # 트렌드는 문구의 참고용일 뿐이라, 느슨한 기준으로 비슷한 제품의 결과를 찾고 없으면 기본값을 쓴다
+        cached = trend_cache.get(state.get("product_name", ""), threshold=0.5)
+        if cached:
+            return {"trends": cached[0]}
+        return {"trends": {"category": "", "popular_brands": [], "slogans": [], "tone": "minimalist"}}
+
     def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
         print("➡️ TrendInsightAgent: 마케팅 트렌드 분석 중...")
         product_name = state.get("product_name")
         if not product_name:
             raise ValueError("제품 이름이 상태에 존재하지 않습니다.")
+        cached = trend_cache.get(product_name)
+        if cached:
+            print(f"♻️ TrendInsightAgent: 유사 제품 결과 재사용 (유사도 {cached[1]})\n")
+            return {"trends": cached[0]}
         try:
-            response = client.chat.completions.create(
+            max_tokens = max_tokens_for(self.name, items=4)  # 브랜드/슬로건 3~4개
+            response = create_with_retry(
+                chat_create, max_tokens,
                 model="gpt-4o",
                 temperature=0.7,
                 messages=[{
                     "role": "system",
                     "content": (
-                        "You are a marketing trend analyst. Analyze the product category for the given product. "
-                        "The output must be a JSON object containing the following keys:\n"
-                        "- `category`: The main product category.\n"
-                        "- `popular_brands`: A list of popular brands in this category.\n"
-                        "- `slogans`: A list of 3-4 example slogans for this category.\n"
-                        "- `tone`: The dominant marketing tone (e.g., 'elegant', 'energetic', 'minimalist')."
+                        "You are a marketing trend analyst. Analyze the product category for the given product.\n"
+                        "- `c`: The main product category.\n"
+                        "- `b`: A list of popular brands in this category.\n"
+                        "- `s`: A list of 3-4 example slogans for this category.\n"
+                        "- `t`: The dominant marketing tone (e.g., 'elegant', 'energetic', 'minimalist')."
                     )
                 }, {
                     "role": "user",
                     "content": f"제품 이름: {product_name}"
                 }],
-                response_format={"type": "json_object"}
+                response_format=response_format("trend_insight")
             )
-            parsed_json = json.loads(response.choices[0].message.content)
+            parsed_json = expand_trend_insight(json.loads(response.choices[0].message.content))
             result = {"trends": parsed_json}
+            trend_cache.put(product_name, parsed_json)
             print("✅ TrendInsightAgent: 분석 완료")
             print(f"🔍 TrendInsightAgent 결과: {json.dumps(result, ensure_ascii=False, indent=2)}\n")
             return result
@@ -117,26 +228,64 @@ class TrendInsightAgent:
 
 class MarketingCopyAgent:
     """트렌드와 제품 정보를 기반으로 광고 문구를 생성하는 에이전트."""
+    name = "marketing_copy"
+    reads = ("product_name", "features", "trends")
+    writes = ("copy",)
+    estimated_latency = 3.0
+    timeout = 15.0
+
+    def fallback(self, state: AdGenerationState) -> Dict[str, Any]:
+        features = state.get("features") or {}
+        product_name = state.get("product_name", "")
+        key = copy_cache_key(product_name, features.get("product_features", ""), state.get("trends"))
+        cached = copy_cache.get(key, threshold=0.6)
+        if cached:
+            return {"copy": cached[0]}
+        variant = {"logo": (product_name.split() or [""])[0], "tagline": product_name,
+                   "underlay": features.get("use_case", ""), "score": 0.0}
+        return {"copy": dict(variant, variants=[variant])}
+
     def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
         print("➡️ MarketingCopyAgent: 광고 문구 생성 중...")
         product_features = state.get("features", {}).get("product_features", "")
         trends = state.get("trends", {})
         if not product_features or not trends:
             raise ValueError("제품 특징 또는 트렌드 정보가 상태에 존재하지 않습니다.")
+        cache_key = copy_cache_key(state.get("product_name", ""), product_features, trends)
+        cached = copy_cache.get(cache_key)
+        if cached:
+            print(f"♻️ MarketingCopyAgent: 유사 제품 문구 재사용 (유사도 {cached[1]})\n")
+            return {"copy": cached[0]}
         try:
-            prompt = f"제품 특징: {product_features}\n마케팅 트렌드: {trends}\n\n위 정보를 바탕으로 다음의 JSON을 생성해주세요:\n- `logo`: 제품에 어울리는 로고 텍스트 (최대 1단어)\n- `tagline`: 강력한 광고 태그라인\n- `underlay`: 제품을 보조하는 짧은 문구"
-            response = client.chat.completions.create(
+            instructions = (f"위 정보를 바탕으로 서로 다른 광고 문구 후보 {COPY_VARIANTS}개를 만들어 "
+                            "`v` 배열에 담아주세요. 각 후보는 다음 키를 가집니다:\n"
+                            "- `l`: 제품에 어울리는 로고 텍스트 (최대 1단어)\n- `t`: 강력한 광고 태그라인\n"
+                            "- `u`: 제품을 보조하는 짧은 문구")
+            # 트렌드는 dict 전체 대신 요약 한 줄만, 예산을 넘으면 트렌드 -> 제품 특징 순으로 자른다
+            fields = fit_fields(self.name, instructions, {"features": product_features, "trends": compact_trends(trends)},
+                                trim_order=("trends", "features"))
+            prompt = f"제품 특징: {fields['features']}\n마케팅 트렌드: {fields['trends']}\n\n{instructions}"
+            max_tokens = max_tokens_for(self.name, items=COPY_VARIANTS)
+            response = create_with_retry(
+                chat_create, max_tokens,
                 model="gpt-4o",
-                temperature=0.7,
+                temperature=0.9,
                 messages=[
-                    {"role": "system", "content": "You are a creative copywriter. Your output must be a valid JSON object."},
+                    {"role": "system", "content": "You are a creative copywriter."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"}
+                response_format=response_format("marketing_copy")
             )
-            parsed_json = json.loads(response.choices[0].message.content)
-            result = {"copy": parsed_json}
-            print("✅ MarketingCopyAgent: 생성 완료")
+            candidates = expand_marketing_copy(json.loads(response.choices[0].message.content))
+            variants = rank_variants(candidates, k=COPY_TOP_K)
+            if not variants and candidates:
+                # 모두 걸러졌으면 파이프라인을 멈추지 않도록 첫 후보를 점수 0으로 쓴다
+                variants = [dict({field: str(candidates[0].get(field, "")) for field in ("logo", "tagline", "underlay")}, score=0.0)]
+            best = variants[0]
+            result = {"copy": {"logo": best["logo"], "tagline": best["tagline"], "underlay": best["underlay"],
+                               "variants": variants}}
+            copy_cache.put(cache_key, result["copy"])
+            print(f"✅ MarketingCopyAgent: 생성 완료 (후보 {len(candidates)}개 중 {len(variants)}개 채택)")
             print(f"🔍 MarketingCopyAgent 결과: {json.dumps(result, ensure_ascii=False, indent=2)}\n")
             return result
         except Exception as e:
@@ -146,24 +295,45 @@ class MarketingCopyAgent:
 
 class BackgroundDesignerAgent:
     """이상적인 광고 배경을 설명하고 이미지 생성 프롬프트를 만드는 에이전트."""
+    name = "background_designer"
+    reads = ("features", "image_stats")
+    writes = ("background",)
+    estimated_latency = 3.0
+    timeout = 12.0
+
+    def fallback(self, state: AdGenerationState) -> Dict[str, Any]:
+        # 원본 사진의 배경색으로 단색 스튜디오 배경을 만든다
+        color = (state.get("image_stats") or {}).get("background_color", "#f2f2f2")
+        return {"background": {
+            "background_caption": f"{color} 톤의 단색 스튜디오 배경",
+            "background_prompt": f"clean seamless studio backdrop, solid {color} color, soft diffused lighting, subtle shadow",
+        }}
+
     def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
         print("➡️ BackgroundDesignerAgent: 배경 설명 및 프롬프트 생성 중...")
         product_features = state.get("features", {}).get("product_features", "")
         if not product_features:
             raise ValueError("제품 특징 정보가 상태에 존재하지 않습니다.")
+        image_stats = state.get("image_stats") or {}
         try:
-            prompt = f"제품 특징: {product_features}\n\n이 제품을 가장 잘 돋보이게 할 광고 배경에 대해 JSON을 생성해주세요.\n- `background_caption`: 배경에 대한 설명 (1-2문장)\n- `background_prompt`: AI 이미지 생성용 프롬프트"
-            response = client.chat.completions.create(
+            instructions = "이 제품을 가장 잘 돋보이게 할 광고 배경을 제안해주세요.\n- `c`: 배경에 대한 설명 (1-2문장)\n- `p`: AI 이미지 생성용 프롬프트"
+            fields = fit_fields(self.name, instructions,
+                                {"features": product_features, "stats": summarize(image_stats) if image_stats else ""},
+                                trim_order=("stats", "features"))
+            stats_line = f"이미지 분석 수치: {fields['stats']}\n" if fields["stats"] else ""
+            prompt = f"제품 특징: {fields['features']}\n{stats_line}\n{instructions}"
+            max_tokens = max_tokens_for(self.name)
+            response = create_with_retry(
+                chat_create, max_tokens,
                 model="gpt-4o",
                 temperature=0.7,
                 messages=[
-                    {"role": "system", "content": "You are a professional set designer for product photography. Your output must be a valid JSON object."},
+                    {"role": "system", "content": "You are a professional set designer for product photography."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"}
+                response_format=response_format("background")
             )
-            parsed_json = json.loads(response.choices[0].message.content)
-            result = {"background": parsed_json}
+            result = {"background": expand_background(json.loads(response.choices[0].message.content))}
             print("✅ BackgroundDesignerAgent: 생성 완료")
             print(f"🔍 BackgroundDesignerAgent 결과: {json.dumps(result, ensure_ascii=False, indent=2)}\n")
             return result
@@ -174,16 +344,21 @@ class BackgroundDesignerAgent:
 
 class GraphicElementAgent:
     """광고 문구와 제품 특징을 기반으로 그래픽 요소의 타입과 내용을 결정하는 에이전트."""
+    name = "graphic_element"
+    reads = ("copy",)
+    writes = ("graphic_elements",)
+    estimated_latency = 0.0
+
     def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
         print("➡️ GraphicElementAgent: 그래픽 요소 내용 결정 중...")
         copy = state.get("copy", {})
         if not copy:
             raise ValueError("광고 문구(copy)가 상태에 존재하지 않습니다.")
         
+        variants = copy.get("variants") or [copy]
         graphic_elements = [
-            {"type": "tagline", "content": copy.get("tagline", "")},
-            {"type": "underlay", "content": copy.get("underlay", "")},
-            {"type": "logo", "content": copy.get("logo", "")}
+            {"type": field, "content": copy.get(field, ""), "variants": [variant.get(field, "") for variant in variants]}
+            for field in ("tagline", "underlay", "logo")
         ]
         
         result = {"graphic_elements": graphic_elements}
@@ -194,6 +369,22 @@ class GraphicElementAgent:
 
 class AspectRatioPlannerAgent:
     """4가지 종횡비에 맞는 요소 배치(Bounding Box)를 설계하는 에이전트."""
+    name = "aspect_ratio_planner"
+    reads = ("features", "graphic_elements", "image_stats")
+    writes = ("layouts",)
+    estimated_latency = 8.0
+    timeout = 25.0
+
+    # 제품은 가운데(subject_layouts), 태그라인은 위, 로고/보조 문구는 아래에 두는 고정 배치
+    FALLBACK_BBOXES = {"tagline": [0.08, 0.05, 0.92, 0.16], "logo": [0.05, 0.91, 0.3, 0.97],
+                       "underlay": [0.35, 0.91, 0.95, 0.97]}
+
+    def fallback(self, state: AdGenerationState) -> Dict[str, Any]:
+        graphic = [{"type": element["type"], "content": element["content"], "bbox": self.FALLBACK_BBOXES[element["type"]]}
+                   for element in state.get("graphic_elements") or [] if element.get("type") in self.FALLBACK_BBOXES]
+        return {"layouts": {ratio: {"target canvas aspect ratio": float(ratio), "nongraphic layout": [],
+                                    "graphic layout": graphic} for ratio in ASPECT_RATIOS}}
+
     def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
         print("➡️ AspectRatioPlannerAgent: 종횡비별 레이아웃 설계 중...")
         graphic_elements = state.get("graphic_elements")
@@ -201,37 +392,50 @@ class AspectRatioPlannerAgent:
         
         if not graphic_elements or not product_features:
             raise ValueError("그래픽 요소 또는 제품 특징 정보가 상태에 존재하지 않습니다.")
-            
+
+        image_stats = state.get("image_stats") or {}
+        # 제품(subject) 배치는 ImageAnalysisAgent가 로컬에서 계산했으므로 GPT에는 참고용으로만 준다
+        local_subjects = image_stats.get("subject_layouts", {})
+
+        instructions = """Return:
+- `fg`: The prompt for the main subject, `bg`: the prompt for the background (shared by all aspect ratios).
+- `r`: One entry per aspect ratio `a` (0.684, 1.0, 0.667, 0.75) with
+  - `n`: non-graphic elements like tables or shapes (`k`: kind, `b`: bbox),
+  - `g`: graphic elements placed on the canvas (`e`: graphic element index, `b`: bbox).
+
+Every bbox `b` is [x1, y1, x2, y2] relative to the canvas size with x1 < x2 and y1 < y2 (e.g., [0.1, 0.05, 0.9, 0.18]). Ensure the design is aesthetically pleasing for each aspect ratio.
+"""
+        elements = json.dumps([[i, e["type"], e["content"]] for i, e in enumerate(graphic_elements)], ensure_ascii=False)
+        subjects = json.dumps(local_subjects)
+        # 그래픽 요소/제품 배치는 자르면 응답이 틀어지므로 고정분으로 세고, 이미지 수치 -> 제품 특징 순으로 자른다
+        fields = fit_fields(self.name, instructions + elements + subjects,
+                            {"stats": summarize(image_stats) if image_stats else "n/a", "features": product_features},
+                            trim_order=("stats", "features"))
         prompt = f"""
 I will provide you with a product's description, its ideal foreground, background prompt, and several taglines. Please design a beautiful layout for a poster.
 
 - **Required advertising size**: 800x1200
 - **Task description**: Design a poster layout based on the provided information.
-- **Product features**: {product_features}
-- **Graphic elements**: {json.dumps(graphic_elements, ensure_ascii=False)}
-
-The output must be a JSON object with the following structure for each aspect ratio (0.684, 1.0, 0.667, 0.75):
-- `target canvas aspect ratio`: The aspect ratio of the canvas.
-- `foreground prompt`: The prompt for the main subject.
-- `background prompt`: The prompt for the background.
-- `subject layout`: A list of layouts for the main subject, including its type, bbox, and aspect ratio.
-- `nongraphic layout`: A list of layouts for any non-graphic elements like tables or shapes.
-- `graphic layout`: A list of layouts for graphic elements like taglines and logos, including their type, content, and bbox.
-
-The bounding box (`bbox`) must be an array of four values [x1, y1, x2, y2] relative to the canvas size (e.g., [0.495, 0.644, 0.493, 0.493]). Ensure the design is aesthetically pleasing for each aspect ratio.
-"""
+- **Product features**: {fields["features"]}
+- **Graphic elements** (refer to them by index `e`): {elements}
+- **Image statistics**: {fields["stats"]}
+- **Fixed subject layout per aspect ratio** (already decided, place text around it): {subjects}
+
+{instructions}"""
+        max_tokens = max_tokens_for(self.name, items=len(ASPECT_RATIOS))
         try:
-            response = client.chat.completions.create(
+            response = create_with_retry(
+                chat_create, max_tokens,
                 model="gpt-4o",
                 temperature=0.7,
                 messages=[
-                    {"role": "system", "content": "You are a professional graphic designer. Your output must be a valid JSON object only."},
+                    {"role": "system", "content": "You are a professional graphic designer."},
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"}
+                response_format=response_format("layout")
             )
             parsed_json = json.loads(response.choices[0].message.content)
-            result = {"layouts": parsed_json}
+            result = {"layouts": expand_layout(parsed_json, graphic_elements)}
             print("✅ AspectRatioPlannerAgent: 설계 완료")
             print(f"🔍 AspectRatioPlannerAgent 결과: {json.dumps(result, ensure_ascii=False, indent=2)}\n")
             return result
@@ -242,16 +446,23 @@ The bounding box (`bbox`) must be an array of four values [x1, y1, x2, y2] relat
 
 class SceneAssemblerAgent:
     """모든 결과를 통합해 최종 JSON을 생성하는 에이전트."""
+    name = "scene_assembler"
+    reads = ("features", "background", "copy", "layouts", "graphic_elements", "image_stats", "product_mask")
+    writes = ("final_json",)
+    estimated_latency = 0.0
+
     def invoke(self, state: AdGenerationState) -> Dict[str, Any]:
         print("➡️ SceneAssemblerAgent: 최종 JSON 조립 중...")
         final_scenes = []
-        aspect_ratios = ["0.684", "1.0", "0.667", "0.75"]
         
         required_keys = ["features", "background", "copy", "layouts", "graphic_elements"]
         if not all(key in state and state.get(key) for key in required_keys):
             raise ValueError("필수 데이터가 상태에 존재하지 않습니다.")
 
-        for ratio in aspect_ratios:
+        local_subjects = (state.get("image_stats") or {}).get("subject_layouts", {})
+        # 장면마다 RLE 전체를 복사하지 않는다: 마스크 본문은 path의 PNG(와 hash 캐시)에 있고 장면에는 참조만 둔다
+        mask_ref = {key: value for key, value in (state.get("product_mask") or {}).items() if key != "rle"}
+        for ratio in ASPECT_RATIOS:
             layout_data = state["layouts"].get(ratio, {})
             if not layout_data:
                 continue
@@ -262,12 +473,20 @@ class SceneAssemblerAgent:
                 "background_caption": layout_data.get("background prompt", state["background"]["background_caption"]),
                 "ai_background_prompt": state["background"]["background_prompt"],
                 "layout": {
-                    "subject": layout_data.get("subject layout", []),
+                    "subject": local_subjects.get(ratio) or layout_data.get("subject layout", []),
                     "nongraphic": layout_data.get("nongraphic layout", []),
                     "graphic": layout_data.get("graphic layout", [])
                 },
-                "product_mask": state["features"]["product_mask"],
+                "product_mask": mask_ref,
+                "hero_shot": state["features"].get("hero_shot", 0),
             }
+            # A/B 세트: 같은 배치에 상위 k개 문구 후보를 하나씩 넣은 그래픽 레이아웃
+            scene["copy_variants"] = [
+                {"rank": rank, "score": variant.get("score"), "graphic": apply_variant(scene["layout"]["graphic"], variant)}
+                for rank, variant in enumerate(state["copy"].get("variants") or [], start=1)
+            ]
+            # 마감/오류로 대체값을 쓴 노드. degraded는 선행 노드가 모두 끝난 뒤에 읽으므로 빠짐이 없다
+            scene["degraded"] = sorted({entry["node"] for entry in state.get("degraded") or []})
             final_scenes.append(scene)
         result = {"final_json": final_scenes}
         print("✅ SceneAssemblerAgent: 조립 완료")
@@ -276,90 +495,46 @@ class SceneAssemblerAgent:
 
 
 
-# --- 4. LangGraph DAG 구성 (수정) ---
-def create_graph():
-    """LangGraph를 생성하고 노드와 엣지를 연결"""
-    graph_builder = StateGraph(AdGenerationState)
-
-    # 노드 추가
-    graph_builder.add_node("product_analyzer", ProductAnalyzerAgent().invoke)
-    graph_builder.add_node("trend_insight", TrendInsightAgent().invoke)
-    graph_builder.add_node("marketing_copy", MarketingCopyAgent().invoke)
-    graph_builder.add_node("background_designer", BackgroundDesignerAgent().invoke)
-    graph_builder.add_node("graphic_element", GraphicElementAgent().invoke)
-    graph_builder.add_node("aspect_ratio_planner", AspectRatioPlannerAgent().invoke)
-    graph_builder.add_node("scene_assembler", SceneAssemblerAgent().invoke)
+# --- 4. LangGraph DAG 구성 ---
+# 엣지는 손으로 적지 않는다: 각 에이전트의 reads/writes 선언에서 최소 의존 DAG를 만든다.
+INPUT_KEYS = ("product_name", "image_blobs")
+AGENTS = [
+    ProductAnalyzerAgent, ProductMaskAgent, ImageAnalysisAgent, TrendInsightAgent, MarketingCopyAgent,
+    BackgroundDesignerAgent, GraphicElementAgent, AspectRatioPlannerAgent, SceneAssemblerAgent,
+]
 
-    # DAG 엣지 연결
-    # Step 1: 병렬 시작
-    graph_builder.add_edge(START, "product_analyzer")
-    graph_builder.add_edge(START, "trend_insight")
 
-    # Step 2: marketing_copy는 두 분석 결과 모두 기다림
-    graph_builder.add_edge("product_analyzer", "marketing_copy")
-    graph_builder.add_edge("trend_insight", "marketing_copy")
-
-    # Step 3: background_designer는 product_analyzer만 필요
-    graph_builder.add_edge("product_analyzer", "background_designer")
-    graph_builder.add_edge("product_analyzer", "aspect_ratio_planner")
-
-    # Step 4: marketing_copy 결과로 graphic 요소 생성
-    graph_builder.add_edge("marketing_copy", "graphic_element")
-    graph_builder.add_edge("product_analyzer", "graphic_element")
-
-    # Step 5: graphic 요소 → aspect ratio layout
-    graph_builder.add_edge("graphic_element", "aspect_ratio_planner")
-    graph_builder.add_edge("aspect_ratio_planner", "scene_assembler")
-
-    # Step 6: background + layout → scene 조립
-    graph_builder.add_edge("background_designer", "scene_assembler")
-    
-
-    # 마지막 완료
-    graph_builder.add_edge("scene_assembler", END)
-
-
-    return graph_builder.compile()
+def create_graph(verbose: bool = True):
+    """LangGraph를 생성하고 선언된 입력/출력으로부터 노드와 엣지를 연결"""
+    plan = plan_graph([agent() for agent in AGENTS], inputs=INPUT_KEYS)
+    if verbose:
+        print(format_plan(plan))
+    return build_state_graph(plan, AdGenerationState, wrap=with_deadline).compile()
 
 # --- 5. 실행 로직 ---
-def encode_image_to_base64(image_path):
-    """이미지 파일을 base64로 인코딩하는 헬퍼 함수."""
+def load_image_blob(image_path):
+    """이미지 파일을 blob 저장소에 올리고 핸들을 돌려주는 헬퍼 함수."""
     try:
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode("utf-8")
+        return blobs.put_file(image_path)
     except FileNotFoundError:
         print(f"오류: '{image_path}' 파일을 찾을 수 없습니다. 올바른 경로를 입력해주세요.")
         return None
 
+
+def load_image_blobs(image_paths):
+    """여러 사진을 올린다. 하나라도 없으면 이미 올린 것을 놓고 None을 돌려준다."""
+    handles = []
+    for image_path in image_paths:
+        handle = load_image_blob(image_path)
+        if handle is None:
+            for loaded in handles:
+                blobs.release(loaded)
+            return None
+        handles.append(handle)
+    return handles
+
 if __name__ == "__main__":
+    from adgen.cli import main
+
     print("✨ 멀티모달 광고 생성 시스템 시작 ✨")
-    
-    product_name = input("제품 이름을 입력하세요: ")
-    image_path = input("제품 이미지 파일 경로를 입력하세요 (예: './image.jpg'): ")
-    
-    base64_image = encode_image_to_base64(image_path)
-    if not base64_image:
-        exit()
-
-    initial_state = {
-        "product_name": product_name,
-        "image_base64": base64_image
-    }
-
-    graph = create_graph()
-    
-    print("\n🚀 광고 생성 워크플로우를 시작합니다...")
-    start_time = time.time()
-    
-    try:
-        final_state = graph.invoke(initial_state)
-    except Exception as e:
-        print(f"워크플로우 실행 중 치명적인 오류 발생: {e}")
-        final_state = {"final_json": []} # 오류 발생 시 빈 JSON 반환
-
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-    
-    print("\n✅ 모든 에이전트 작업 완료. 최종 광고 구성 JSON 출력:")
-    print(json.dumps(final_state["final_json"], indent=4, ensure_ascii=False))
-    print(f"\n총 소요 시간: {elapsed_time:.2f}초")
\ No newline at end of file
+    exit(main(["pipeline"]))
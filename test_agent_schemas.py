@@ -0,0 +1,98 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agent_schemas import (ASPECT_RATIOS, SCHEMAS, expand_background, expand_layout,  # noqa: E402
+                           expand_marketing_copy, expand_product_analysis, expand_trend_insight,
+                           normalize_bbox, response_format)
+
+GRAPHIC_ELEMENTS = [
+    {"type": "logo", "content": "AIR"},
+    {"type": "tagline", "content": "Run the city"},
+]
+
+
+def walk_objects(schema):
+    if schema.get("type") == "object":
+        yield schema
+        for child in schema["properties"].values():
+            yield from walk_objects(child)
+    elif schema.get("type") == "array":
+        yield from walk_objects(schema["items"])
+
+
+def test_schemas_are_strict_at_every_level():
+    for name, schema in SCHEMAS.items():
+        assert response_format(name)["json_schema"]["strict"] is True
+        for node in walk_objects(schema):
+            assert node["additionalProperties"] is False
+            assert node["required"] == list(node["properties"])
+
+
+def test_expand_product_analysis_checks_the_hero_index():
+    data = {"f": "white leather sneaker", "u": "daily running", "h": 2}
+    assert expand_product_analysis(data, shots=3) == {
+        "product_features": "white leather sneaker", "use_case": "daily running", "hero_shot": 2}
+    # 사진 수를 벗어나거나 정수가 아니면 첫 사진을 쓴다
+    assert expand_product_analysis(data, shots=2)["hero_shot"] == 0
+    assert expand_product_analysis({**data, "h": "1"}, shots=3)["hero_shot"] == 0
+    assert expand_product_analysis({}) == {"product_features": "", "use_case": "", "hero_shot": 0}
+
+
+def test_expand_trend_insight_and_background():
+    assert expand_trend_insight({"c": "sneakers", "b": ["Nike", "Adidas"], "s": ["Just do it"], "t": "bold"}) == {
+        "category": "sneakers", "popular_brands": ["Nike", "Adidas"], "slogans": ["Just do it"], "tone": "bold"}
+    assert expand_trend_insight({}) == {"category": "", "popular_brands": [], "slogans": [], "tone": ""}
+    assert expand_background({"c": "city street at dusk", "p": "neon street, wet asphalt"}) == {
+        "background_caption": "city street at dusk", "background_prompt": "neon street, wet asphalt"}
+
+
+def test_expand_marketing_copy_keeps_variant_order():
+    data = {"v": [{"l": "AIR", "t": "Run the city", "u": "New"}, {"l": "AIR", "t": "Own the night", "u": ""}]}
+    assert expand_marketing_copy(data) == [
+        {"logo": "AIR", "tagline": "Run the city", "underlay": "New"},
+        {"logo": "AIR", "tagline": "Own the night", "underlay": ""},
+    ]
+    assert expand_marketing_copy({}) == []
+
+
+def test_normalize_bbox_converts_and_clips():
+    assert normalize_bbox([0.1, 0.2, 0.5, 0.6]) == [0.1, 0.2, 0.5, 0.6]
+    # 예전 [x, y, w, h] 응답 (x2 <= x1)
+    assert normalize_bbox([0.5, 0.5, 0.2, 0.3]) == [0.5, 0.5, 0.7, 0.8]
+    assert normalize_bbox([-0.2, 0.9, 1.4, 1.5]) == [0.0, 0.9, 1.0, 1.0]
+    assert normalize_bbox([0.3]) == [0.3, 0.0, 0.3, 0.0]
+
+
+def test_expand_layout_resolves_graphic_element_references():
+    data = {
+        "fg": "sneaker on the left",
+        "bg": "",
+        "r": [
+            {"a": "1.0",
+             "n": [{"k": "subject", "b": [0.1, 0.1, 0.6, 0.9]}],
+             "g": [{"e": 1, "b": [0.6, 0.1, 0.95, 0.3]}, {"e": 7, "b": [0, 0, 1, 1]}, {"e": 0, "b": [0.6, 0.8, 0.2, 0.1]}]},
+            {"a": "2.0", "n": [], "g": []},  # 없는 종횡비는 버린다
+        ],
+    }
+    layouts = expand_layout(data, GRAPHIC_ELEMENTS)
+    assert list(layouts) == ["1.0"]
+    layout = layouts["1.0"]
+    assert layout["target canvas aspect ratio"] == 1.0
+    assert layout["foreground prompt"] == "sneaker on the left"
+    # 빈 배경 프롬프트는 키를 빼서 SceneAssembler가 배경 설명으로 채우게 한다
+    assert "background prompt" not in layout
+    assert layout["nongraphic layout"] == [{"type": "subject", "bbox": [0.1, 0.1, 0.6, 0.9]}]
+    # 범위를 벗어난 번호(7)는 버리고, 문구는 모델이 다시 쓰지 않고 입력 그래픽 요소에서 가져온다
+    assert layout["graphic layout"] == [
+        {"type": "tagline", "content": "Run the city", "bbox": [0.6, 0.1, 0.95, 0.3]},
+        {"type": "logo", "content": "AIR", "bbox": [0.6, 0.8, 0.8, 0.9]},
+    ]
+
+
+def test_expand_layout_covers_every_ratio_in_the_schema():
+    data = {"fg": "", "bg": "", "r": [{"a": ratio, "n": [], "g": []} for ratio in ASPECT_RATIOS]}
+    layouts = expand_layout(data, GRAPHIC_ELEMENTS)
+    assert list(layouts) == ASPECT_RATIOS
+    assert all("foreground prompt" not in layout for layout in layouts.values())
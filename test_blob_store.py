@@ -0,0 +1,72 @@
+import base64
+import hashlib
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from blob_store import BlobStore  # noqa: E402
+
+DATA = b"\xff\xd8 fake jpeg bytes"
+
+
+def test_same_bytes_are_stored_once_under_a_content_handle():
+    store = BlobStore()
+    first = store.put(DATA)
+    second = store.put(bytearray(DATA))
+    assert first == second == "sha256:" + hashlib.sha256(DATA).hexdigest()
+    assert store.digest(first) == hashlib.sha256(DATA).hexdigest()
+    assert len(store) == 1 and store.nbytes == len(DATA)
+
+
+def test_blob_lives_until_the_last_release():
+    store = BlobStore()
+    handle = store.put(DATA)
+    store.retain(handle)
+    store.release(handle)
+    assert handle in store
+    store.release(handle)
+    assert handle not in store and len(store) == 0
+    with pytest.raises(KeyError):
+        store.retain(handle)
+    store.release(handle)  # 이미 지워진 핸들을 다시 놓아도 조용히 넘어간다
+
+
+def test_view_is_a_read_only_window_without_copying():
+    store = BlobStore()
+    handle = store.put(DATA)
+    view = store.view(handle)
+    assert view.readonly and view.tobytes() == DATA
+    assert view.obj is store.view(handle).obj
+
+
+def test_data_url_and_mime_from_file(tmp_path):
+    path = tmp_path / "shot.png"
+    path.write_bytes(DATA)
+    store = BlobStore()
+    handle = store.put_file(str(path))
+    assert store.mime(handle) == "image/png"
+    assert store.data_url(handle) == "data:image/png;base64," + base64.b64encode(DATA).decode("ascii")
+
+
+def test_concurrent_put_and_release_keep_counts_consistent():
+    store = BlobStore()
+    keeper = store.put(DATA)
+    start = threading.Barrier(8)
+
+    def churn():
+        start.wait()
+        for _ in range(500):
+            store.release(store.put(DATA))
+
+    threads = [threading.Thread(target=churn) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert keeper in store
+    store.release(keeper)
+    assert len(store) == 0
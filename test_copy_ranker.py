@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from copy_ranker import apply_variant, display_width, length_fit, rank_variants  # noqa: E402
+
+GOOD = {"logo": "AIR", "tagline": "도시를 달리는 가장 가벼운 한 켤레", "underlay": "새로운 에어 쿠션으로 하루 종일 편안하게"}
+
+
+def test_display_width_counts_wide_characters_twice():
+    assert display_width("AIR") == 3
+    assert display_width("에어") == 4
+    assert display_width("ＡＩＲ") == 6
+
+
+def test_length_fit_is_linear_outside_the_range():
+    assert length_fit("a" * 20, (12, 36)) == 1.0
+    # 벗어난 폭을 max(하한, 상한/2)로 나눈 만큼 깎는다
+    assert length_fit("a" * 6, (12, 36)) == pytest.approx(1 - 6 / 18)
+    assert length_fit("a" * 54, (12, 36)) == 0.0
+
+
+def test_rank_filters_banned_and_empty_candidates():
+    candidates = [
+        GOOD,
+        {"logo": "AIR", "tagline": "최고의 러닝화", "underlay": "가볍게 달리세요"},
+        {"logo": "AIR", "tagline": "Guaranteed comfort all day", "underlay": "new"},
+        {"logo": "AIR", "tagline": "", "underlay": "태그라인 없음"},
+        "not a dict",
+    ]
+    assert [variant["tagline"] for variant in rank_variants(candidates)] == [GOOD["tagline"]]
+    # 금칙어 목록을 직접 주면 기본 목록 대신 그것만 쓴다
+    assert len(rank_variants(candidates, banned=[])) == 3
+
+
+def test_rank_orders_by_score_and_drops_near_duplicates():
+    candidates = [
+        {"logo": "AIR MAX", "tagline": "밤거리를 위한 러닝화", "underlay": "야간 반사 소재 적용"},
+        {**GOOD, "tagline": "도시를 달리는   가장 가벼운 한 켤레!"},
+        GOOD,
+        {"logo": "AIR", "tagline": "비 오는 날에도 미끄럼 없이", "underlay": "방수 갑피와 접지력 높은 밑창"},
+    ]
+    ranked = rank_variants(candidates, k=3)
+    assert [variant["score"] for variant in ranked] == sorted((variant["score"] for variant in ranked), reverse=True)
+    taglines = [variant["tagline"] for variant in ranked]
+    # 공백/문장부호만 다른 태그라인은 한 번만 남는다 (공백은 정규화된다)
+    assert sum(tagline.startswith("도시를 달리는 가장 가벼운 한 켤레") for tagline in taglines) == 1
+    assert "밤거리를 위한 러닝화" in taglines
+    # 로고가 두 단어면 감점된다
+    assert ranked[-1]["logo"] == "AIR MAX"
+    assert len(rank_variants(candidates, k=1)) == 1
+
+
+def test_apply_variant_replaces_only_text_elements():
+    layout = [
+        {"type": "logo", "content": "old", "bbox": [0.1, 0.1, 0.3, 0.2]},
+        {"type": "tagline", "content": "old", "bbox": [0.1, 0.7, 0.9, 0.8]},
+        {"type": "badge", "content": "NEW", "bbox": [0.8, 0.1, 0.9, 0.2]},
+        None,
+    ]
+    applied = apply_variant(layout, GOOD)
+    assert [element["content"] for element in applied] == ["AIR", GOOD["tagline"], "NEW"]
+    assert [element["bbox"] for element in applied] == [element["bbox"] for element in layout[:3]]
+    assert layout[0]["content"] == "old"  # 원본 레이아웃은 그대로
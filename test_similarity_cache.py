@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from similarity_cache import SimilarityCache, choose_bands, normalize  # noqa: E402
+
+PRODUCT = "Nike Air Max 90 Black"
+
+
+def make_cache(threshold: float = 0.8, cache_dir=None) -> SimilarityCache:
+    cache = SimilarityCache("test", threshold, cache_dir=str(cache_dir) if cache_dir else None)
+    cache.put(PRODUCT, {"copy": "run"})
+    return cache
+
+
+def test_spelling_variants_hit_exactly():
+    assert normalize("nike air-max 90 — BLACK") == normalize(PRODUCT)
+    assert make_cache().get("nike air-max 90 — BLACK") == ({"copy": "run"}, 1.0)
+
+
+def test_near_duplicate_hits_above_the_threshold():
+    value, score = make_cache().get("Nike Air Max 90 Blacks")
+    assert value == {"copy": "run"}
+    assert 0.8 <= score < 1.0
+
+
+def test_different_products_miss():
+    cache = make_cache()
+    assert cache.get("Nike Air Max 90 White") is None  # 색상만 달라도 다른 문구가 필요하다
+    assert cache.get("Nike Air Max 95 Black") is None
+    assert cache.get("Adidas Ultraboost 22") is None
+    assert cache.get("") is None
+
+
+def test_threshold_override_relaxes_a_single_lookup():
+    cache = make_cache()
+    value, score = cache.get("Nike Air Max 95 Black", threshold=0.5)
+    assert value == {"copy": "run"} and 0.5 <= score < 0.8
+    # LSH 후보는 생성 시 임계값 기준으로 모이므로 크게 동떨어진 입력은 낮춰도 찾지 못한다
+    assert cache.get("Adidas Ultraboost 22", threshold=0.0) is None
+    assert cache.get("Nike Air Max 90 Blacks", threshold=0.99) is None
+
+
+def test_threshold_above_one_disables_the_cache():
+    cache = make_cache(threshold=1.01)
+    assert cache.get(PRODUCT) is None
+    assert cache.get(PRODUCT, threshold=0.5) is None
+
+
+def test_stricter_threshold_uses_more_rows_per_band():
+    loose_bands, loose_rows = choose_bands(64, 0.5)
+    strict_bands, strict_rows = choose_bands(64, 0.9)
+    assert loose_bands * loose_rows == strict_bands * strict_rows == 64
+    assert strict_rows > loose_rows
+
+
+def test_entries_survive_a_restart(tmp_path):
+    cache = make_cache(cache_dir=tmp_path)
+    cache.put("Nike Air Max 90 Black!", "duplicate")  # 정규화하면 같은 입력이라 다시 쓰지 않는다
+    with open(tmp_path / "test.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"text": "torn')  # 기록 중 끊긴 마지막 줄
+
+    reloaded = SimilarityCache("test", 0.8, cache_dir=str(tmp_path))
+    assert len(reloaded) == 1
+    assert reloaded.get(PRODUCT) == ({"copy": "run"}, 1.0)
+    assert reloaded.get("Nike Air Max 90 Blacks")[0] == {"copy": "run"}
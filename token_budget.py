@@ -0,0 +1,183 @@
+"""에이전트 프롬프트의 토큰 예산 관리 (오프라인 추정, 네트워크/토크나이저 파일 없음).
+
+- estimate_tokens: 한글 음절 ≈ 1토큰, 영문/숫자 덩어리 ≈ 글자 4개당 1토큰, 기호 1토큰으로 센다.
+  실제 토크나이저보다 약간 크게 잡히도록 보수적으로 세며, 실제 사용량(usage)도 trace에 함께 남겨 비교할 수 있다.
+- fit_fields: 에이전트별 입력 예산을 넘으면 우선순위가 낮은 필드부터 문장 단위로 잘라 맞춘다.
+- max_tokens_for: 예상 출력 크기(스키마 기준)로 max_tokens를 정한다.
+- create_with_retry: 출력이 max_tokens에서 잘리면(엄격한 JSON이 깨져 노드가 대체값으로 떨어지므로)
+  노드 마감 안에 시간이 남았을 때만 상한을 RETRY_FACTOR배로 늘려 한 번 다시 요청한다.
+잘라낸 필드, 추정치, 예산 초과(입력/출력)는 tracing.note로 노드 trace에 남는다.
+"""
+import math
+import os
+import re
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+from deadlines import DeadlineExceeded
+from tracing import append, note
+
+IMAGE_TOKENS = 765        # detail=auto 기준 1024px 안팎 이미지 한 장
+SHOT_TOKENS = 255         # 긴 변 512px 이하로 줄인 사진 한 장 (타일 1개)
+MESSAGE_OVERHEAD = 4      # 메시지마다 붙는 role/구분 토큰
+MIN_FIELD_TOKENS = 24     # 필드를 자를 때 남기는 최소 길이
+OUTPUT_MARGIN = 1.3
+RETRY_FACTOR = 2          # 출력이 잘렸을 때 다시 요청할 max_tokens 배수
+
+# 에이전트별 (입력 예산, 출력 기본 토큰, 출력 항목당 토큰). ADGEN_PROMPT_BUDGET_<NAME>으로 입력 예산을 바꿀 수 있다.
+BUDGETS: Dict[str, Tuple[int, int, int]] = {
+    "product_analyzer": (2600, 220, 0),  # 여러 장일 때 사진 8장(SHOT_TOKENS)까지 포함
+    "trend_insight": (300, 60, 40),
+    "marketing_copy": (700, 10, 45),
+    "background_designer": (600, 120, 0),
+    "aspect_ratio_planner": (1400, 60, 110),
+}
+
+_TOKEN_PATTERN = re.compile(r"[가-힣]|[A-Za-z]+|[0-9]+|\s+|[^\sA-Za-z0-9가-힣]")
+
+
+def estimate_tokens(text: str) -> int:
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text or ""):
+        first = piece[0]
+        if first.isspace():
+            continue
+        if first.isascii() and first.isalnum():
+            tokens += math.ceil(len(piece) / 4)
+        else:
+            tokens += 1
+    return tokens
+
+
+def prompt_budget(agent: str) -> int:
+    return int(os.getenv(f"ADGEN_PROMPT_BUDGET_{agent.upper()}", BUDGETS[agent][0]))
+
+
+def trim_text(text: str, max_tokens: int) -> str:
+    """max_tokens 안에 들어가도록 문장(또는 쉼표) 경계에서 자른다."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    pieces = re.split(r"(?<=[.!?。,;])\s+|\n+", text)
+    kept, used = [], 0
+    for piece in pieces:
+        cost = estimate_tokens(piece)
+        if used + cost > max_tokens:
+            break
+        kept.append(piece)
+        used += cost
+    if not kept:
+        # 한 문장도 안 들어가면 평균 글자/토큰 비율로 잘라 낸다
+        cut = max(1, int(len(text) * max_tokens / max(1, estimate_tokens(text))))
+        while cut > 1 and estimate_tokens(text[:cut]) > max_tokens:
+            cut = int(cut * 0.9)
+        return text[:cut] + "…"
+    return " ".join(kept) + " …"
+
+
+def fit_fields(agent: str, fixed: str, fields: Dict[str, str], trim_order: Sequence[str] = (),
+               extra_tokens: int = 0) -> Dict[str, str]:
+    """fixed(고정 지시문) + fields가 예산을 넘으면 trim_order 순서(먼저 자를 것부터)로 필드를 줄인다.
+
+    extra_tokens는 이미지처럼 글자로 셀 수 없는 고정 비용이다.
+    """
+    budget = prompt_budget(agent)
+    fields = dict(fields)
+    fixed_tokens = estimate_tokens(fixed) + MESSAGE_OVERHEAD * 2 + extra_tokens
+    sizes = {name: estimate_tokens(text) for name, text in fields.items()}
+    before = fixed_tokens + sum(sizes.values())
+    for name in trim_order:
+        over = fixed_tokens + sum(sizes.values()) - budget
+        if over <= 0:
+            break
+        target = max(MIN_FIELD_TOKENS, sizes[name] - over)
+        if target < sizes[name]:
+            fields[name] = trim_text(fields[name], target)
+            append("trimmed", {"field": name, "from": sizes[name], "to": estimate_tokens(fields[name])})
+            sizes[name] = estimate_tokens(fields[name])
+    after = fixed_tokens + sum(sizes.values())
+    note(prompt_budget=budget, prompt_tokens_est=after, prompt_tokens_before_trim=before)
+    if after > budget:
+        note(prompt_overrun=after - budget)
+    return fields
+
+
+def output_cap(agent: str, items: int = 1) -> int:
+    _, base, per_item = BUDGETS[agent]
+    return int(math.ceil((base + per_item * items) * OUTPUT_MARGIN / 16) * 16)
+
+
+def max_tokens_for(agent: str, items: int = 1) -> int:
+    max_tokens = output_cap(agent, items)
+    note(max_tokens=max_tokens)
+    return max_tokens
+
+
+def run_tokens(items: Dict[str, int], image_tokens: int = IMAGE_TOKENS) -> int:
+    """그래프 한 번 실행의 토큰 상한 추정 (스케줄러 입장 제어용). 입력은 예산, 출력은 max_tokens로 잡는다.
+
+    제품 분석기의 입력은 예산 대신 이미지 토큰 + 지시문 정도로 잡는다 (예산은 사진 8장 기준이라 너무 크다).
+    """
+    total = 0
+    for agent in BUDGETS:
+        prompt = min(prompt_budget(agent), image_tokens + 300) if agent == "product_analyzer" else prompt_budget(agent)
+        total += prompt + output_cap(agent, items.get(agent, 1))
+    return total
+
+
+def _usage(response) -> Tuple[int, int]:
+    usage = getattr(response, "usage", None)
+    return (getattr(usage, "prompt_tokens", None) or 0, getattr(usage, "completion_tokens", None) or 0)
+
+
+def _truncated(response) -> bool:
+    choices = getattr(response, "choices", None) or []
+    return bool(choices) and getattr(choices[0], "finish_reason", None) == "length"
+
+
+def record_usage(response, max_tokens: int, spent: Tuple[int, int] = (0, 0)) -> None:
+    """실제 사용량(spent: 앞서 잘린 요청의 사용량 포함)을 trace에 남기고, 출력이 max_tokens에서 잘렸으면 초과로 기록한다."""
+    if getattr(response, "usage", None) is not None:
+        prompt_tokens, completion_tokens = _usage(response)
+        note(prompt_tokens=prompt_tokens + spent[0], completion_tokens=completion_tokens + spent[1])
+    if _truncated(response):
+        note(output_overrun=True)
+        print(f"⚠️ 출력이 max_tokens={max_tokens}에서 잘렸습니다.")
+
+
+def create_with_retry(make_create: Callable[[], Callable[..., Any]], max_tokens: int, **request: Any):
+    """make_create()가 돌려준 create(max_tokens=..., **request)로 요청하고 사용량을 기록한다.
+
+    make_create는 요청마다 다시 불러 남은 시간으로 timeout을 새로 잡는다. 출력이 max_tokens에서 잘렸으면
+    max_tokens * RETRY_FACTOR로 한 번만 다시 요청하되 (두 요청의 사용량을 합쳐 기록), 노드 마감까지
+    시간이 모자라면(DeadlineExceeded) 다시 요청하지 않고 잘린 응답을 그대로 돌려준다.
+    """
+    response = make_create()(max_tokens=max_tokens, **request)
+    if not _truncated(response):
+        record_usage(response, max_tokens)
+        return response
+    try:
+        create = make_create()
+    except DeadlineExceeded:
+        record_usage(response, max_tokens)
+        note(retry_skipped="deadline")
+        return response
+    retry_tokens = max_tokens * RETRY_FACTOR
+    print(f"⚠️ 출력이 max_tokens={max_tokens}에서 잘려 max_tokens={retry_tokens}로 다시 요청합니다.")
+    note(max_tokens_retry=retry_tokens)
+    spent = _usage(response)
+    response = create(max_tokens=retry_tokens, **request)
+    record_usage(response, retry_tokens, spent)
+    return response
+
+
+def compact_trends(trends: Dict) -> str:
+    """트렌드 dict 전체 대신 문구 작성에 필요한 부분만 한 줄로 요약한다."""
+    parts = []
+    if trends.get("category"):
+        parts.append(f"category={trends['category']}")
+    if trends.get("tone"):
+        parts.append(f"tone={trends['tone']}")
+    if trends.get("popular_brands"):
+        parts.append("brands=" + ", ".join(map(str, trends["popular_brands"][:3])))
+    if trends.get("slogans"):
+        parts.append("slogans=" + " / ".join(map(str, trends["slogans"][:2])))
+    return "; ".join(parts)
@@ -0,0 +1,35 @@
+"""노드 실행 기록(trace). 노드 래퍼가 노드마다 dict 하나를 열어 두고, 에이전트 코드는 note()로 값을 붙인다.
+
+기록은 상태의 "trace" 리스트(operator.add 리듀서)로 모인다.
+"""
+import contextlib
+import contextvars
+import time
+from typing import Any, Dict, Iterator, Optional
+
+_current: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("node_trace", default=None)
+
+
+def note(**fields: Any) -> None:
+    """현재 노드 기록에 값을 붙인다. 노드 밖(단독 호출)에서는 아무 일도 하지 않는다."""
+    trace = _current.get()
+    if trace is not None:
+        trace.update(fields)
+
+
+def append(key: str, value: Any) -> None:
+    trace = _current.get()
+    if trace is not None:
+        trace.setdefault(key, []).append(value)
+
+
+@contextlib.contextmanager
+def node_trace(name: str) -> Iterator[Dict[str, Any]]:
+    trace: Dict[str, Any] = {"node": name}
+    token = _current.set(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        _current.reset(token)